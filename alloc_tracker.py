@@ -0,0 +1,139 @@
+# Eagle Eyes - Steady-state allocation tracker for render functions
+#
+# Wraps render methods and, for every call after a warm-up, records
+#   - Python heap peak during the call, and the heap still held when it
+#     returns (tracemalloc), and
+#   - how many pygame.Surface objects the call constructed.
+# SDL pixel buffers live outside the Python heap, so surfaces are counted
+# directly: while tracking, pygame.Surface is swapped for a subclass that
+# counts its instances. Surfaces made in C (rendered text, copies,
+# conversions, transforms, loaded images) never pass through that
+# constructor, and pygame's types cannot be patched, so calls to the C
+# functions that make them are counted with a profile hook instead. Any
+# function that keeps creating surfaces once warm is flagged.
+# The retained figure is taken while the caller still holds the result, so a
+# function returning a display list retains the list itself on every call;
+# it is reported per call, and only growth beyond the result is a leak.
+import functools
+import sys
+import tracemalloc
+
+import pygame
+
+# C methods that return a new Surface, by qualified name
+SURFACE_METHODS = {"Font.render", "Surface.copy", "Surface.convert", "Surface.convert_alpha",
+                   "Surface.subsurface"}
+# pygame.transform functions that do not
+NON_SURFACE_TRANSFORMS = {"average_color", "get_smoothscale_backend", "set_smoothscale_backend",
+                          "threshold"}
+
+
+class AllocationTracker:
+    def __init__(self, warmup=3):
+        self.warmup = warmup
+        self.calls = {}
+        self.surfaces = {}
+        self.peak_bytes = {}
+        self.retained_bytes = {}
+        self._wrapped = []
+        self._current = []
+        self._original_surface = None
+        self._original_profile = None
+
+    def watch(self, obj, *names):
+        for name in names:
+            original = getattr(obj, name)
+            label = f"{type(obj).__name__}.{name}"
+            setattr(obj, name, self._wrap(label, original))
+            self._wrapped.append((obj, name))
+        return self
+
+    def _wrap(self, label, fn):
+        self.calls[label] = 0
+        self.surfaces[label] = 0
+        self.peak_bytes[label] = 0
+        self.retained_bytes[label] = 0
+
+        @functools.wraps(fn)
+        def tracked(*args, **kwargs):
+            self.calls[label] += 1
+            steady = self.calls[label] > self.warmup
+            if not steady:
+                return fn(*args, **kwargs)
+
+            self._current.append([0])
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                current, peak = tracemalloc.get_traced_memory()
+                created = self._current.pop()[0]
+                self.surfaces[label] += created
+                self.peak_bytes[label] = max(self.peak_bytes[label], peak - before)
+                self.retained_bytes[label] += current - before
+                # Nested tracked calls also count toward their callers
+                if self._current:
+                    self._current[-1][0] += created
+        return tracked
+
+    def start(self):
+        tracker = self
+        original = pygame.Surface
+
+        class CountingSurface(original):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                if tracker._current:
+                    tracker._current[-1][0] += 1
+
+        self._original_surface = original
+        pygame.Surface = CountingSurface
+        self._original_profile = sys.getprofile()
+        sys.setprofile(self._profile)
+        tracemalloc.start()
+        return self
+
+    def _profile(self, frame, event, arg):
+        if event != "c_call" or not self._current:
+            return
+        module = getattr(arg, "__module__", None)
+        name = arg.__qualname__
+        if (name in SURFACE_METHODS or
+                (module == "pygame.transform" and name not in NON_SURFACE_TRANSFORMS) or
+                (module == "pygame.image" and name.startswith(("load", "from")))):
+            self._current[-1][0] += 1
+
+    def stop(self):
+        tracemalloc.stop()
+        sys.setprofile(self._original_profile)
+        self._original_profile = None
+        if self._original_surface is not None:
+            pygame.Surface = self._original_surface
+            self._original_surface = None
+        for obj, name in self._wrapped:
+            # Drop the instance attribute so the class method shows through again
+            obj.__dict__.pop(name, None)
+        self._wrapped = []
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def flagged(self):
+        """Functions that created surfaces after warming up"""
+        return [label for label, count in self.surfaces.items() if count]
+
+    def report(self):
+        lines = [f"{'function':<32} {'calls':>6} {'surfaces':>9} {'peak KiB':>9} "
+                 f"{'retained KiB/call':>18}"]
+        for label in self.calls:
+            flag = "  <-- allocates surfaces" if self.surfaces[label] else ""
+            steady = max(1, self.calls[label] - self.warmup)
+            lines.append(f"{label:<32} {self.calls[label]:>6} {self.surfaces[label]:>9} "
+                         f"{self.peak_bytes[label] / 1024:>9.1f} "
+                         f"{self.retained_bytes[label] / steady / 1024:>18.1f}{flag}")
+        lines.append("(retained includes the returned value, which the caller still holds)")
+        return "\n".join(lines)
@@ -0,0 +1,215 @@
+# Eagle Eyes - Precompiled asset pack
+#
+# A build step bakes every asset into one file, ready to use: images already
+# scaled to the sizes the game draws them at, as raw BGRA pixels (the byte
+# order of the usual 32-bit display format), and sounds as raw samples in the
+# mixer's format. Identical payloads are stored once, so the WAVs duplicated
+# between assets/sounds and assets/sfx cost nothing.
+#
+# Layout: a fixed header, a JSON index, then the payloads, each 64-byte
+# aligned. At runtime the file is memory-mapped and surfaces and sounds are
+# made straight from slices of it, so nothing is decoded or scaled. The index
+# records the size and mtime of every source file; if any has changed (or the
+# mixer runs in a different format) the pack is treated as stale.
+#
+#   python asset_pack.py build
+#   python asset_pack.py info
+import json
+import mmap
+import os
+import struct
+
+import pygame
+
+MAGIC = b"EEYEPACK"
+VERSION = 1
+HEADER = struct.Struct("<8sIIQ")
+ALIGN = 64
+PIXEL_FORMAT = "BGRA"
+
+# Image variants the game draws: (path under assets/, size, scale factor)
+IMAGES = (
+    ("bg/desert.png", (800, 600), None),
+    ("bg/eagle_eyes.png", (800, 600), None),
+    ("bg/cloud.png", None, 0.8),
+    ("bg/cloud.png", None, 0.6),
+)
+SOUND_DIRS = ("sounds", "sfx")
+
+
+def image_key(path, size=None, scale=None):
+    if size is not None:
+        return f"{path}@{size[0]}x{size[1]}"
+    if scale is not None:
+        return f"{path}@{scale}x"
+    return path
+
+
+def scan_sources(root):
+    """(size, mtime_ns) of every file the pack is built from, keyed by path under root"""
+    paths = {path for path, _, _ in IMAGES}
+    for folder in SOUND_DIRS:
+        try:
+            entries = os.scandir(os.path.join(root, folder))
+        except FileNotFoundError:
+            continue
+        with entries:
+            paths.update(f"{folder}/{entry.name}" for entry in entries if entry.name.endswith(".wav"))
+    sources = {}
+    for path in sorted(paths):
+        try:
+            stat = os.stat(os.path.join(root, path))
+        except FileNotFoundError:
+            continue
+        sources[path] = [stat.st_size, stat.st_mtime_ns]
+    return sources
+
+
+def build_pack(root, out_path):
+    """Bake the assets under root into out_path; needs the mixer initialised"""
+    import hashlib
+
+    sources = scan_sources(root)
+    index = {"mixer": list(pygame.mixer.get_init()), "pixel_format": PIXEL_FORMAT,
+             "sources": sources, "blobs": [], "images": {}, "sounds": {}}
+    payloads = []
+    blob_ids = {}
+
+    def add(payload):
+        digest = hashlib.blake2b(payload, digest_size=16).digest()
+        if digest not in blob_ids:
+            blob_ids[digest] = len(payloads)
+            payloads.append(payload)
+        return blob_ids[digest]
+
+    for path, size, scale in IMAGES:
+        if path not in sources:
+            continue
+        key = image_key(path, size, scale)
+        image = pygame.image.load(os.path.join(root, path))
+        if scale is not None:
+            size = (int(image.get_width() * scale), int(image.get_height() * scale))
+        if size is not None:
+            image = pygame.transform.scale(image, size)
+        index["images"][key] = {
+            "blob": add(pygame.image.tobytes(image, PIXEL_FORMAT)), "size": list(image.get_size())}
+    for path in sources:
+        if path.endswith(".wav"):
+            index["sounds"][path] = {"blob": add(pygame.mixer.Sound(os.path.join(root, path)).get_raw())}
+
+    # Offsets are absolute, so the index size has to be fixed before they are known
+    index["blobs"] = [[0, len(payload)] for payload in payloads]
+    while True:
+        encoded = json.dumps(index).encode("utf-8")
+        offset = -(-(HEADER.size + len(encoded)) // ALIGN) * ALIGN
+        blobs = []
+        for payload in payloads:
+            blobs.append([offset, len(payload)])
+            offset = -(-(offset + len(payload)) // ALIGN) * ALIGN
+        if blobs == index["blobs"]:
+            break
+        index["blobs"] = blobs
+
+    tmp_path = out_path + ".tmp"
+    with open(tmp_path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, 0, len(encoded)))
+        file.write(encoded)
+        for (offset, _), payload in zip(blobs, payloads):
+            file.seek(offset)
+            file.write(payload)
+    os.replace(tmp_path, out_path)
+    print(f"📦 Built asset pack: {len(index['images'])} images, {len(index['sounds'])} sounds, "
+          f"{len(payloads)} unique payloads, {offset / 1e6:.1f} MB")
+    return index
+
+
+def rebuild_pack(root, out_path):
+    """build_pack for the running game: a failed rebuild only costs the speedup"""
+    try:
+        return build_pack(root, out_path)
+    except (OSError, pygame.error) as e:
+        print(f"⚠️ Could not build asset pack: {e}")
+        return None
+
+
+class AssetPack:
+    def __init__(self, path, root, buffer, index):
+        self.path = path
+        self.root = root
+        self.buffer = buffer
+        self.view = memoryview(buffer)
+        self.index = index
+
+    @classmethod
+    def open(cls, path, root):
+        """The pack at path, or None if it is missing, unreadable or stale"""
+        try:
+            with open(path, "rb") as file:
+                buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, _, index_len = HEADER.unpack_from(buffer)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError("not an asset pack of this version")
+            index = json.loads(bytes(buffer[HEADER.size:HEADER.size + index_len]))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, struct.error) as e:
+            print(f"⚠️ Ignoring asset pack {os.path.basename(path)}: {e}")
+            return None
+        if index["sources"] != scan_sources(root):
+            print("⚠️ Asset pack is out of date with assets/; loading from source files")
+            return None
+        if pygame.mixer.get_init() and list(pygame.mixer.get_init()) != index["mixer"]:
+            print("⚠️ Asset pack was built for another mixer format; loading from source files")
+            return None
+        return cls(path, root, buffer, index)
+
+    def _relative(self, path):
+        return os.path.relpath(path, self.root).replace(os.sep, "/")
+
+    def _blob(self, entry):
+        offset, length = self.index["blobs"][entry["blob"]]
+        return self.view[offset:offset + length]
+
+    def has_image(self, path, size=None, scale=None):
+        return image_key(self._relative(path), size, scale) in self.index["images"]
+
+    def has_sound(self, path):
+        return self._relative(path) in self.index["sounds"]
+
+    def image(self, path, size=None, scale=None):
+        """Unconverted surface over the mapped pixels"""
+        entry = self.index["images"][image_key(self._relative(path), size, scale)]
+        return pygame.image.frombuffer(self._blob(entry), entry["size"], PIXEL_FORMAT)
+
+    def sound(self, path, volume):
+        sound = pygame.mixer.Sound(buffer=self._blob(self.index["sounds"][self._relative(path)]))
+        sound.set_volume(volume)
+        return sound
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build or inspect the Eagle Eyes asset pack")
+    parser.add_argument("command", choices=("build", "info"))
+    parser.add_argument("--root", default="assets", help="asset folder")
+    parser.add_argument("--pack", default="assets.pack", help="pack file")
+    args = parser.parse_args()
+
+    pygame.mixer.init()
+    if args.command == "build":
+        build_pack(args.root, args.pack)
+        return
+    pack = AssetPack.open(args.pack, args.root)
+    if pack is None:
+        print("no usable asset pack; run: python asset_pack.py build")
+        return
+    print(f"mixer format {tuple(pack.index['mixer'])}, {os.path.getsize(args.pack) / 1e6:.1f} MB")
+    for kind in ("images", "sounds"):
+        for key, entry in pack.index[kind].items():
+            offset, length = pack.index["blobs"][entry["blob"]]
+            print(f"  {key:<32} blob {entry['blob']:>2}  {length / 1e3:>9.1f} kB")
+
+
+if __name__ == "__main__":
+    main()
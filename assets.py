@@ -0,0 +1,141 @@
+# Eagle Eyes - Background asset loading
+#
+# Files are decoded on a thread pool in the order they are submitted, so the
+# menu's assets go first and everything else streams in behind them. Each
+# asset sits behind a future keyed by name; get() only blocks if the asset
+# is needed before it has finished loading. Surfaces come back unconverted:
+# convert() needs the display and runs on the main thread.
+#
+# With an asset pack (asset_pack.py) the loader takes images and sounds from
+# it ready-made and only falls back to decoding the source files for anything
+# the pack does not have.
+#
+# Resources sits on top of the loader for the life of the process: it owns
+# the fonts (through the text cache), the display-format surfaces, the baked
+# cowboy sprites and the decoded sounds, so a new game or a restart finds all
+# of them already loaded.
+import os
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+
+from sprites import CowboySprites
+from text_cache import TextCache
+
+
+def load_sound(path, volume):
+    name = os.path.basename(path)
+    try:
+        if os.path.exists(path):
+            sound = pygame.mixer.Sound(path)
+            sound.set_volume(volume)
+            print(f"✅ Loaded sound: {name}")
+            return sound
+        print(f"❌ Sound file not found: {name}")
+    except Exception as e:
+        print(f"⚠️ Error loading {name}: {e}")
+    return None
+
+
+def load_image(path, size=None, scale=None):
+    name = os.path.basename(path)
+    try:
+        if os.path.exists(path):
+            image = pygame.image.load(path)
+            if scale is not None:
+                size = (int(image.get_width() * scale), int(image.get_height() * scale))
+            if size is not None:
+                image = pygame.transform.scale(image, size)
+            print(f"✅ Successfully loaded: {name}")
+            return image
+        print(f"❌ Image file not found: {name}")
+    except Exception as e:
+        print(f"⚠️ Error loading {name}: {e}")
+    return None
+
+
+class AssetLoader:
+    def __init__(self, workers=4, pack=None):
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="assets")
+        self.pack = pack
+        self.futures = {}
+
+    def submit(self, key, fn, *args):
+        """Queue fn(*args) under key; a key already queued is not loaded twice"""
+        if key not in self.futures:
+            self.futures[key] = self.pool.submit(fn, *args)
+        return self.futures[key]
+
+    def image(self, key, path, size=None, scale=None):
+        """Queue an image scaled to size (or by scale)"""
+        if self.pack and self.pack.has_image(path, size, scale):
+            return self.submit(key, self.pack.image, path, size, scale)
+        return self.submit(key, load_image, path, size, scale)
+
+    def sound(self, key, path, volume):
+        if self.pack and self.pack.has_sound(path):
+            return self.submit(key, self.pack.sound, path, volume)
+        return self.submit(key, load_sound, path, volume)
+
+    def ready(self, key):
+        return self.futures[key].done()
+
+    def get(self, key):
+        """The loaded asset (None if it failed), waiting only if it is not ready yet"""
+        return self.futures[key].result()
+
+    def wait_all(self):
+        for future in list(self.futures.values()):
+            future.result()
+
+    def shutdown(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+
+class Resources:
+    def __init__(self, loader):
+        self.loader = loader
+        # Every font lookup, file load, surface conversion and sprite bake
+        self.loads = Counter()
+        self.text_cache = TextCache(load_font=self._load_font)
+        self.surfaces = {}
+        self._sprites = None
+
+    def _load_font(self, name, size):
+        self.loads["font"] += 1
+        return pygame.font.SysFont(name, size)
+
+    def image(self, key, path, size=None, scale=None):
+        if key not in self.loader.futures:
+            self.loads["image"] += 1
+        return self.loader.image(key, path, size, scale)
+
+    def sound(self, key, path, volume):
+        if key not in self.loader.futures:
+            self.loads["sound"] += 1
+        return self.loader.sound(key, path, volume)
+
+    def ready(self, key):
+        return self.loader.ready(key)
+
+    def get(self, key):
+        return self.loader.get(key)
+
+    def surface(self, key, alpha=False, fallback=None):
+        """The image under key in display format, converted once; fallback() if it failed to load"""
+        surface = self.surfaces.get(key)
+        if surface is None:
+            image = self.loader.get(key)
+            if image is None:
+                image = fallback()
+            surface = image.convert_alpha() if alpha else image.convert()
+            self.surfaces[key] = surface
+            self.loads["surface"] += 1
+        return surface
+
+    def sprites(self):
+        if self._sprites is None:
+            self._sprites = CowboySprites()
+            self.loads["sprites"] += 1
+        return self._sprites
@@ -0,0 +1,199 @@
+# Eagle Eyes - Vectorized Monte Carlo balance simulator
+#
+# Resolves whole games as NumPy arrays, one row per duel, using the same
+# rules as DuelEngine: opponent reaction/accuracy/target weights come from
+# engine.Opponent, weapon accuracy from engine.Weapon, and shots are traced
+# against the engine's hitboxes with hitscan's exact segment test.
+import argparse
+import time
+
+import numpy as np
+
+from hitscan import batch_first_hit
+from engine import HEAD_DAMAGE, BODY_DAMAGE, SHOT_RANGE, AIM_JITTER, Player, Opponent
+
+MISS, BODY, HEAD = 0, 1, 2
+
+
+def normal_reaction(mean=0.35, sd=0.08, floor=0.1):
+    """Player reaction-time sampler: clipped normal, in seconds"""
+    def sample(rng, size):
+        return np.maximum(floor, rng.normal(mean, sd, size))
+    return sample
+
+
+def resolve_hits(start, end_x, end_y, target):
+    """Zone codes (MISS/BODY/HEAD) for shots from start to each (end_x, end_y)"""
+    ends = np.column_stack((end_x, end_y))
+    starts = np.broadcast_to(np.asarray(start, dtype=float), ends.shape)
+    rects = [[tuple(rect) for _, rect in target.hitboxes()]]
+    _, zone, _ = batch_first_hit(starts, ends, rects)
+    names = [name for name, _ in target.hitboxes()]
+    codes = np.array([HEAD if name == "head" else BODY for name in names] + [MISS], dtype=np.int8)
+    return codes[zone]
+
+
+class DuelBatch:
+    def __init__(self, difficulty_curve, player_reaction=None, player_weapon=None,
+                 opponent_weapon=None, aim_point=None, aim_sigma=40.0, max_rounds=5):
+        # difficulty_curve: opponent difficulty for each round (scalar = constant)
+        curve = np.broadcast_to(np.asarray(difficulty_curve), (max_rounds,))
+        self.difficulty_curve = [int(d) for d in curve]
+        self.player_reaction = player_reaction or normal_reaction()
+        self.player_weapon = player_weapon or Player().weapon
+        self.max_rounds = max_rounds
+        self.player = Player()
+        self.opponent = Opponent()
+        self.opponent_weapon = opponent_weapon or self.opponent.weapon
+        self.aim_point = aim_point or self.opponent.rect.center
+        self.aim_sigma = aim_sigma
+
+    def run(self, n, seed=None):
+        rng = np.random.default_rng(seed)
+        player_health = np.full(n, self.player.max_health, dtype=np.int16)
+        opponent_health = np.full(n, self.opponent.max_health, dtype=np.int16)
+        duel_time = np.zeros(n)
+        time_to_kill = np.full(n, np.nan)
+        rounds_played = np.zeros(n, dtype=np.int8)
+
+        for round_index, difficulty in enumerate(self.difficulty_curve):
+            live = np.flatnonzero((player_health > 0) & (opponent_health > 0))
+            if live.size == 0:
+                break
+            m = live.size
+            opponent = Opponent(difficulty)
+
+            # Countdown delay and who fires first (opponent wins ties, as in step())
+            delay_ms = rng.integers(2000, 4001, m)
+            low, high = opponent.reaction_time_range()
+            opponent_ms = (np.round(rng.uniform(low, high, m), 2) * 1000).astype(np.int64)
+            player_ms = self.player_reaction(rng, m) * 1000
+            player_first = player_ms < opponent_ms
+
+            zone = np.zeros(m, dtype=np.int8)
+
+            # Player shots: accuracy roll, then trace the aimed ray
+            shooters = np.flatnonzero(player_first)
+            on_target = rng.random(shooters.size) <= self.player_weapon.accuracy
+            shooters = shooters[on_target]
+            if shooters.size:
+                start = self.player.muzzle_pos()
+                aim_x = rng.normal(self.aim_point[0], self.aim_sigma, shooters.size)
+                aim_y = rng.normal(self.aim_point[1], self.aim_sigma, shooters.size)
+                angle = np.arctan2(aim_y - start[1], aim_x - start[0])
+                zone[shooters] = resolve_hits(start,
+                                              start[0] + np.cos(angle) * SHOT_RANGE,
+                                              start[1] + np.sin(angle) * SHOT_RANGE,
+                                              self.opponent)
+
+            # Opponent shots: boosted accuracy roll, weighted target choice, scatter
+            shooters = np.flatnonzero(~player_first)
+            accuracy = self.opponent_weapon.accuracy + opponent.accuracy_boost()
+            shooters = shooters[rng.random(shooters.size) <= accuracy]
+            if shooters.size:
+                k = shooters.size
+                weights = np.clip(np.asarray(opponent.target_weights(), dtype=float), 0, None)
+                choice = rng.choice(3, size=k, p=weights / weights.sum())
+                # "miss" shots are never traced, exactly like opponent_shoot()
+                shooters = shooters[choice != 2]
+                choice = choice[choice != 2]
+                end_x = np.empty(choice.size)
+                end_y = np.empty(choice.size)
+                for code, name in ((0, "head"), (1, "body")):
+                    rows = choice == code
+                    rect = self.player.head_rect if name == "head" else self.player.body_rect
+                    jitter_x, jitter_y = AIM_JITTER[name]
+                    end_x[rows] = rect.centerx + rng.integers(-jitter_x, jitter_x + 1, rows.sum())
+                    end_y[rows] = rect.centery + rng.integers(-jitter_y, jitter_y + 1, rows.sum())
+                zone[shooters] = resolve_hits(self.opponent.muzzle_pos(), end_x, end_y, self.player)
+
+            damage = np.where(zone == HEAD, HEAD_DAMAGE, np.where(zone == BODY, BODY_DAMAGE, 0))
+            shot_ms = np.where(player_first, player_ms, opponent_ms)
+            duel_time[live] += (delay_ms + shot_ms) / 1000
+            rounds_played[live] = round_index + 1
+
+            player_rows = live[player_first]
+            opponent_health[player_rows] -= damage[player_first].astype(np.int16)
+            player_health[live[~player_first]] -= damage[~player_first].astype(np.int16)
+
+            killed = player_rows[opponent_health[player_rows] <= 0]
+            time_to_kill[killed] = duel_time[killed]
+
+        return DuelResults(self.difficulty_curve, player_health, opponent_health,
+                           self.player.max_health, self.opponent.max_health,
+                           duel_time, time_to_kill, rounds_played)
+
+
+class DuelResults:
+    def __init__(self, difficulty_curve, player_health, opponent_health,
+                 player_max_health, opponent_max_health, duel_time, time_to_kill, rounds_played):
+        self.difficulty_curve = difficulty_curve
+        self.player_health = player_health
+        self.opponent_health = opponent_health
+        self.damage_dealt = opponent_max_health - np.maximum(opponent_health, 0)
+        self.damage_taken = player_max_health - np.maximum(player_health, 0)
+        self.duel_time = duel_time
+        self.time_to_kill = time_to_kill
+        self.rounds_played = rounds_played
+
+    @property
+    def wins(self):
+        return self.opponent_health <= 0
+
+    @property
+    def losses(self):
+        return self.player_health <= 0
+
+    def summary(self, percentiles=(10, 50, 90)):
+        n = len(self.player_health)
+        kills = self.time_to_kill[~np.isnan(self.time_to_kill)]
+        return {
+            "duels": n,
+            "win_rate": self.wins.mean(),
+            "loss_rate": self.losses.mean(),
+            "timeout_rate": 1 - self.wins.mean() - self.losses.mean(),
+            "damage_dealt_mean": self.damage_dealt.mean(),
+            "damage_taken_mean": self.damage_taken.mean(),
+            "damage_dealt_pct": np.percentile(self.damage_dealt, percentiles),
+            "damage_taken_pct": np.percentile(self.damage_taken, percentiles),
+            "time_to_kill_pct": np.percentile(kills, percentiles) if kills.size else np.full(len(percentiles), np.nan),
+            "rounds_mean": self.rounds_played.mean(),
+        }
+
+
+def difficulty_sweep(n, levels=range(1, 11), seed=None, **batch_options):
+    """Run n duels at each constant difficulty level"""
+    seeds = np.random.SeedSequence(seed).spawn(len(levels))
+    return {
+        level: DuelBatch(level, **batch_options).run(n, seed=child)
+        for level, child in zip(levels, seeds)
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Eagle Eyes difficulty sweep")
+    parser.add_argument("--duels", type=int, default=200_000, help="duels per difficulty level")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--reaction-mean", type=float, default=0.35, help="player reaction mean (s)")
+    parser.add_argument("--reaction-sd", type=float, default=0.08)
+    parser.add_argument("--aim-sigma", type=float, default=40.0, help="player aim spread (px)")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    results = difficulty_sweep(
+        args.duels, seed=args.seed,
+        player_reaction=normal_reaction(args.reaction_mean, args.reaction_sd),
+        aim_sigma=args.aim_sigma
+    )
+    elapsed = time.perf_counter() - started
+
+    print(f"{'diff':>4} {'win':>6} {'loss':>6} {'t/o':>6} {'dealt':>6} {'taken':>6} "
+          f"{'ttk p10':>8} {'ttk p50':>8} {'ttk p90':>8}")
+    for level, result in results.items():
+        s = result.summary()
+        ttk = s["time_to_kill_pct"]
+        print(f"{level:>4} {s['win_rate']:>6.1%} {s['loss_rate']:>6.1%} {s['timeout_rate']:>6.1%} "
+              f"{s['damage_dealt_mean']:>6.1f} {s['damage_taken_mean']:>6.1f} "
+              f"{ttk[0]:>8.2f} {ttk[1]:>8.2f} {ttk[2]:>8.2f}")
+    total = args.duels * len(results)
+    print(f"\n{total:,} duels in {elapsed:.2f}s")
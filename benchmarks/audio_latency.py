@@ -0,0 +1,130 @@
+# Eagle Eyes - Audio cue latency: from cue request to output
+#
+# Mixer side: a 1 ms click is played on a channel that has an end event.
+# SDL_mixer raises the event from its audio callback once the click is mixed,
+# so the time from Channel.play() to the event (less the click) is how long a
+# cue waits for the mixer. The mixed buffer then takes one buffer length to
+# play out: request-to-output = pickup + buffer. This runs on whichever
+# SDL_AUDIODRIVER is set (dummy unless you pick a real one); a real device
+# adds its own driver latency on top.
+#
+# Game side: a fixed-time cue (the gun pump) at 60 FPS, requested either by
+# the frame whose logic reaches it or by a frame clock timer, compared with
+# the time it was due.
+#
+#   python benchmarks/audio_latency.py --buffers 128 256 512 1024 --trials 40
+#   SDL_AUDIODRIVER=pulseaudio python benchmarks/audio_latency.py
+import array
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pygame
+
+from input_timing import FrameClock, InputSampler
+
+END_EVENT = pygame.USEREVENT + 7
+FREQUENCY = 44100
+# Stand-in for the time a frame spends updating and drawing
+RENDER_MS = 4
+
+
+def wait_for_event(kind, timeout_ns=1_000_000_000):
+    deadline = time.perf_counter_ns() + timeout_ns
+    while not pygame.event.peek(kind):
+        if time.perf_counter_ns() > deadline:
+            return None
+        # Yield the CPU to the audio thread rather than spinning
+        time.sleep(0.0001)
+    stamp = time.perf_counter_ns()
+    pygame.event.clear(kind)
+    return stamp
+
+
+def mixer_pickup(buffer, trials, rng):
+    """ms from Channel.play() until the mixer has mixed a 1 ms click"""
+    pygame.mixer.quit()
+    pygame.mixer.init(FREQUENCY, -16, 2, buffer)
+    click = pygame.mixer.Sound(buffer=array.array("h", [12000] * 2 * (FREQUENCY // 1000)))
+    click_ms = click.get_length() * 1000
+    channel = pygame.mixer.Channel(0)
+    channel.set_endevent(END_EVENT)
+    samples = []
+    for _ in range(trials):
+        # Land requests at random points in the mixer's cycle
+        time.sleep(rng.uniform(0.005, 0.03))
+        pygame.event.clear(END_EVENT)
+        requested = time.perf_counter_ns()
+        channel.play(click)
+        mixed = wait_for_event(END_EVENT)
+        if mixed is not None:
+            samples.append((mixed - requested) / 1e6 - click_ms)
+    return np.asarray(samples)
+
+
+def cue_request_lateness(trials, rng):
+    """ms each way of requesting a fixed-time cue is late, at 60 FPS"""
+    frame_clock = FrameClock(60, InputSampler())
+    frame_based, scheduled = [], []
+    for _ in range(trials):
+        due = time.perf_counter_ns() + int(rng.uniform(20, 60) * 1e6)
+        fired = {}
+        frame_clock.sampler.call_at(due, lambda: fired.setdefault("at", time.perf_counter_ns()))
+        requested = None
+        while requested is None:
+            frame_clock.sampler.drain()
+            now = time.perf_counter_ns()
+            # The logic of this frame reaches the cue's time
+            if now >= due:
+                requested = now
+            time.sleep(RENDER_MS / 1000)
+            frame_clock.tick()
+        frame_based.append((requested - due) / 1e6)
+        scheduled.append((fired["at"] - due) / 1e6)
+    return np.asarray(frame_based), np.asarray(scheduled)
+
+
+def describe(values):
+    return (f"p50 {np.percentile(values, 50):6.2f}  p99 {np.percentile(values, 99):6.2f}  "
+            f"max {values.max():6.2f}")
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Measure audio cue latency")
+    parser.add_argument("--buffers", type=int, nargs="+", default=[128, 256, 512, 1024],
+                        help="mixer buffer sizes to try, in samples")
+    parser.add_argument("--trials", type=int, default=40)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    rng = random.Random(args.seed)
+    print(f"audio driver: {os.environ['SDL_AUDIODRIVER']}, "
+          f"{args.trials} trials, all times in ms")
+    print(f"\n{'buffer':>6} {'buffer ms':>9}   {'mixer pickup':<34}   request to output (pickup + buffer)")
+    for buffer in args.buffers:
+        pickup = mixer_pickup(buffer, args.trials, rng)
+        if not len(pickup):
+            print(f"{buffer:>6}   no end events; the driver is not mixing")
+            continue
+        buffer_ms = buffer / FREQUENCY * 1000
+        print(f"{buffer:>6} {buffer_ms:>9.1f}   {describe(pickup):<34}   {describe(pickup + buffer_ms)}")
+
+    frame_based, scheduled = cue_request_lateness(args.trials, rng)
+    print(f"\nfixed-time cue request, 60 FPS with {RENDER_MS} ms of frame work (late by):")
+    print(f"  at the frame reaching it   {describe(frame_based)}")
+    print(f"  frame clock timer          {describe(scheduled)}")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# Eagle Eyes - Gallery hit-testing cost versus target count
+#
+#   python benchmarks/bench_gallery.py
+#   python benchmarks/bench_gallery.py --counts 10 100 1000 10000 --shots 2000
+# Lays out a gallery round of each size, stops the clock mid-round and fires
+# the same random shots from the player's muzzle through TargetField.raycast
+# (the spatial hash), through hitscan.first_hit on every standing target in
+# turn (as the duel tests its one opponent) and through batch_first_hit over
+# all of them at once. Every grid answer is checked against the per-target
+# one; exits non-zero on any mismatch.
+import argparse
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from engine import GALLERY_AREA, GALLERY_MS, SHOT_RANGE, Player
+from gallery import TargetField
+from hitscan import batch_first_hit, first_hit
+
+# Never hit: pads plates, which have one zone, to the outlaws' two
+NOWHERE = (-1e9, -1e9, 0, 0)
+
+
+def every_target(field, standing, start, end):
+    """Per-target first_hit over every standing target: (slot, zone) or None"""
+    best = None
+    for slot in standing:
+        zones = field.zone_rects(slot)
+        name, distance = first_hit(start, end, zones)
+        if name is not None and (best is None or distance < best[0]):
+            best = (distance, slot, [zone for zone, _ in zones].index(name))
+    return None if best is None else best[1:]
+
+
+def shots(rng, count):
+    start = Player().muzzle_pos()
+    left, top, width, height = GALLERY_AREA
+    segments = []
+    for _ in range(count):
+        aim = (rng.uniform(left, left + width), rng.uniform(top, top + height))
+        dx, dy = aim[0] - start[0], aim[1] - start[1]
+        scale = SHOT_RANGE / max(1e-9, (dx * dx + dy * dy) ** 0.5)
+        segments.append((start, (start[0] + dx * scale, start[1] + dy * scale)))
+    return segments
+
+
+def per_shot_us(function, segments):
+    started = time.perf_counter()
+    for start, end in segments:
+        function(start, end)
+    return (time.perf_counter() - started) / len(segments) * 1e6
+
+
+def run():
+    parser = argparse.ArgumentParser(description="Gallery hit-testing cost versus target count")
+    parser.add_argument("--counts", type=int, nargs="+", default=[10, 30, 100, 300, 1000, 3000, 10000])
+    parser.add_argument("--shots", type=int, default=1000)
+    parser.add_argument("--cell", type=int, help="spatial hash cell size in px (default: sized to the count)")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    segments = shots(rng, args.shots)
+    print(f"{args.shots} shots per row, us per shot")
+    print(f"{'targets':>8} {'standing':>9} {'cell':>5} {'grid':>8} {'tests':>6} {'each':>9} {'batch':>8} {'speedup':>8}")
+    mismatches = 0
+    for count in args.counts:
+        field = TargetField(count, GALLERY_AREA, cell=args.cell)
+        field.populate(rng, count, 0, GALLERY_MS)
+        field.update(GALLERY_MS / 2)
+        standing = np.flatnonzero(field.standing).tolist()
+
+        tests_before = field.tests
+        grid = per_shot_us(field.raycast, segments)
+        tests = (field.tests - tests_before) / len(segments)
+        # The per-target loop is slow at large counts, so it times fewer shots
+        sample = segments[:max(20, len(segments) * 100 // max(100, len(standing)))]
+        each = per_shot_us(lambda start, end: every_target(field, standing, start, end), sample)
+        rects = np.array([[rect for _, rect in field.zone_rects(slot)] + [NOWHERE] * (2 - len(field.zone_rects(slot)))
+                          for slot in standing]).reshape(-1, 2, 4)
+        batch = per_shot_us(lambda start, end: batch_first_hit([start], [end], rects), segments)
+
+        for start, end in sample:
+            hit = field.raycast(start, end)
+            if (None if hit is None else hit[:2]) != every_target(field, standing, start, end):
+                mismatches += 1
+        print(f"{count:>8} {len(standing):>9} {field.cell:>5} {grid:>8.1f} {tests:>6.1f} {each:>9.1f} {batch:>8.1f}"
+              f" {min(each, batch) / grid:>7.1f}x")
+
+    if mismatches:
+        print(f"\n{mismatches} shots hit something else than the per-target test")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(run())
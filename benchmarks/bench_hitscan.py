@@ -0,0 +1,98 @@
+# Eagle Eyes - Hit-test microbenchmark and brute-force cross-check
+#
+#   python benchmarks/bench_hitscan.py            # timings
+#   python benchmarks/bench_hitscan.py --check    # also fuzz against dense sampling
+import argparse
+import math
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from engine import Opponent
+from hitscan import first_hit, batch_first_hit
+
+
+def sampled_hit(start, end, zones, steps=20):
+    """The old check_winner test: probe `steps` points along the shot"""
+    for i in range(1, steps + 1):
+        point = (start[0] + (end[0] - start[0]) * (i / steps),
+                 start[1] + (end[1] - start[1]) * (i / steps))
+        for name, rect in zones:
+            if rect.collidepoint(point):
+                return name, math.hypot(point[0] - start[0], point[1] - start[1])
+    return None, None
+
+
+def random_shot(rng, start=(155, 350)):
+    angle = rng.uniform(-0.4, 0.4)
+    return start, (start[0] + math.cos(angle) * 1000, start[1] + math.sin(angle) * 1000)
+
+
+def bench(n_shots=2000, n_batch=200_000, seed=1):
+    rng = random.Random(seed)
+    zones = Opponent().hitboxes()
+    shots = [random_shot(rng) for _ in range(n_shots)]
+
+    for label, fn in (("sampled (20 steps)", sampled_hit), ("slab first_hit", first_hit)):
+        seconds = min(timeit.repeat(lambda: [fn(s, e, zones) for s, e in shots], number=1, repeat=5))
+        print(f"{label:<22} {seconds / n_shots * 1e6:8.2f} us/shot")
+
+    starts = np.tile([155.0, 350.0], (n_batch, 1))
+    angles = np.random.default_rng(seed).uniform(-0.4, 0.4, n_batch)
+    ends = starts + np.column_stack((np.cos(angles), np.sin(angles))) * 1000
+    for targets in (1, 16, 128):
+        rects = np.tile([[tuple(r) for _, r in zones]], (targets, 1, 1)).astype(float)
+        rects[:, :, 1] += np.arange(targets)[:, np.newaxis] * 7 - targets * 3.5
+        seconds = min(timeit.repeat(lambda: batch_first_hit(starts, ends, rects), number=1, repeat=3))
+        print(f"batch {targets:>3} target(s)     {seconds / n_batch * 1e9:8.1f} ns/shot "
+              f"({n_batch / seconds / 1e6:.1f}M shots/s)")
+
+
+def check(n=20000, steps=4000, seed=2):
+    """Exact test must agree with dense sampling up to one sample spacing"""
+    rng = random.Random(seed)
+    zones = Opponent().hitboxes()
+    grazing = 0
+    for _ in range(n):
+        start = (rng.uniform(0, 800), rng.uniform(0, 600))
+        end = (rng.uniform(0, 800), rng.uniform(0, 600))
+        spacing = math.hypot(end[0] - start[0], end[1] - start[1]) / steps
+        exact_zone, exact_dist = first_hit(start, end, zones)
+        dense_zone, dense_dist = sampled_hit(start, end, zones, steps)
+        batch = batch_first_hit([start], [end], [[tuple(r) for _, r in zones]])
+
+        if dense_zone is not None:
+            assert exact_zone is not None, (start, end)
+            assert exact_dist <= dense_dist + 1e-9, (start, end)
+            assert dense_dist - exact_dist <= spacing + 1e-6, (start, end)
+            if dense_dist - exact_dist > spacing / 2:
+                grazing += 1
+            else:
+                # Both found the same entry, so they must name the same zone
+                # (a head/body mix-up on the shared edge would show here)
+                assert exact_zone == dense_zone, (start, end, exact_zone, dense_zone)
+        if exact_zone is not None:
+            assert batch[1][0] == [n for n, _ in zones].index(exact_zone), (start, end)
+            assert abs(batch[2][0] - exact_dist) < 1e-6, (start, end)
+        else:
+            assert batch[1][0] == -1, (start, end)
+
+        if sampled_hit(start, end, zones)[0] is not None:
+            assert exact_zone is not None, (start, end)
+
+    print(f"check: {n} random shots agree with {steps}-step sampling "
+          f"({grazing} grazing shots resolved within one sample)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--check", action="store_true", help="fuzz against brute-force sampling")
+    args = parser.parse_args()
+    bench()
+    if args.check:
+        check()
@@ -0,0 +1,113 @@
+# Eagle Eyes - Background particle cost versus particle count
+#
+#   python benchmarks/bench_particles.py
+#   python benchmarks/bench_particles.py --counts 100 1000 10000 --sprite cloud
+# Times one frame's update and draw for a ParticleLayer (NumPy arrays and one
+# Surface.blits call) and for the per-particle dicts and blits the background
+# used to have, at each particle count. The 60 FPS frame budget is 16.7 ms.
+# Drawing is bound by the blits themselves in both, so most of the gap is in
+# the update.
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import pygame
+
+import main
+from particles import ParticleLayer, dust_sprites
+
+AREA = (0, 0, 800, 600)
+SPEED = (15, 60)
+
+
+class DictParticles:
+    """The old Background cloud loop, one dict and one blit per particle"""
+
+    def __init__(self, images, count):
+        self.images = images
+        self.particles = [{"x": random.uniform(0, 800), "y": random.uniform(0, 600),
+                           "speed": random.uniform(*SPEED), "image": random.choice(images)}
+                          for _ in range(count)]
+        for particle in self.particles:
+            particle["prev_x"] = particle["x"]
+
+    def update(self, dt):
+        for particle in self.particles:
+            particle["prev_x"] = particle["x"]
+            particle["x"] -= particle["speed"] * dt / 1000
+            if particle["x"] < -particle["image"].get_width():
+                particle["x"] = particle["prev_x"] = 800
+                particle["y"] = random.uniform(0, 600)
+                particle["speed"] = random.uniform(*SPEED)
+
+    def draw(self, surface, alpha):
+        for particle in self.particles:
+            x = particle["prev_x"] + (particle["x"] - particle["prev_x"]) * alpha
+            surface.blit(particle["image"], (int(x), int(particle["y"])))
+
+
+class ArrayParticles:
+    def __init__(self, images, count):
+        self.layer = ParticleLayer("bench", images, count, AREA, SPEED)
+
+    def update(self, dt):
+        self.layer.update(dt)
+
+    def draw(self, surface, alpha):
+        # As Background.items() paints it
+        self.layer.item(alpha)[2](surface)
+
+
+def frame_ms(system, screen, frames):
+    """Median (update, draw) ms"""
+    updates, draws = [], []
+    for _ in range(frames):
+        started = time.perf_counter()
+        system.update(main.STEP_MS)
+        updated = time.perf_counter()
+        system.draw(screen, 0.5)
+        updates.append((updated - started) * 1000)
+        draws.append((time.perf_counter() - updated) * 1000)
+    return statistics.median(updates), statistics.median(draws)
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Background particle cost versus count")
+    parser.add_argument("--counts", type=int, nargs="+", default=[0, 100, 300, 1000, 3000, 10000])
+    parser.add_argument("--frames", type=int, default=60)
+    parser.add_argument("--sprite", choices=("dust", "cloud"), default="dust",
+                        help="tiny specks, or small alpha clouds")
+    args = parser.parse_args()
+
+    screen = main.init_display()
+    if args.sprite == "cloud":
+        cloud = pygame.image.load(os.path.join("assets", "bg", "cloud.png")).convert_alpha()
+        images = [pygame.transform.smoothscale_by(cloud, scale) for scale in (0.15, 0.1)]
+    else:
+        images = dust_sprites()
+    background = pygame.Surface(screen.get_size()).convert()
+
+    print(f"{args.sprite} sprites, median ms per frame over {args.frames} frames")
+    print(f"{'':>9} {'arrays':^26} {'dicts':^26}")
+    print(f"{'particles':>9}" + f" {'update':>8} {'draw':>8} {'total':>8}" * 2 + f" {'speedup':>8}")
+    for count in args.counts:
+        row = []
+        for system in (ArrayParticles(images, count), DictParticles(images, count)):
+            screen.blit(background, (0, 0))
+            update, draw = frame_ms(system, screen, args.frames)
+            row += [update, draw, update + draw]
+        cells = "".join(f" {value:>8.3f}" for value in row)
+        print(f"{count:>9}{cells} {row[5] / max(row[2], 1e-9):>7.1f}x")
+
+
+if __name__ == "__main__":
+    main_cli()
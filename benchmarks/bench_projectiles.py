@@ -0,0 +1,61 @@
+# Eagle Eyes - Projectile step cost versus bullets in flight
+#
+#   python benchmarks/bench_projectiles.py
+#   python benchmarks/bench_projectiles.py --counts 1 10 100 500 --steps 2000
+# Times ProjectilePool.step() with the duel's two targets for each number of
+# bullets in flight, and counts the bytes it allocates. Bullets are slow
+# enough that none hits or retires during the run, so every step does the
+# full work. The 120 Hz logic step budget is 8.3 ms.
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from engine import Opponent, Player, hitbox_rects
+from main import STEP_MS
+from projectiles import ProjectilePool
+
+
+def fill(pool, count):
+    """count bullets spread over the sky, drifting too slowly to land"""
+    pool.clear()
+    for i in range(count):
+        pool.spawn(i % 2, (300 + i % 200, 20 + (i * 7) % 180), (0.001, 0.0), 0, 1e9)
+
+
+def run():
+    parser = argparse.ArgumentParser(description="ProjectilePool.step cost versus bullets in flight")
+    parser.add_argument("--counts", type=int, nargs="+", default=[0, 1, 2, 10, 50, 100, 250, 500])
+    parser.add_argument("--steps", type=int, default=1000)
+    parser.add_argument("--capacity", type=int, default=512)
+    args = parser.parse_args()
+
+    pool = ProjectilePool([hitbox_rects(Player()), hitbox_rects(Opponent())], capacity=args.capacity)
+    print(f"capacity {args.capacity}, {args.steps} steps of {STEP_MS:.2f} ms")
+    print(f"{'bullets':>8} {'us/step':>9} {'bytes/step':>11}")
+    for count in args.counts:
+        fill(pool, min(count, args.capacity))
+        pool.step(STEP_MS)
+        started = time.perf_counter()
+        for _ in range(args.steps):
+            pool.step(STEP_MS)
+        per_step = (time.perf_counter() - started) / args.steps * 1e6
+
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        for _ in range(args.steps):
+            pool.step(STEP_MS)
+        allocated = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+        print(f"{count:>8} {per_step:>9.1f} {allocated / args.steps:>11.1f}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,236 @@
+# Eagle Eyes - Headless rendering benchmarks with regression baselines
+#
+# Times a full frame (display list + present) in every game state, plus the
+# hot helpers on their own, under the dummy SDL video/audio drivers.
+#
+#   python benchmarks/bench_render.py --save benchmarks/baseline.json
+#   python benchmarks/bench_render.py --compare benchmarks/baseline.json --threshold 30
+#
+# --compare exits non-zero if any benchmark is slower than the baseline by
+# more than --threshold percent. Baselines are per machine; to take out
+# drift in the machine's overall speed, each pass also times a fixed
+# reference workload and comparisons are made relative to it. Each result
+# is the median of five passes, and the particles are seeded, but on a busy
+# single-core machine two runs of the same code still differ by up to ~20%,
+# hence the default threshold; lower it only where repeat runs agree better.
+import argparse
+import json
+import math
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+# Assets are looked up relative to the working directory
+os.chdir(ROOT)
+
+import pygame
+
+import main
+from engine import BULLET_SPEED, GAME_STATES, OPPONENT, PLAYER, START, InputEvent, hitbox_rects
+from projectiles import ProjectilePool
+from round_stats import RoundStats
+from telemetry import TelemetryWriter
+from telemetry_store import TelemetryStore
+
+
+def measure(fn, min_time=0.3, repeats=7, setup=None):
+    """Median seconds per call over `repeats` runs of at least min_time/repeats each
+
+    setup(), if given, runs untimed before every run.
+    """
+    number = 1
+    while True:
+        if setup is not None:
+            setup()
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        if time.perf_counter() - started >= min_time / repeats:
+            break
+        number *= 2
+    samples = []
+    for _ in range(repeats):
+        if setup is not None:
+            setup()
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - started) / number)
+    # The median shrugs off both a disturbed run and a lucky one
+    return statistics.median(samples)
+
+
+def reference_workload(surface=pygame.Surface((800, 600))):
+    """Fixed mix of interpreter and blit work that never changes"""
+    total = 0
+    for i in range(2000):
+        total += i * i
+    surface.fill((i % 256, 0, 0))
+    return total
+
+
+def make_game(workdir):
+    telemetry = TelemetryWriter(os.path.join(workdir, "game_data.csv"),
+                                store=TelemetryStore(os.path.join(workdir, "telemetry")))
+    game = main.Game(main.init_display(), telemetry=telemetry, stats=RoundStats())
+    # The same particles every run; the layers are built on first use
+    game.background.seed = 0
+    return game
+
+
+def enter_state(game, state):
+    """Put the game in `state` with a representative scene"""
+    engine = game.engine
+    # Same shot outcome (and so the same effects on screen) every run
+    engine.rng.seed(0)
+    engine.new_game()
+    if state == "waiting":
+        return
+    engine.step(0, [InputEvent(START)])
+    if state == "countdown":
+        return
+    engine.step(engine.draw_trigger_time - engine.now)
+    if state == "shooting":
+        # Both fighters mid-shot: bullets in flight and muzzle flashes on
+        now = engine.now
+        engine.player.last_shot_time = engine.opponent.last_shot_time = now
+        for owner, fighter, target in ((PLAYER, engine.player, (900, 330)),
+                                       (OPPONENT, engine.opponent, (-100, 340))):
+            start = fighter.muzzle_pos()
+            angle = math.atan2(target[1] - start[1], target[0] - start[0])
+            velocity = (math.cos(angle) * BULLET_SPEED, math.sin(angle) * BULLET_SPEED)
+            # Tracers only, so they stay on screen however long the frame is held
+            engine.projectiles.spawn(owner, start, velocity, now, 1000, lethal=False)
+        engine.projectiles.step(50)
+        return
+    engine.player_shoot((675, 310))
+    game.handle_cues(engine.cues)
+    engine.cues = []
+    if state == "result":
+        return
+    engine.game_state = GAME_STATES["GAME_OVER"]
+
+
+def frame_benchmarks(game):
+    results = {}
+
+    def menu_frame():
+        game.screen.fill(main.WHITE)
+        game.menu.draw(game.screen)
+        pygame.display.flip()
+
+    results["frame/menu"] = measure(menu_frame)
+
+    for state in ("waiting", "countdown", "shooting", "result"):
+        enter_state(game, state)
+        game.renderer.invalidate()
+        results[f"frame/{state}"] = measure(
+            lambda: game.renderer.present(game.screen, game.scene_items()))
+
+    enter_state(game, "game_over")
+
+    def game_over_frame():
+        game.draw_game_over()
+        pygame.display.flip()
+
+    results["frame/game_over"] = measure(game_over_frame)
+    return results
+
+
+def function_benchmarks(game):
+    results = {}
+    enter_state(game, "shooting")
+    engine = game.engine
+    # A duel's worst case in flight: both fighters' bullets, drifting too
+    # slowly to land, so every step does the full hit test
+    pool = ProjectilePool([hitbox_rects(engine.player), hitbox_rects(engine.opponent)])
+    pool.spawn(PLAYER, engine.player.muzzle_pos(), (0.001, 0.0), 0, 1e12)
+    pool.spawn(OPPONENT, engine.opponent.muzzle_pos(), (-0.001, 0.0), 0, 1e12)
+    results["fn/projectile_step"] = measure(lambda: pool.step(main.STEP_MS))
+    results["fn/engine_step"] = measure(lambda: engine.step(0))
+    results["fn/ui_draw_text"] = measure(lambda: game.ui.draw_text("Score: 120", 400, 40, center=True))
+    results["fn/background_update"] = measure(lambda: game.background.update(main.STEP_MS))
+    results["fn/background_draw"] = measure(lambda: game.background.draw(game.screen))
+    results["fn/scene_items"] = measure(game.scene_items)
+    record = [1, 0.25, "Player Hit", 5, 50, 3.2]
+    # Drained between runs, so every call is a real enqueue rather than a drop
+    dropped = game.telemetry.dropped
+    results["fn/save_data"] = measure(lambda: game.save_data(record), min_time=0.05,
+                                      setup=lambda: game.telemetry.flush(5.0))
+    if game.telemetry.dropped != dropped:
+        raise RuntimeError("fn/save_data filled the telemetry queue; it timed dropped rows")
+    return results
+
+
+def run_all(runs=5):
+    """Median time per benchmark over `runs` passes of the whole suite"""
+    passes = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        game = make_game(workdir)
+        passes["reference"] = [measure(reference_workload)]
+        for _ in range(runs):
+            results = {}
+            results.update(frame_benchmarks(game))
+            results.update(function_benchmarks(game))
+            for name, seconds in results.items():
+                passes.setdefault(name, []).append(seconds)
+            # Timed on both sides of each pass, so it tracks drift during it
+            passes["reference"].append(measure(reference_workload))
+        game.telemetry.close()
+    return {name: statistics.median(times) for name, times in passes.items()}
+
+
+def report(results, baseline=None, threshold=None):
+    regressions = []
+    print(f"{'benchmark':<22} {'us/call':>10} {'calls/s':>10}" + ("   vs baseline" if baseline else ""))
+    # How much faster or slower the machine is running than for the baseline
+    speed = results["reference"] / baseline["reference"] if baseline and "reference" in baseline else 1.0
+    for name, seconds in results.items():
+        line = f"{name:<22} {seconds * 1e6:>10.1f} {1 / seconds:>10.0f}"
+        if baseline and name in baseline and name != "reference":
+            change = (seconds / speed / baseline[name] - 1) * 100
+            line += f"   {change:+6.1f}%"
+            if change > threshold:
+                line += "  REGRESSION"
+                regressions.append(name)
+        print(line)
+    return regressions
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Eagle Eyes headless rendering benchmarks")
+    parser.add_argument("--save", metavar="PATH", help="write results as a JSON baseline")
+    parser.add_argument("--compare", metavar="PATH", help="compare against a JSON baseline")
+    parser.add_argument("--threshold", type=float, default=30.0,
+                        help="percent slowdown that counts as a regression")
+    parser.add_argument("--runs", type=int, default=5,
+                        help="passes over the suite; each benchmark keeps its median")
+    args = parser.parse_args()
+
+    results = run_all(args.runs)
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            baseline = json.load(file)["results"]
+    regressions = report(results, baseline, args.threshold)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as file:
+            json.dump({"machine": platform.platform(), "python": platform.python_version(),
+                       "pygame": pygame.version.ver, "results": results}, file, indent=2)
+        print(f"\nbaseline written to {args.save}")
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {args.threshold:.0f}%: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
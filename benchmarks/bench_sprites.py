@@ -0,0 +1,66 @@
+# Eagle Eyes - Character drawing benchmark: primitives vs baked sprites
+#
+#   python benchmarks/bench_sprites.py
+import os
+import sys
+import timeit
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+from sprites import CowboySprites, draw_cowboy
+
+FRAMES = 200
+
+
+def figure_rects(count):
+    return [pygame.Rect(60 + (i * 97) % 640, 40 + (i * 53) % 460, 50, 100) for i in range(count)]
+
+
+def primitive_frame(surface, rects):
+    for i, rect in enumerate(rects):
+        draw_cowboy(surface, rect, 1 if i % 2 else -1, False)
+
+
+def sprite_frame(surface, rects, sprites):
+    for i, rect in enumerate(rects):
+        surface.blit(*sprites.place(1 if i % 2 else -1, "idle", rect))
+
+
+def main():
+    pygame.init()
+    screen = pygame.display.set_mode((800, 600))
+
+    # Baked frames must look exactly like the primitives they replace
+    for sprites in (CowboySprites(), CowboySprites(atlas=True)):
+        for facing in (1, -1):
+            for pose in ("idle", "shooting"):
+                a = pygame.Surface((800, 600)).convert()
+                b = pygame.Surface((800, 600)).convert()
+                a.fill((210, 180, 140))
+                b.fill((210, 180, 140))
+                rect = pygame.Rect(375, 250, 50, 100)
+                draw_cowboy(a, rect, facing, pose == "shooting")
+                b.blit(*sprites.place(facing, pose, rect))
+                assert pygame.image.tobytes(a, "RGB") == pygame.image.tobytes(b, "RGB"), (facing, pose)
+
+    variants = (("primitives", None), ("sprites", CowboySprites()), ("atlas", CowboySprites(atlas=True)))
+    print(f"{'figures':>7} " + " ".join(f"{name:>12}" for name, _ in variants) + "   (ms/frame)")
+    for count in (2, 16, 64, 256):
+        rects = figure_rects(count)
+        row = []
+        for name, sheet in variants:
+            if sheet is None:
+                fn = lambda: primitive_frame(screen, rects)
+            else:
+                fn = lambda sheet=sheet: sprite_frame(screen, rects, sheet)
+            seconds = min(timeit.repeat(fn, number=FRAMES, repeat=3)) / FRAMES
+            row.append(seconds * 1000)
+        print(f"{count:>7} " + " ".join(f"{ms:>12.3f}" for ms in row))
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
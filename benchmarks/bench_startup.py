@@ -0,0 +1,127 @@
+# Eagle Eyes - Time-to-first-frame benchmark and startup budget check
+#
+# Starts the game in fresh interpreters (so nothing is warm in the process)
+# and times, from interpreter start: importing main, opening the display,
+# building Game, the first menu frame on screen, and every asset finished
+# loading. --sync waits for all assets before the first frame, as startup
+# used to.
+#
+#   python benchmarks/bench_startup.py --runs 10
+#   python benchmarks/bench_startup.py --runs 10 --sync
+#   python benchmarks/bench_startup.py --budget-import 400 --budget-first-frame 600 --importtime 15
+#
+# With budgets set, exits non-zero if the median import or first-frame time
+# is over budget. --importtime lists the slowest modules behind `import main`
+# as reported by `python -X importtime`.
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+STARTED = time.perf_counter()
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+MILESTONES = ("import", "display", "game", "first_frame", "all_assets")
+
+
+def child(sync):
+    """One cold start; prints its milestones (ms) as JSON"""
+    import contextlib
+    import io
+    import tempfile
+
+    marks = {}
+    with contextlib.redirect_stdout(io.StringIO()), tempfile.TemporaryDirectory() as workdir:
+        import main
+        marks["import"] = time.perf_counter()
+
+        screen = main.init_display()
+        marks["display"] = time.perf_counter()
+
+        from round_stats import RoundStats
+        from telemetry import TelemetryWriter
+        from telemetry_store import TelemetryStore
+        telemetry = TelemetryWriter(os.path.join(workdir, "game_data.csv"),
+                                    store=TelemetryStore(os.path.join(workdir, "telemetry")))
+        game = main.Game(screen, telemetry=telemetry, stats=RoundStats())
+        marks["game"] = time.perf_counter()
+
+        if sync:
+            game.resources.loader.wait_all()
+        screen.fill(main.WHITE)
+        game.menu.draw(screen)
+        main.pygame.display.flip()
+        marks["first_frame"] = time.perf_counter()
+
+        game.resources.loader.wait_all()
+        marks["all_assets"] = time.perf_counter()
+        telemetry.close()
+    print(json.dumps({name: (mark - STARTED) * 1000 for name, mark in marks.items()}))
+
+
+def import_times(top):
+    """(module, self ms, cumulative ms) for the slowest imports behind `import main`"""
+    output = subprocess.run([sys.executable, "-X", "importtime", "-c", "import main"],
+                            capture_output=True, text=True, check=True).stderr
+    rows = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "|" not in line or "self [us]" in line:
+            continue
+        own, cumulative, module = line[len("import time:"):].split("|")
+        rows.append((module.strip(), int(own) / 1000, int(cumulative) / 1000))
+    rows.sort(key=lambda row: row[2], reverse=True)
+    return rows[:top]
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Eagle Eyes startup benchmark")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--sync", action="store_true",
+                        help="load every asset before the first frame")
+    parser.add_argument("--budget-import", type=float, metavar="MS",
+                        help="fail if the median time to import main exceeds this")
+    parser.add_argument("--budget-first-frame", type=float, metavar="MS",
+                        help="fail if the median time to the first frame exceeds this")
+    parser.add_argument("--importtime", type=int, metavar="N", default=0,
+                        help="list the N slowest modules imported by main")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(args.sync)
+        return 0
+
+    command = [sys.executable, os.path.abspath(__file__), "--child"] + (["--sync"] if args.sync else [])
+    runs = [json.loads(subprocess.run(command, capture_output=True, text=True, check=True).stdout)
+            for _ in range(args.runs)]
+    print(f"{args.runs} cold starts{' (sync)' if args.sync else ''}, ms since interpreter start")
+    print(f"{'milestone':<12} {'min':>8} {'median':>8} {'max':>8}")
+    medians = {}
+    for name in MILESTONES:
+        values = sorted(run[name] for run in runs)
+        medians[name] = values[len(values) // 2]
+        print(f"{name:<12} {values[0]:>8.1f} {medians[name]:>8.1f} {values[-1]:>8.1f}")
+
+    if args.importtime:
+        print(f"\n{'module':<44} {'self ms':>8} {'cumul ms':>9}")
+        for module, own, cumulative in import_times(args.importtime):
+            print(f"{module:<44} {own:>8.1f} {cumulative:>9.1f}")
+
+    over = []
+    for name, budget in (("import", args.budget_import), ("first_frame", args.budget_first_frame)):
+        if budget is not None and medians[name] > budget:
+            over.append(f"{name} {medians[name]:.0f} ms > {budget:.0f} ms")
+    if over:
+        print("\nover startup budget: " + ", ".join(over))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
@@ -0,0 +1,122 @@
+# Eagle Eyes - Reaction time calibration: frame-drained Timer vs stamped input
+#
+# A helper thread plays a perfect player: it posts the draw signal at a known
+# perf_counter_ns time, then a click exactly `reaction` later. Each trial is
+# measured both ways and compared with that ground truth:
+#   legacy  - game.py: a 60 FPS clock.tick() loop whose Timer (time.time())
+#             starts when a frame drains the draw event and stops when a
+#             frame drains the click
+#   stamped - input_timing: events stamped with perf_counter_ns while the
+#             FrameClock waits; reaction = click stamp - draw stamp
+#
+#   python benchmarks/calibrate_reaction.py --trials 100
+import os
+import random
+import sys
+import threading
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pygame
+
+from input_timing import FrameClock, InputSampler
+
+DRAW_EVENT = pygame.USEREVENT + 1
+# Stand-in for the time a frame spends updating and drawing
+RENDER_MS = 4
+
+
+def precise_sleep_until(deadline_ns):
+    while True:
+        remaining = deadline_ns - time.perf_counter_ns()
+        if remaining <= 0:
+            return
+        # Sleep coarse, then spin the last stretch
+        if remaining > 3_000_000:
+            time.sleep(remaining / 1e9 - 0.002)
+
+
+def player(draw_delay_ms, reaction_ms, truth):
+    """Post the draw signal and the click; record their true times"""
+    start = time.perf_counter_ns()
+    precise_sleep_until(start + int(draw_delay_ms * 1e6))
+    truth["draw"] = time.perf_counter_ns()
+    pygame.event.post(pygame.event.Event(DRAW_EVENT))
+    precise_sleep_until(truth["draw"] + int(reaction_ms * 1e6))
+    truth["click"] = time.perf_counter_ns()
+    pygame.event.post(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=(675, 350), button=1))
+
+
+def legacy_trial(draw_delay_ms, reaction_ms):
+    clock = pygame.time.Clock()
+    truth = {}
+    thread = threading.Thread(target=player, args=(draw_delay_ms, reaction_ms, truth))
+    thread.start()
+    start_time = end_time = None
+    while end_time is None:
+        for event in pygame.event.get():
+            if event.type == DRAW_EVENT:
+                start_time = time.time()
+            elif event.type == pygame.MOUSEBUTTONDOWN and start_time is not None:
+                end_time = time.time()
+        time.sleep(RENDER_MS / 1000)
+        clock.tick(60)
+    thread.join()
+    return round(end_time - start_time, 3), (truth["click"] - truth["draw"]) / 1e9
+
+
+def stamped_trial(draw_delay_ms, reaction_ms):
+    frame_clock = FrameClock(60, InputSampler())
+    truth = {}
+    thread = threading.Thread(target=player, args=(draw_delay_ms, reaction_ms, truth))
+    thread.start()
+    draw_stamp = click_stamp = None
+    while click_stamp is None:
+        for stamp, event in frame_clock.sampler.drain():
+            if event.type == DRAW_EVENT:
+                draw_stamp = stamp
+            elif event.type == pygame.MOUSEBUTTONDOWN and draw_stamp is not None:
+                click_stamp = stamp
+        time.sleep(RENDER_MS / 1000)
+        frame_clock.tick()
+    thread.join()
+    return round((click_stamp - draw_stamp) / 1e9, 3), (truth["click"] - truth["draw"]) / 1e9
+
+
+def describe(label, errors_ms):
+    errors_ms = np.asarray(errors_ms)
+    print(f"{label:<8} bias {errors_ms.mean():+7.2f}  sd {errors_ms.std():6.2f}  "
+          f"p50 |err| {np.percentile(np.abs(errors_ms), 50):6.2f}  "
+          f"p99 |err| {np.percentile(np.abs(errors_ms), 99):6.2f}  max {np.abs(errors_ms).max():6.2f}  (ms)")
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compare reaction time measurement methods")
+    parser.add_argument("--trials", type=int, default=60)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    pygame.init()
+    pygame.display.set_mode((800, 600))
+    rng = random.Random(args.seed)
+    errors = {"legacy": [], "stamped": []}
+    for _ in range(args.trials):
+        draw_delay = rng.uniform(0, 50)
+        reaction = rng.uniform(150, 400)
+        for label, trial in (("legacy", legacy_trial), ("stamped", stamped_trial)):
+            measured, true = trial(draw_delay, reaction)
+            errors[label].append((measured - true) * 1000)
+
+    print(f"{args.trials} trials, 60 FPS, {RENDER_MS} ms simulated frame work; error = measured - true")
+    for label, values in errors.items():
+        describe(label, values)
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# Eagle Eyes - Flag render functions that allocate surfaces every frame
+#
+#   python benchmarks/check_allocations.py
+# Exits non-zero if any watched function still creates surfaces once warm.
+import os
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+from alloc_tracker import AllocationTracker
+from engine import GAME_STATES
+
+FRAMES = 60
+
+
+def run():
+    game = main.Game(main.init_display())
+    game.engine.new_game()
+    tracker = AllocationTracker(warmup=3)
+    tracker.watch(game, "scene_items", "hit_flash_items", "projectile_items",
+                  "fighter_items", "draw_game_over")
+    tracker.watch(game.renderer, "present")
+    tracker.watch(game.menu, "draw")
+    tracker.watch(game.background, "items")
+
+    with tracker:
+        # Duel scene with the hit flash held on
+        game.engine.hit_flash_end = float("inf")
+        for _ in range(FRAMES):
+            game.engine.step(16)
+            game.background.update(16)
+            game.renderer.present(game.screen, game.scene_items())
+
+        game.menu.draw(game.screen)
+        for _ in range(FRAMES):
+            game.menu.draw(game.screen)
+
+        game.engine.game_state = GAME_STATES["GAME_OVER"]
+        for _ in range(FRAMES):
+            game.draw_game_over()
+
+    print(tracker.report())
+    flagged = tracker.flagged()
+    if flagged:
+        print("\nsteady-state surface allocations in: " + ", ".join(flagged))
+        return 1
+    print("\nno steady-state surface allocations")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(run())
@@ -0,0 +1,120 @@
+# Eagle Eyes - Check that recorded games replay exactly
+#
+#   python benchmarks/check_replay.py
+#   python benchmarks/check_replay.py --games 20 --gallery 150
+# Plays bot games the way main.py drives the engine (fixed logic steps,
+# clicks stamped between steps) in duel, shootout and gallery modes,
+# recording each one. Every recording is then replayed from the start and
+# from every round's keyframe, and once more with its index cut off as if
+# the game had crashed. Exits non-zero if any round comes out differently.
+# Also reports recording size and replay speed against real time.
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from engine import CONTINUE, FIRE, GAME_STATES, GALLERY_AREA, START, DuelEngine, InputEvent
+from main import STEP_MS
+from replay import FOOTER, SessionRecorder, SessionReplay
+from telemetry_store import new_session_id
+
+
+def bot_game(engine, recorder, rng):
+    """One game of clicks at human-ish times; returns its round records"""
+    records = []
+    state = GAME_STATES
+    wait = 0
+    while engine.game_state not in (state["GAME_OVER"], state["MENU"]):
+        events = []
+        wait -= STEP_MS
+        if wait <= 0:
+            when = engine.now + rng.uniform(0, STEP_MS)
+            if engine.game_state == state["WAITING"]:
+                events.append(InputEvent(START, time=when))
+            elif engine.game_state == state["RESULT"]:
+                events.append(InputEvent(CONTINUE, time=when))
+            elif engine.game_state == state["SHOOTING"]:
+                left, top, width, height = GALLERY_AREA
+                aim = (rng.randint(left, left + width), rng.randint(top, top + height))
+                events.append(InputEvent(FIRE, aim, when))
+            wait = rng.uniform(150, 900)
+        for cue in recorder.step(engine, STEP_MS, events):
+            if cue[0] == "round_complete":
+                records.append(cue[1])
+    return records
+
+
+def run():
+    parser = argparse.ArgumentParser(description="Record bot games and check they replay exactly")
+    parser.add_argument("--games", type=int, default=6, help="games per mode")
+    parser.add_argument("--gallery", type=int, default=100, help="targets in gallery games")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    modes = {"duel": {}, "shootout": {"shootout": True}, "gallery": {"gallery": args.gallery}}
+    failures = 0
+    print(f"{'mode':<9} {'games':>5} {'rounds':>6} {'kB/game':>8} {'record ms':>9} {'replay ms':>9} {'x real':>8}")
+    with tempfile.TemporaryDirectory() as folder:
+        for mode, options in modes.items():
+            engine = DuelEngine(**options)
+            rounds = size = 0
+            record_s = replay_s = played_ms = 0.0
+            for game in range(args.games):
+                path = os.path.join(folder, f"{mode}{game}.eer")
+                engine.new_game(seed=new_session_id())
+                started = time.perf_counter()
+                recorder = SessionRecorder(path, engine)
+                started_now = engine.now
+                expected = bot_game(engine, recorder, rng)
+                recorder.close()
+                record_s += time.perf_counter() - started
+                played_ms += engine.now - started_now
+                rounds += len(expected)
+                size += os.path.getsize(path)
+
+                replay = SessionReplay(path)
+                started = time.perf_counter()
+                replayed = [got for got, _ in replay.play()]
+                replay_s += time.perf_counter() - started
+                if replayed != expected or replay.replayed.player.score != engine.player.score:
+                    print(f"  {mode} game {game}: replay differs\n    {expected}\n    {replayed}")
+                    failures += 1
+                # Seeking to a round replays the same rest of the game
+                for number in replay.rounds():
+                    if [got for got, _ in replay.play(number)] != expected[number - 1:]:
+                        print(f"  {mode} game {game}: replay from round {number} differs")
+                        failures += 1
+
+                # A recording cut off before its index was written
+                with open(path, "rb") as f:
+                    data = f.read()
+                index_offset = int.from_bytes(data[-FOOTER.size:][:8], "little")
+                with open(path, "wb") as f:
+                    f.write(data[:index_offset])
+                unfinished = SessionReplay(path)
+                if unfinished.complete or unfinished.rounds() != replay.rounds() or \
+                        [got for got, _ in unfinished.play()] != expected:
+                    print(f"  {mode} game {game}: unfinished recording replays differently")
+                    failures += 1
+
+            print(f"{mode:<9} {args.games:>5} {rounds:>6} {size / args.games / 1e3:>8.1f} "
+                  f"{record_s / args.games * 1000:>9.1f} {replay_s / args.games * 1000:>9.1f} "
+                  f"{played_ms / 1000 / max(replay_s, 1e-9):>7.0f}x")
+
+    if failures:
+        print(f"\n{failures} replay(s) came out differently")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(run())
@@ -0,0 +1,74 @@
+# Eagle Eyes - Check that restarting a game loads nothing
+#
+#   python benchmarks/check_restarts.py
+# Plays a short duel, then restarts ten times the way R on the game-over
+# screen does, counting font lookups, file loads, surface conversions and
+# sprite bakes. Exits non-zero if any restart loaded something again.
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import main
+from engine import GAME_STATES, START, InputEvent
+from round_stats import RoundStats
+from telemetry import TelemetryWriter
+from telemetry_store import TelemetryStore
+
+RESTARTS = 10
+FRAMES = 30
+
+
+def play(game):
+    """A few frames of every screen a game goes through"""
+    game.menu.draw(game.screen)
+    game.engine.step(0, [InputEvent(START)])
+    for _ in range(FRAMES):
+        game.handle_cues(game.engine.step(main.STEP_MS))
+        game.background.update(main.STEP_MS)
+        game.renderer.present(game.screen, game.scene_items())
+    game.sfx.play("eagle")
+    game.sfx.play("desert_wind")
+    game.engine.game_state = GAME_STATES["GAME_OVER"]
+    game.draw_game_over()
+
+
+def run():
+    with tempfile.TemporaryDirectory() as workdir:
+        telemetry = TelemetryWriter(os.path.join(workdir, "game_data.csv"),
+                                    store=TelemetryStore(os.path.join(workdir, "telemetry")))
+        game = main.Game(main.init_display(), telemetry=telemetry, stats=RoundStats())
+        game.new_game()
+        play(game)
+        resources = game.resources
+        before = dict(resources.loads)
+
+        times = []
+        for _ in range(RESTARTS):
+            started = time.perf_counter()
+            game.new_game()
+            times.append((time.perf_counter() - started) * 1000)
+            play(game)
+        after = dict(resources.loads)
+        telemetry.close()
+
+    print(f"{'resource':<10} {'first game':>10} {'after ' + str(RESTARTS) + ' restarts':>18}")
+    for kind in sorted(set(before) | set(after)):
+        print(f"{kind:<10} {before.get(kind, 0):>10} {after.get(kind, 0):>18}")
+    times.sort()
+    print(f"\nrestart ms: median {times[len(times) // 2]:.3f}  max {times[-1]:.3f}")
+    if after != before:
+        print("\nrestarts loaded resources again")
+        return 1
+    print("\nno loads on restart")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(run())
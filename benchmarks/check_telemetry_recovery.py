@@ -0,0 +1,95 @@
+# Eagle Eyes - Check that telemetry recovery cannot stop the game starting
+#
+#   python benchmarks/check_telemetry_recovery.py
+# Leaves a journal with uncommitted rows, as a crash would, then opens a
+# writer over it while game_data.csv cannot be written (a directory stands
+# in for a locked file or a full disk). Startup must succeed with the error
+# counted and the journal kept. Once the CSV is writable again the rows must
+# reach it, without duplicates, and the journal must be emptied. Also opens
+# a writer whose store rejects the rows, which must only cost the store's
+# copy. Exits non-zero on any failure.
+import csv
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from telemetry import TelemetryWriter
+
+ROWS = [[1, 0.25, "Player Hit", 5, 50, 3.2], [2, 0.31, "Player Miss", 6, 50, 7.9]]
+
+
+class RejectingStore:
+    """A store whose appends fail, as on a mismatched column layout"""
+
+    def append_rows(self, items):
+        raise ValueError("rejected")
+
+    def close(self):
+        pass
+
+
+def crashed_journal(path):
+    with open(path + ".journal", "w", encoding="utf-8") as journal:
+        for row in ROWS:
+            journal.write(json.dumps([row, 7, 0.0]) + "\n")
+
+
+def csv_rows(path):
+    with open(path, newline="") as file:
+        return list(csv.reader(file))[1:]
+
+
+def run():
+    failures = []
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "game_data.csv")
+        crashed_journal(path)
+        os.mkdir(path)
+        try:
+            writer = TelemetryWriter(path, flush_interval=0.05)
+        except Exception as e:
+            print(f"startup with an unwritable CSV raised {e!r}")
+            return 1
+        stats = writer.stats()
+        if stats["errors"] == 0:
+            failures.append(f"the failed recovery was not counted: {stats}")
+        with open(path + ".journal", encoding="utf-8") as journal:
+            if len(journal.read().splitlines()) < len(ROWS):
+                failures.append("the journal was emptied before its rows were written")
+
+        # The writer retries the recovered rows once the CSV can be written
+        shutil.rmtree(path)
+        writer.flush(5.0)
+        writer.close()
+        if not os.path.exists(path) or len(csv_rows(path)) != len(ROWS):
+            failures.append("recovered rows did not reach the CSV exactly once")
+        if os.path.getsize(path + ".journal"):
+            failures.append("the journal still holds rows after they were written")
+
+        path = os.path.join(folder, "store.csv")
+        crashed_journal(path)
+        try:
+            writer = TelemetryWriter(path, store=RejectingStore())
+        except Exception as e:
+            failures.append(f"startup with a failing store raised {e!r}")
+        else:
+            if writer.stats()["errors"] == 0 or writer.recovered != len(ROWS):
+                failures.append(f"a store failure was not handled: {writer.stats()}")
+            writer.close()
+
+    for failure in failures:
+        print(failure)
+    if failures:
+        return 1
+    print("telemetry recovery survives an unwritable CSV and a failing store")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(run())
@@ -0,0 +1,94 @@
+# Eagle Eyes - Check that steady-state frames render no new text
+#
+#   python benchmarks/check_text_cache.py
+#   python benchmarks/check_text_cache.py --frames 60
+# Holds the game in each duel state (and the main menu) while the logic
+# clock runs, and draws frames through Game.scene_items(). After a few
+# warm-up frames, every string on screen should come from the TextCache, so
+# its miss count must not move. The countdown is sampled inside one second,
+# and the opponent holds fire, so the text on screen does not change. Exits
+# non-zero if any state renders a string again.
+import argparse
+import os
+import sys
+import tempfile
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import main
+from engine import CONTINUE, GAME_STATES, START, InputEvent
+from round_stats import RoundStats
+from telemetry import TelemetryWriter
+from telemetry_store import TelemetryStore
+
+WARMUP = 3
+
+
+def enter_state(engine, state):
+    engine.rng.seed(0)
+    engine.new_game()
+    if state == "waiting":
+        return
+    engine.step(0, [InputEvent(START)])
+    if state == "countdown":
+        return
+    engine.step(engine.draw_trigger_time - engine.now)
+    engine.opponent_shot_time = None
+    if state == "shooting":
+        return
+    engine.player_shoot((675, 310))
+    # Until the bullet lands the result, score and health are still to change
+    while engine.game_state != GAME_STATES["RESULT"] or engine.projectiles.count:
+        engine.step(main.STEP_MS)
+
+
+def run():
+    parser = argparse.ArgumentParser(description="Check that steady-state frames render no new text")
+    # The countdown must stay on one digit: frames * STEP_MS under a second
+    parser.add_argument("--frames", type=int, default=100)
+    args = parser.parse_args()
+
+    failures = []
+    with tempfile.TemporaryDirectory() as workdir:
+        telemetry = TelemetryWriter(os.path.join(workdir, "game_data.csv"),
+                                    store=TelemetryStore(os.path.join(workdir, "telemetry")))
+        game = main.Game(main.init_display(), telemetry=telemetry, stats=RoundStats())
+        cache = game.text_cache
+        print(f"{'state':<10} {'frames':>6} {'hits':>6} {'misses':>6}")
+        for state in ("menu", "waiting", "countdown", "shooting", "result"):
+            if state != "menu":
+                enter_state(game.engine, state)
+            for frame in range(WARMUP + args.frames):
+                if frame == WARMUP:
+                    before = cache.stats()
+                if state == "menu":
+                    game.menu.draw(game.screen)
+                    continue
+                game.handle_cues(game.engine.step(main.STEP_MS))
+                game.background.update(main.STEP_MS)
+                game.scene_items()
+            after = cache.stats()
+            if game.engine.game_state != GAME_STATES[state.upper()]:
+                failures.append(f"{state}: left the state during the check")
+            hits, misses = after["hits"] - before["hits"], after["misses"] - before["misses"]
+            print(f"{state:<10} {args.frames:>6} {hits:>6} {misses:>6}")
+            if misses:
+                failures.append(f"{state}: {misses} string(s) rendered on steady-state frames")
+            if state == "result":
+                game.engine.step(0, [InputEvent(CONTINUE)])
+        telemetry.close()
+
+    for failure in failures:
+        print(failure)
+    if failures:
+        return 1
+    print("\nno text rendered on steady-state frames")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(run())
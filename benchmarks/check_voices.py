@@ -0,0 +1,93 @@
+# Eagle Eyes - Check the SFX voice pool against fixed channels
+#
+#   python benchmarks/check_voices.py
+#   python benchmarks/check_voices.py --voices 8 --steal quietest
+# Plays a busy two-shooter round in real time (wind, eagle, reload, pump,
+# gunshots every 250 ms, lasers, shell drops) through the voice pool, and
+# works out how many of the same cues the old one-channel-per-sound mapping
+# would have cut off. Exits non-zero if the pool cuts off as many.
+import argparse
+import os
+import sys
+import time
+from collections import defaultdict
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import main
+from assets import AssetLoader, Resources
+
+# The channel each sound was hard-bound to before the voice pool
+FIXED_CHANNELS = {"gunshot": 0, "laser": 1, "shell_drop": 2, "gun_pump": 3, "reload": 4,
+                  "menu_select": 6, "eagle": 7, "desert_wind": 8}
+
+
+def scenario():
+    """(ms, name) cues of one busy round"""
+    cues = [(0, "desert_wind"), (0, "eagle"), (0, "reload"), (600, "gun_pump"), (640, "gun_pump")]
+    for shot in range(4):
+        player = 800 + shot * 500
+        cues += [(player, "gunshot"), (player, "laser"), (player + 300, "shell_drop"),
+                 (player + 250, "gunshot")]
+    cues += [(2800, "reload"), (3000, "menu_select")]
+    return sorted(cues)
+
+
+def fixed_cut_offs(cues, lengths):
+    """Cues the fixed mapping would have cut short; wind and pump skipped while busy"""
+    busy_until = defaultdict(float)
+    cut = 0
+    for when, name in cues:
+        channel = FIXED_CHANNELS[name]
+        if busy_until[channel] > when:
+            if name in ("desert_wind", "gun_pump"):
+                continue
+            cut += 1
+        busy_until[channel] = float("inf") if name == "desert_wind" else when + lengths[name]
+    return cut
+
+
+def run():
+    parser = argparse.ArgumentParser(description="Compare the SFX voice pool with fixed channels")
+    parser.add_argument("--voices", type=int, default=12)
+    parser.add_argument("--steal", choices=("oldest", "quietest"), default="oldest")
+    args = parser.parse_args()
+
+    main.init_display()
+    resources = Resources(AssetLoader())
+    sfx = main.SFX(resources, voices=args.voices, steal=args.steal)
+    sfx.stream_lazy()
+    resources.loader.wait_all()
+    lengths = {name: sfx.sound(name).get_length() * 1000 for name in sfx.sound_config}
+
+    cues = scenario()
+    by_time = defaultdict(list)
+    for when, name in cues:
+        by_time[when].append(name)
+    started = time.perf_counter()
+    for when in sorted(by_time):
+        time.sleep(max(0, when / 1000 - (time.perf_counter() - started)))
+        sfx.play_together(by_time[when])
+    pool = sfx.pool.stats()
+    sfx.stop_all()
+    resources.loader.shutdown()
+
+    fixed = fixed_cut_offs(cues, lengths)
+    pooled = pool["retriggers"] + pool["steals"]
+    print(f"{len(cues)} cues over {cues[-1][0] / 1000:.1f} s; pool of {args.voices}, steal {args.steal}")
+    print(f"{'':<16} {'cut off':>8} {'dropped':>8}")
+    print(f"{'fixed channels':<16} {fixed:>8} {'-':>8}")
+    print(f"{'voice pool':<16} {pooled:>8} {pool['drops']:>8}")
+    print(f"\npool {pool}")
+    if pooled >= fixed:
+        print("\nthe voice pool cut off as many sounds as fixed channels")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(run())
@@ -0,0 +1,618 @@
+# Eagle Eyes - Headless duel engine
+#
+# All duel rules live here: rounds, the draw signal, the opponent's shot,
+# hit resolution and scoring. The engine never opens a window, touches the
+# mixer or reads the wall clock. Time only moves when step() is called, and
+# input arrives as InputEvent objects, so thousands of rounds can be played
+# per second in tests, balancing runs and soak tests.
+#
+# Shots are bullets in a ProjectilePool, moved and hit-tested along with the
+# engine clock. In the classic duel the first shot fired ends the round. In a
+# shootout, both fighters keep firing until one is down, both cylinders and
+# the air are empty, or SHOOTOUT_MS has passed since the draw.
+#
+# A gallery round swaps the opponent for a range of targets (gallery.py):
+# the player fires at will, reloading when the cylinder runs dry, until every
+# target is down or GALLERY_MS has passed. Gallery shots are hit-tested
+# through the range's spatial hash when fired and land when the bullet,
+# flying to the hit point, arrives.
+import math
+import random
+
+import pygame
+
+from gallery import TargetField
+from projectiles import ProjectilePool
+
+GAME_STATES = {
+    "MENU": "menu",
+    "COUNTDOWN": "countdown",
+    "WAITING": "waiting",
+    "SHOOTING": "shooting",
+    "RESULT": "result",
+    "GAME_OVER": "game_over"
+}
+
+# Input event kinds
+START = "start"
+FIRE = "fire"
+CONTINUE = "continue"
+RESTART = "restart"
+MENU = "menu"
+# The frame showing DRAW reached the screen; the front end sends it with the
+# time it was presented, and the player's reaction is measured from there
+SHOWN = "shown"
+
+HEAD_DAMAGE = 50
+BODY_DAMAGE = 20
+HIT_FLASH_MS = 200
+SHELL_DROP_DELAY_MS = 300
+PUMP_LEAD_MS = 1800
+SHOT_RANGE = 1000
+# Opponent aim scatter (+/- px in x, y) around the chosen hitbox centre
+AIM_JITTER = {"head": (20, 10), "body": (30, 20)}
+MISS_AREA = ((100, 700), (200, 400))
+# Bullet speed in px/s
+BULLET_SPEED = 3000
+# A shot that fails its accuracy roll pulls this many degrees wide, either way
+WILD_SHOT_DEG = (4, 10)
+# Shootout rounds end this long after the draw at the latest
+SHOOTOUT_MS = 6000
+# Extra delay on top of fire_rate between the opponent's shootout shots
+OPPONENT_REFIRE_JITTER_MS = 250
+# Projectile owners; a fighter's index is also its hitboxes' target index
+PLAYER, OPPONENT = 0, 1
+# Gallery rounds: how long the targets are up, where they stand, reload time
+GALLERY_MS = 15000
+GALLERY_AREA = (220, 160, 560, 330)
+GALLERY_RELOAD_MS = 1200
+PLATE_SCORE = 30
+
+
+class InputEvent:
+    __slots__ = ("kind", "pos", "time")
+
+    def __init__(self, kind, pos=None, time=None):
+        self.kind = kind
+        self.pos = pos
+        # Engine time (ms) the input happened at; None means "now"
+        self.time = time
+
+    def __repr__(self):
+        return f"InputEvent({self.kind!r}, pos={self.pos!r}, time={self.time!r})"
+
+
+class Weapon:
+    def __init__(self, name, damage, accuracy, fire_rate=500, ammo=6):
+        self.name = name
+        self.damage = damage
+        self.accuracy = accuracy
+        self.fire_rate = fire_rate
+        self.max_ammo = ammo
+        self.current_ammo = ammo
+        self.last_shot_time = -fire_rate - 1
+
+    def can_fire(self, now):
+        return (now - self.last_shot_time > self.fire_rate and
+                self.current_ammo > 0)
+
+    def fire(self, now, rng, accuracy_boost=0.0):
+        if self.can_fire(now):
+            self.last_shot_time = now
+            self.current_ammo -= 1
+            return rng.random() <= self.accuracy + accuracy_boost
+        return False
+
+    def reload(self):
+        self.current_ammo = self.max_ammo
+
+
+class Player:
+    def __init__(self, name="Player"):
+        self.name = name
+        self.score = 0
+        self.health = 100
+        self.max_health = 100
+        self.reaction_time = 0
+        self.weapon = Weapon("Revolver", damage=50, accuracy=0.8)
+        self.rect = pygame.Rect(100, 300, 50, 100)
+        self.head_rect = pygame.Rect(100, 300, 50, 30)
+        self.body_rect = pygame.Rect(100, 330, 50, 70)
+        self.last_shot_time = None
+        self.last_hit_time = None
+
+    def hitboxes(self):
+        return (("head", self.head_rect), ("body", self.body_rect))
+
+    def muzzle_pos(self):
+        return (self.rect.centerx + 30, self.rect.centery)
+
+    def shoot(self, now, rng):
+        return self.weapon.fire(now, rng)
+
+    def update_score(self, amount):
+        self.score += amount
+
+
+class Opponent:
+    def __init__(self, difficulty=5, rng=random):
+        self.rng = rng
+        self.difficulty_level = difficulty
+        self.health = 100
+        self.max_health = 100
+        self.reaction_time = self.random_reaction_time()
+        self.weapon = Weapon("Revolver", damage=50, accuracy=0.7)
+        self.rect = pygame.Rect(650, 300, 50, 100)
+        self.head_rect = pygame.Rect(650, 300, 50, 30)
+        self.body_rect = pygame.Rect(650, 330, 50, 70)
+        self.last_shot_time = None
+        self.last_hit_time = None
+        self.has_shot_this_round = False
+
+    def reset_for_new_round(self):
+        """Reset shooting state for a new round"""
+        self.reaction_time = self.random_reaction_time()
+        self.has_shot_this_round = False
+        self.weapon.reload()
+
+    def hitboxes(self):
+        return (("head", self.head_rect), ("body", self.body_rect))
+
+    def muzzle_pos(self):
+        return (self.rect.centerx - 30, self.rect.centery)
+
+    def accuracy_boost(self):
+        return min(0.2, self.difficulty_level * 0.02)
+
+    def shoot(self, now):
+        return self.weapon.fire(now, self.rng, self.accuracy_boost())
+
+    def target_weights(self):
+        return [0.3 + (0.02 * self.difficulty_level),
+                0.5,
+                0.2 - (0.02 * self.difficulty_level)]
+
+    def reaction_time_range(self):
+        base = max(0.1, 1.0 - self.difficulty_level * 0.08)
+        variation = max(0.05, 0.3 - self.difficulty_level * 0.02)
+        return base, base + variation
+
+    def random_reaction_time(self):
+        return round(self.rng.uniform(*self.reaction_time_range()), 2)
+
+
+def hitbox_rects(fighter):
+    return [tuple(rect) for _, rect in fighter.hitboxes()]
+
+
+class DuelEngine:
+    def __init__(self, seed=None, max_rounds=5, shootout=False, gallery=0):
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.max_rounds = max_rounds
+        self.shootout = shootout
+        # Targets per gallery round; 0 plays duels
+        self.gallery_size = gallery
+        self.gallery = TargetField(gallery, GALLERY_AREA) if gallery else None
+        # Rounds that run on a clock, with the player firing at will
+        self.timed_rounds = shootout or gallery > 0
+        self.now = 0
+        self.countdown_duration = 3
+        self.cues = []
+        self.projectiles = None
+        self.reset()
+        self.game_state = GAME_STATES["MENU"]
+
+    def reset(self):
+        self.player = Player()
+        self.opponent = Opponent(difficulty=5, rng=self.rng)
+        self.game_state = GAME_STATES["WAITING"]
+        self.round = 0
+        self.game_over = False
+        self.reaction_times = []
+        self.results = []
+        self.countdown_start_time = None
+        self.draw_trigger_time = None
+        self.draw_shown_time = None
+        self.pump_time = None
+        self.opponent_shot_time = None
+        self.round_end_time = None
+        self.reload_time = None
+        self.shell_drop_time = None
+        self.player_fired = False
+        self.round_results_from = 0
+        self.hit_flash_end = 0
+        self.played_eagle_sound = False
+        self.start_play_time = None
+        self.total_play_time = 0
+        # Fighters never move, so the pool's targets are set once and reused
+        if self.projectiles is None:
+            self.projectiles = ProjectilePool([hitbox_rects(self.player), hitbox_rects(self.opponent)])
+        self.projectiles.clear()
+        # Projectile slot -> (target slot, zone) it will hit, or None, for gallery shots
+        self.gallery_shots = {}
+        if self.gallery is not None:
+            self.gallery.clear()
+
+    def new_game(self, seed=None):
+        """Start a fresh game; with a seed, every roll in it is reproducible"""
+        if seed is not None:
+            self.seed = seed
+            self.rng.seed(seed)
+        self.reset()
+        self.game_state = GAME_STATES["WAITING"]
+
+    def step(self, dt, events=()):
+        """Advance the duel by dt milliseconds and return the cues emitted"""
+        target = self.now + dt
+        timed = sorted(
+            ((self.now if e.time is None else e.time), i, e)
+            for i, e in enumerate(events)
+        )
+        for when, _, event in timed:
+            self._advance_to(min(max(when, self.now), target))
+            self.handle(event)
+        self._advance_to(target)
+        cues, self.cues = self.cues, []
+        return cues
+
+    def handle(self, event):
+        state = self.game_state
+        if event.kind == START and state == GAME_STATES["WAITING"]:
+            self.start_game()
+        elif event.kind == FIRE and state == GAME_STATES["SHOOTING"]:
+            self.player_shoot(event.pos)
+        elif event.kind == CONTINUE and state == GAME_STATES["RESULT"]:
+            self.reset_game()
+        elif event.kind == RESTART and state == GAME_STATES["GAME_OVER"]:
+            self.new_game()
+        elif event.kind == SHOWN and state == GAME_STATES["SHOOTING"] and self.draw_shown_time is None:
+            self.draw_shown_time = max(self.draw_trigger_time, self.now if event.time is None else event.time)
+        elif event.kind == MENU:
+            self.game_state = GAME_STATES["MENU"]
+
+    def next_deadline(self):
+        deadlines = []
+        if self.shell_drop_time is not None:
+            deadlines.append(self.shell_drop_time)
+        if self.game_state == GAME_STATES["COUNTDOWN"]:
+            if self.pump_time is not None:
+                deadlines.append(self.pump_time)
+            deadlines.append(self.draw_trigger_time)
+        elif self.game_state == GAME_STATES["SHOOTING"]:
+            if self.opponent_shot_time is not None:
+                deadlines.append(self.opponent_shot_time)
+            if self.reload_time is not None:
+                deadlines.append(self.reload_time)
+            if self.gallery is not None and self.gallery.next_change() is not None:
+                deadlines.append(self.gallery.next_change())
+            if self.round_end_time is not None:
+                deadlines.append(self.round_end_time)
+        return min(deadlines) if deadlines else None
+
+    def scheduled_cues(self):
+        """(engine ms, cue) for upcoming cues that no input can cancel"""
+        if self.game_state == GAME_STATES["COUNTDOWN"] and self.pump_time is not None:
+            return [(self.pump_time, ("sound", "gun_pump"))]
+        return []
+
+    def _advance_to(self, when):
+        while True:
+            deadline = self.next_deadline()
+            if deadline is None or deadline > when:
+                break
+            self._move_projectiles(deadline)
+            # A hit on the way can end the round before the deadline is due
+            if self.next_deadline() != deadline:
+                continue
+            self.now = max(self.now, deadline)
+            self._fire_deadline()
+        self._move_projectiles(when)
+        self.now = when
+
+    def _move_projectiles(self, when):
+        """Fly every bullet from now to when, resolving hits at the time they land"""
+        if not self.projectiles.count or when <= self.now:
+            return
+        start = self.now
+        hits, retired = self.projectiles.step(when - start)
+        self.now = when
+        self._resolve_projectiles(hits, retired, start)
+
+    def _settle_projectiles(self):
+        """Fly the bullets still in the air to the end of their range"""
+        while self.projectiles.count:
+            hits, retired = self.projectiles.step(self.projectiles.flight_time())
+            self._resolve_projectiles(hits, retired, self.now)
+
+    def _resolve_projectiles(self, hits, retired, start):
+        for slot, _, zone, offset in hits:
+            self._projectile_hit(int(self.projectiles.owner[slot]), zone, start + offset)
+        for slot in retired:
+            if slot in self.gallery_shots:
+                self._gallery_shot_landed(self.gallery_shots.pop(slot))
+                continue
+            shooter = "Player" if self.projectiles.owner[slot] == PLAYER else "Opponent"
+            self.results.append(f"{shooter} Miss")
+        if self.timed_rounds and self.game_state == GAME_STATES["SHOOTING"]:
+            self._check_round_over()
+
+    def _projectile_hit(self, owner, zone, when):
+        victim = self.opponent if owner == PLAYER else self.player
+        zone_name = victim.hitboxes()[zone][0]
+        damage = HEAD_DAMAGE if zone_name == "head" else BODY_DAMAGE
+        victim.health -= damage
+        victim.last_hit_time = when
+        if owner == PLAYER:
+            self.player.update_score(damage)
+            self.results.append("Player Hit")
+        else:
+            self.results.append("Opponent Hit")
+        self.hit_flash_end = when + HIT_FLASH_MS
+
+    def _fire(self, owner, start_pos, angle, distance, lethal):
+        velocity = (math.cos(angle) * BULLET_SPEED, math.sin(angle) * BULLET_SPEED)
+        slot = self.projectiles.spawn(owner, start_pos, velocity, self.now, distance / BULLET_SPEED * 1000, lethal)
+        self.cues.append(("sound", "gunshot"))
+        return slot
+
+    def _fire_at_gallery(self, start_pos, angle):
+        """Trace the shot through the range now; it lands when its bullet gets there"""
+        end_pos = (start_pos[0] + math.cos(angle) * SHOT_RANGE, start_pos[1] + math.sin(angle) * SHOT_RANGE)
+        hit = self.gallery.raycast(start_pos, end_pos)
+        distance = SHOT_RANGE if hit is None else hit[2] * SHOT_RANGE
+        # The bullet is a tracer: the range, not the pool, decides what it hits
+        slot = self._fire(PLAYER, start_pos, angle, distance, lethal=False)
+        self.gallery_shots[slot] = None if hit is None else hit[:2]
+
+    def _gallery_shot_landed(self, hit):
+        # A plate that dropped while the bullet was in the air is a miss
+        if hit is None or not self.gallery.standing[hit[0]]:
+            self.results.append("Player Miss")
+            return
+        target, zone = hit
+        self.gallery.knock_down(target)
+        name = self.gallery.zone_name(target, zone)
+        self.player.update_score({"head": HEAD_DAMAGE, "body": BODY_DAMAGE}.get(name, PLATE_SCORE))
+        self.results.append("Player Hit")
+
+    def _check_round_over(self):
+        if self.gallery is not None:
+            if not self.gallery.remaining and not self.projectiles.count:
+                self.end_round()
+            return
+        out_of_ammo = self.player.weapon.current_ammo == 0 and self.opponent.weapon.current_ammo == 0
+        if (self.player.health <= 0 or self.opponent.health <= 0 or
+                (out_of_ammo and not self.projectiles.count)):
+            self.end_round()
+
+    def end_round(self):
+        """End a timed round before its clock runs out"""
+        self.game_state = GAME_STATES["RESULT"]
+        self.opponent_shot_time = None
+        self.round_end_time = None
+        self.reload_time = None
+
+    def _fire_deadline(self):
+        now = self.now
+        if self.shell_drop_time is not None and now >= self.shell_drop_time:
+            self.shell_drop_time = None
+            self.cues.append(("sound", "shell_drop"))
+        elif self.game_state == GAME_STATES["COUNTDOWN"]:
+            if self.pump_time is not None and now >= self.pump_time:
+                self.pump_time = None
+                self.cues.append(("sound", "gun_pump"))
+            elif now >= self.draw_trigger_time:
+                self.game_state = GAME_STATES["SHOOTING"]
+                self.cues.append(("draw",))
+        elif self.game_state == GAME_STATES["SHOOTING"]:
+            if self.opponent_shot_time is not None and now >= self.opponent_shot_time:
+                self.opponent_shoot()
+            elif self.reload_time is not None and now >= self.reload_time:
+                self.reload_time = None
+                self.player.weapon.reload()
+                self.cues.append(("sound", "reload"))
+            elif self.gallery is not None and self.gallery.next_change() is not None and \
+                    now >= self.gallery.next_change():
+                self.gallery.update(now)
+                self._check_round_over()
+            else:
+                self.end_round()
+
+    def start_game(self):
+        if self.start_play_time is None:
+            self.start_play_time = self.now
+
+        if self.game_over or self.round >= self.max_rounds:
+            return
+
+        self.cues.append(("stop_music",))
+        if not self.played_eagle_sound:
+            self.cues.append(("sound", "eagle"))
+            self.played_eagle_sound = True
+
+        self.cues.append(("sound", "desert_wind"))
+        self.round += 1
+
+        if self.opponent.health <= 0:
+            self.opponent = Opponent(difficulty=min(10, self.round + 3), rng=self.rng)
+        else:
+            self.opponent.reset_for_new_round()
+
+        self.game_state = GAME_STATES["COUNTDOWN"]
+        self.countdown_start_time = self.now
+        delay = self.rng.randint(2000, 4000)
+        self.draw_trigger_time = self.now + delay
+        self.draw_shown_time = None
+        self.pump_time = self.now + delay - PUMP_LEAD_MS
+        self.opponent_shot_time = self.draw_trigger_time + int(self.opponent.reaction_time * 1000)
+        if self.shootout:
+            self.round_end_time = self.draw_trigger_time + SHOOTOUT_MS
+        if self.gallery is not None:
+            # The opponent sits gallery rounds out
+            self.opponent_shot_time = None
+            self.round_end_time = self.draw_trigger_time + GALLERY_MS
+            self.gallery.populate(self.rng, self.gallery_size, self.draw_trigger_time, GALLERY_MS)
+        self.round_results_from = len(self.results)
+        self.player.weapon.reload()
+        self.cues.append(("sound", "reload"))
+        self.player_fired = False
+        self.player.reaction_time = 0
+
+    def countdown_remaining(self):
+        elapsed = (self.now - self.countdown_start_time) // 1000
+        return max(0, self.countdown_duration - int(elapsed))
+
+    def player_shoot(self, aim_pos):
+        now = self.now
+        can_fire = self.player.weapon.can_fire(now)
+        # In a timed round, a click while reloading the hammer or out of rounds does nothing
+        if self.timed_rounds and not can_fire:
+            return
+        if not self.player_fired:
+            self.player_fired = True
+            # Without a SHOWN event (headless play) the draw counts as shown at once
+            shown = self.draw_trigger_time if self.draw_shown_time is None else self.draw_shown_time
+            self.player.reaction_time = round((now - shown) / 1000, 3)
+            self.reaction_times.append(self.player.reaction_time)
+        self.shell_drop_time = now + SHELL_DROP_DELAY_MS
+        if not self.timed_rounds:
+            self.game_state = GAME_STATES["RESULT"]
+
+        on_target = self.player.shoot(now, self.rng)
+        if not can_fire:
+            self.results.append("Player Miss")
+            return
+
+        self.player.last_shot_time = now
+        start_pos = self.player.muzzle_pos()
+        angle = math.atan2(aim_pos[1] - start_pos[1], aim_pos[0] - start_pos[0])
+        if not on_target:
+            # Off target: the shot pulls wide and cannot hit
+            angle += math.radians(self.rng.uniform(*WILD_SHOT_DEG)) * self.rng.choice((-1, 1))
+        if self.gallery is None:
+            self._fire(PLAYER, start_pos, angle, SHOT_RANGE, lethal=on_target)
+            return
+        self._fire_at_gallery(start_pos, angle)
+        if self.player.weapon.current_ammo == 0:
+            self.reload_time = now + GALLERY_RELOAD_MS
+
+    def opponent_shoot(self):
+        now = self.now
+        self.opponent.has_shot_this_round = True
+        self.opponent_shot_time = None
+        if not self.shootout:
+            self.game_state = GAME_STATES["RESULT"]
+
+        can_fire = self.opponent.weapon.can_fire(now)
+        on_target = self.opponent.shoot(now)
+        if not can_fire:
+            self.results.append("Opponent Miss")
+            return
+
+        self.opponent.last_shot_time = now
+        start_pos = self.opponent.muzzle_pos()
+        target_choice = "miss"
+        if on_target:
+            target_choice = self.rng.choices(
+                ["head", "body", "miss"],
+                weights=self.opponent.target_weights()
+            )[0]
+
+        if target_choice == "miss":
+            end_pos = (
+                self.rng.randint(*MISS_AREA[0]),
+                self.rng.randint(*MISS_AREA[1])
+            )
+        else:
+            target_rect = self.player.head_rect if target_choice == "head" else self.player.body_rect
+            jitter_x, jitter_y = AIM_JITTER[target_choice]
+            end_pos = (
+                target_rect.centerx + self.rng.randint(-jitter_x, jitter_x),
+                target_rect.centery + self.rng.randint(-jitter_y, jitter_y)
+            )
+
+        # Aimed shots fly to their end point, so they hit what a trace to it
+        # would; "miss" shots are never traced, so they cannot hit
+        angle = math.atan2(end_pos[1] - start_pos[1], end_pos[0] - start_pos[0])
+        distance = math.hypot(end_pos[0] - start_pos[0], end_pos[1] - start_pos[1])
+        self._fire(OPPONENT, start_pos, angle, distance, lethal=target_choice != "miss")
+
+        if self.shootout and self.opponent.weapon.current_ammo > 0:
+            self.opponent_shot_time = (now + self.opponent.weapon.fire_rate + 1 +
+                                       self.rng.randint(0, OPPONENT_REFIRE_JITTER_MS))
+
+    def reset_game(self):
+        # Bullets still in the air land before the round is scored
+        self._settle_projectiles()
+        if self.gallery is not None:
+            self.gallery.clear()
+        self.cues.append(("round_complete", self.round_record()))
+        if self.player.health <= 0 or self.opponent.health <= 0 or self.round >= self.max_rounds:
+            self.game_over = True
+            self.game_state = GAME_STATES["GAME_OVER"]
+            self.cues.append(("stop_all",))
+            self.cues.append(("music", "menu_music"))
+            self.played_eagle_sound = False
+        else:
+            self.player.weapon.reload()
+            self.opponent.weapon.reload()
+            self.game_state = GAME_STATES["WAITING"]
+
+    def round_record(self):
+        if self.start_play_time is not None:
+            self.total_play_time = (self.now - self.start_play_time) / 1000
+
+        simple_result = self.round_result() or "N/A"
+        return [
+            self.round,
+            self.player.reaction_time,
+            simple_result,
+            self.opponent.difficulty_level,
+            self.player.score,
+            round(self.total_play_time, 2)
+        ]
+
+    def round_result(self):
+        """The latest result this round, or None before any shot has landed"""
+        if len(self.results) > self.round_results_from:
+            return self.results[-1]
+        return None
+
+    def result_text(self):
+        if self.player.health <= 0:
+            return "YOU LOST!"
+        elif self.opponent.health <= 0:
+            return "YOU WON!"
+        return "GAME OVER"
+
+
+def play_round(engine, reaction_ms, aim_pos=(675, 350)):
+    """Drive one full round headlessly and return its result string"""
+    engine.step(0, [InputEvent(START)])
+    if engine.game_state == GAME_STATES["COUNTDOWN"]:
+        engine.step(engine.draw_trigger_time - engine.now)
+    if engine.game_state == GAME_STATES["SHOOTING"]:
+        fire_time = max(engine.now, engine.draw_trigger_time + reaction_ms)
+        engine.step(fire_time - engine.now, [InputEvent(FIRE, aim_pos, fire_time)])
+    if engine.game_state == GAME_STATES["SHOOTING"] and engine.round_end_time is not None:
+        # The rest of a timed round plays out without the player
+        engine.step(engine.round_end_time - engine.now)
+    # Continuing lands any bullets still in flight first
+    engine.step(0, [InputEvent(CONTINUE)])
+    return engine.round_result() or "N/A"
+
+
+if __name__ == "__main__":
+    import time
+
+    engine = DuelEngine(seed=1)
+    rounds = 0
+    started = time.perf_counter()
+    while rounds < 5000:
+        engine.new_game()
+        while engine.game_state == GAME_STATES["WAITING"]:
+            play_round(engine, engine.rng.uniform(200, 700))
+            rounds += 1
+    elapsed = time.perf_counter() - started
+    print(f"{rounds} rounds in {elapsed:.2f}s ({rounds / elapsed:.0f} rounds/s)")
@@ -0,0 +1,278 @@
+# Eagle Eyes - Shooting-gallery targets and their spatial hash
+#
+# A gallery round puts dozens to hundreds of targets on the range at once:
+# cardboard outlaws that stand for the whole round (head and body zones, like
+# the duel's fighters) and plates that pop up for a moment (one zone). Targets
+# are rows of NumPy arrays rather than Opponent objects.
+#
+# Standing targets are also entered in a uniform grid. raycast() walks only
+# the cells a shot passes through, nearest first, and stops at the first cell
+# that cannot hold anything nearer than what it has already hit. A shot
+# therefore tests the few targets along its path, and the cost of a shot
+# stays about the same however many targets the range holds.
+#
+# Hits match hitscan.first_hit on each target's zones: the shot enters an
+# outlaw's head if its entry point is no lower than the head's bottom edge.
+# On an exact tie between targets the lower slot wins, as in batch_first_hit.
+import heapq
+import math
+
+import numpy as np
+import pygame
+
+OUTLAW, PLATE = 0, 1
+ZONES = {OUTLAW: ("head", "body"), PLATE: ("plate",)}
+OUTLAW_SIZE = (30, 60)
+OUTLAW_HEAD = 18
+PLATE_SIZE = (20, 20)
+# Share of the targets that are outlaws; the rest are pop-up plates
+OUTLAW_SHARE = 0.25
+# How long (ms) a plate stays up
+PLATE_UP_MS = (600, 1500)
+# Grid cells are sized for about this many targets each, within CELL_PX
+TARGETS_PER_CELL = 4
+CELL_PX = (16, 64)
+
+
+class TargetField:
+    def __init__(self, capacity, area, cell=None):
+        self.capacity = capacity
+        # (left, top, width, height) the targets are placed in and the grid covers
+        self.area = area
+        if cell is None:
+            # Denser ranges get finer cells, so a cell holds a handful of targets
+            cell = math.sqrt(area[2] * area[3] * TARGETS_PER_CELL / max(1, capacity))
+            cell = int(min(CELL_PX[1], max(CELL_PX[0], cell)))
+        self.cell = cell
+        self.rect = np.zeros((capacity, 4))
+        self.kind = np.zeros(capacity, dtype=np.int8)
+        self.up_at = np.zeros(capacity)
+        self.down_at = np.zeros(capacity)
+        self.standing = np.zeros(capacity, dtype=bool)
+        self.count = 0
+        # Targets not yet hit or dropped, including plates still to pop up
+        self.remaining = 0
+
+        self.cols = max(1, math.ceil(area[2] / cell))
+        self.rows = max(1, math.ceil(area[3] / cell))
+        # Each cell lists (slot, left, top, right, bottom, head bottom) of the
+        # standing targets overlapping it; head bottom is None for plates
+        self.cells = [[] for _ in range(self.cols * self.rows)]
+        self._entries = [None] * capacity
+        self._spans = [()] * capacity
+        # (time, slot, up) pop-up and drop events, soonest first
+        self._events = []
+        # A target is tested once per shot even if it spans several cells
+        self._seen = [0] * capacity
+        self._query = 0
+        self.tests = 0
+
+    def stats(self):
+        return {"targets": self.count, "standing": int(self.standing[:self.count].sum()),
+                "remaining": self.remaining, "shots": self._query, "tests": self.tests}
+
+    def clear(self):
+        for slot in np.flatnonzero(self.standing).tolist():
+            self._remove(slot)
+        self._events = []
+        self.count = 0
+        self.remaining = 0
+
+    def populate(self, rng, count, start, duration):
+        """Lay out count targets for a round running from start for duration ms"""
+        self.clear()
+        count = min(count, self.capacity)
+        left, top, width, height = self.area
+        for slot in range(count):
+            kind = OUTLAW if rng.random() < OUTLAW_SHARE else PLATE
+            size = OUTLAW_SIZE if kind == OUTLAW else PLATE_SIZE
+            self.rect[slot] = (rng.uniform(left, left + width - size[0]),
+                               rng.uniform(top, top + height - size[1])) + size
+            self.kind[slot] = kind
+            if kind == OUTLAW:
+                up_at, down_at = start, start + duration
+            else:
+                up_at = start + rng.uniform(0, duration - PLATE_UP_MS[1])
+                down_at = up_at + rng.uniform(*PLATE_UP_MS)
+            self.up_at[slot], self.down_at[slot] = up_at, down_at
+            self._events.append((up_at, slot, True))
+            self._events.append((down_at, slot, False))
+        heapq.heapify(self._events)
+        self.count = self.remaining = count
+
+    def next_change(self):
+        """Engine time of the next pop-up or drop, or None"""
+        return self._events[0][0] if self._events else None
+
+    def update(self, now):
+        """Raise and drop every target due by now"""
+        events = self._events
+        while events and events[0][0] <= now:
+            _, slot, up = heapq.heappop(events)
+            if up:
+                self._insert(slot)
+            elif self.standing[slot]:
+                self._remove(slot)
+                self.remaining -= 1
+
+    def knock_down(self, slot):
+        if self.standing[slot]:
+            self._remove(slot)
+            self.remaining -= 1
+
+    def _insert(self, slot):
+        left, top, width, height = self.rect[slot].tolist()
+        right, bottom = left + width, top + height
+        split = top + OUTLAW_HEAD if self.kind[slot] == OUTLAW else None
+        entry = (slot, left, top, right, bottom, split)
+        x0, y0 = self.area[0], self.area[1]
+        cols = range(self._clamp(left - x0, self.cols), self._clamp(right - x0, self.cols) + 1)
+        rows = range(self._clamp(top - y0, self.rows), self._clamp(bottom - y0, self.rows) + 1)
+        span = tuple(row * self.cols + col for row in rows for col in cols)
+        for index in span:
+            self.cells[index].append(entry)
+        self._entries[slot] = entry
+        self._spans[slot] = span
+        self.standing[slot] = True
+
+    def _remove(self, slot):
+        entry = self._entries[slot]
+        for index in self._spans[slot]:
+            self.cells[index].remove(entry)
+        self._entries[slot] = None
+        self._spans[slot] = ()
+        self.standing[slot] = False
+
+    def _clamp(self, offset, cells):
+        return min(cells - 1, max(0, int(offset // self.cell)))
+
+    def raycast(self, start, end):
+        """First standing target the segment enters as (slot, zone, fraction), or None"""
+        self._query += 1
+        query = self._query
+        x0, y0 = start
+        dx, dy = end[0] - x0, end[1] - y0
+        # Clip the segment to the grid; nothing outside it can be hit
+        gx, gy, gw, gh = self.area
+        t_in, t_out = 0.0, 1.0
+        for p, d, low, high in ((x0, dx, gx, gx + gw), (y0, dy, gy, gy + gh)):
+            if d == 0:
+                if p < low or p > high:
+                    return None
+                continue
+            t1, t2 = (low - p) / d, (high - p) / d
+            if t1 > t2:
+                t1, t2 = t2, t1
+            t_in, t_out = max(t_in, t1), min(t_out, t2)
+            if t_in > t_out:
+                return None
+
+        # Walk the cells along the segment (Amanatides & Woo)
+        cell = self.cell
+        col = self._clamp(x0 + dx * t_in - gx, self.cols)
+        row = self._clamp(y0 + dy * t_in - gy, self.rows)
+        step_col = 1 if dx > 0 else -1
+        step_row = 1 if dy > 0 else -1
+        if dx:
+            next_col = ((gx + (col + (dx > 0)) * cell) - x0) / dx
+            delta_col = cell / abs(dx)
+        else:
+            next_col = delta_col = math.inf
+        if dy:
+            next_row = ((gy + (row + (dy > 0)) * cell) - y0) / dy
+            delta_row = cell / abs(dy)
+        else:
+            next_row = delta_row = math.inf
+
+        seen = self._seen
+        cells = self.cells
+        best_t = math.inf
+        best = None
+        tests = 0
+        while True:
+            for entry in cells[row * self.cols + col]:
+                slot = entry[0]
+                if seen[slot] == query:
+                    continue
+                seen[slot] = query
+                tests += 1
+                t = _entry_fraction(x0, y0, dx, dy, entry)
+                if t is not None and (t < best_t or (t == best_t and slot < best[0])):
+                    best_t, best = t, entry
+            cell_exit = min(next_col, next_row, t_out)
+            # Anything in a later cell is entered after this one is left
+            if best_t <= cell_exit or cell_exit >= t_out:
+                break
+            if next_col < next_row:
+                col += step_col
+                next_col += delta_col
+                if not 0 <= col < self.cols:
+                    break
+            else:
+                row += step_row
+                next_row += delta_row
+                if not 0 <= row < self.rows:
+                    break
+        self.tests += tests
+
+        if best is None:
+            return None
+        slot, split = best[0], best[5]
+        zone = 0 if split is None or y0 + dy * best_t <= split else 1
+        return slot, zone, best_t
+
+    def zone_name(self, slot, zone):
+        return ZONES[int(self.kind[slot])][zone]
+
+    def zone_rects(self, slot):
+        """(name, rect) zones of a target, as a fighter's hitboxes()"""
+        left, top, width, height = self.rect[slot].tolist()
+        if self.kind[slot] == PLATE:
+            return (("plate", (left, top, width, height)),)
+        return (("head", (left, top, width, OUTLAW_HEAD)),
+                ("body", (left, top + OUTLAW_HEAD, width, height - OUTLAW_HEAD)))
+
+    def blit_sequence(self, sprites):
+        """(sprite, position) pairs of the standing targets for Surface.blits()"""
+        standing = np.flatnonzero(self.standing)
+        kinds = self.kind[standing].tolist()
+        corners = self.rect[standing, :2].astype(np.int32).tolist()
+        return [(sprites[kind], corner) for kind, corner in zip(kinds, corners)]
+
+
+def _entry_fraction(x0, y0, dx, dy, entry):
+    """hitscan.segment_entry against an (slot, left, top, right, bottom, _) entry"""
+    t_near, t_far = 0.0, 1.0
+    for p, d, low, high in ((x0, dx, entry[1], entry[3]), (y0, dy, entry[2], entry[4])):
+        if d == 0:
+            if p < low or p > high:
+                return None
+            continue
+        t1 = (low - p) / d
+        t2 = (high - p) / d
+        if t1 > t2:
+            t1, t2 = t2, t1
+        if t1 > t_near:
+            t_near = t1
+        if t2 < t_far:
+            t_far = t2
+        if t_near > t_far:
+            return None
+    return t_near
+
+
+def target_sprites():
+    """Sprite for each target kind"""
+    outlaw = pygame.Surface(OUTLAW_SIZE, pygame.SRCALPHA)
+    width, height = OUTLAW_SIZE
+    pygame.draw.rect(outlaw, (150, 110, 70), (4, OUTLAW_HEAD, width - 8, height - OUTLAW_HEAD), border_radius=4)
+    pygame.draw.ellipse(outlaw, (225, 190, 150), (7, 3, width - 14, OUTLAW_HEAD - 2))
+    pygame.draw.rect(outlaw, (70, 45, 25), (0, 0, width, 6), border_radius=2)
+    pygame.draw.circle(outlaw, (200, 40, 40), (width // 2, OUTLAW_HEAD + 18), 6, 2)
+
+    plate = pygame.Surface(PLATE_SIZE, pygame.SRCALPHA)
+    radius = PLATE_SIZE[0] // 2
+    pygame.draw.circle(plate, (240, 240, 230), (radius, radius), radius)
+    pygame.draw.circle(plate, (200, 40, 40), (radius, radius), radius - 3)
+    pygame.draw.circle(plate, (240, 240, 230), (radius, radius), radius // 3)
+    return {OUTLAW: outlaw.convert_alpha(), PLATE: plate.convert_alpha()}
@@ -5,14 +5,6 @@ import csv
 import time
 import os
 
-# Initialize Pygame
-pygame.init()
-pygame.mixer.init()
-screen = pygame.display.set_mode((800, 600))
-pygame.display.set_caption("Eagle Eyes")
-font = pygame.font.SysFont(None, 48)
-clock = pygame.time.Clock()
-
 # Colors
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
@@ -25,6 +17,15 @@ HAT = (160, 82, 45)
 YELLOW = (255, 255, 0)
 
 # ---------------------------- Classes ----------------------------
+def init_display(size=(800, 600)):
+    """Start pygame and open the window; importing this module does neither"""
+    pygame.init()
+    pygame.mixer.init()
+    screen = pygame.display.set_mode(size)
+    pygame.display.set_caption("Eagle Eyes")
+    return screen
+
+
 class Timer:
     def __init__(self):
         self.start_time = None
@@ -211,7 +212,8 @@ class MainMenu:
 
 
 class UI:
-    def __init__(self):
+    def __init__(self, screen):
+        self.screen = screen
         self.font = pygame.font.SysFont("Arial", 24)
         self.font_large = pygame.font.SysFont("Arial", 36)
 
@@ -219,17 +221,17 @@ class UI:
         render = self.font.render(text, True, color)
         if center:
             rect = render.get_rect(center=(x, y))
-            screen.blit(render, rect)
+            self.screen.blit(render, rect)
         else:
-            screen.blit(render, (x, y))
+            self.screen.blit(render, (x, y))
 
     def draw_large_text(self, text, x, y, color=BLACK, center=False):
         render = self.font_large.render(text, True, color)
         if center:
             rect = render.get_rect(center=(x, y))
-            screen.blit(render, rect)
+            self.screen.blit(render, rect)
         else:
-            screen.blit(render, (x, y))
+            self.screen.blit(render, (x, y))
 
     def update(self):
         pygame.display.flip()
@@ -261,11 +263,12 @@ class SFX:
 
 
 class Game:
-    def __init__(self):
+    def __init__(self, screen):
+        self.screen = screen
         self.player = Player()
         self.opponent = Opponent(difficulty=5)
         self.timer = Timer()
-        self.ui = UI()
+        self.ui = UI(screen)
         self.sfx = SFX()
         self.game_state = "menu"
         self.round = 0
@@ -353,22 +356,22 @@ class Game:
             ])
 
     def draw_hitboxes(self):
-        pygame.draw.rect(screen, RED, self.player.rect, 2)
-        pygame.draw.rect(screen, RED, self.opponent.rect, 2)
+        pygame.draw.rect(self.screen, RED, self.player.rect, 2)
+        pygame.draw.rect(self.screen, RED, self.opponent.rect, 2)
 
     def draw_bullet_trace(self):
         for start, end in self.bullet_trace:
-            pygame.draw.line(screen, GREEN, start, end, 3)
+            pygame.draw.line(self.screen, GREEN, start, end, 3)
 
     def draw_health_bars(self):
         # Player health
-        pygame.draw.rect(screen, RED, (50, 20, 200, 20))
-        pygame.draw.rect(screen, GREEN, (50, 20, 200 * (self.player.health/self.player.max_health), 20))
+        pygame.draw.rect(self.screen, RED, (50, 20, 200, 20))
+        pygame.draw.rect(self.screen, GREEN, (50, 20, 200 * (self.player.health/self.player.max_health), 20))
         self.ui.draw_text(f"{self.player.health}/{self.player.max_health}", 150, 25, WHITE)
         
         # Opponent health
-        pygame.draw.rect(screen, RED, (550, 20, 200, 20))
-        pygame.draw.rect(screen, GREEN, (550, 20, 200 * (self.opponent.health/self.opponent.max_health), 20))
+        pygame.draw.rect(self.screen, RED, (550, 20, 200, 20))
+        pygame.draw.rect(self.screen, GREEN, (550, 20, 200 * (self.opponent.health/self.opponent.max_health), 20))
         self.ui.draw_text(f"{self.opponent.health}/{self.opponent.max_health}", 650, 25, WHITE)
 
     def draw_ammo(self):
@@ -381,16 +384,16 @@ class Game:
         self.ui.draw_text(opp_ammo_text, 550, 50, WHITE)
 
     def draw_background(self):
-        screen.blit(self.bg_desert, (0, 0))
+        self.screen.blit(self.bg_desert, (0, 0))
 
         self.bg_cloud_x -= 0.3  # Move cloud slower
         if self.bg_cloud_x <= -800:
             self.bg_cloud_x = 0
-        screen.blit(self.bg_cloud, (self.bg_cloud_x, 0))
-        screen.blit(self.bg_cloud, (self.bg_cloud_x + 800, 0))
+        self.screen.blit(self.bg_cloud, (self.bg_cloud_x, 0))
+        self.screen.blit(self.bg_cloud, (self.bg_cloud_x + 800, 0))
 
     def draw_game_over(self):
-        screen.fill(BLACK)
+        self.screen.fill(BLACK)
         if self.player.health <= 0:
             result_text = "YOU LOST!"
         elif self.opponent.health <= 0:
@@ -405,19 +408,20 @@ class Game:
     def run(self):
         running = True
         draw_time = False
+        clock = pygame.time.Clock()
 
         while running:
             current_time = pygame.time.get_ticks()
             
             if self.game_state == "menu":
-                screen.fill(BLACK)
+                self.screen.fill(BLACK)
                 menu_result = self.menu.handle_input()
                 if menu_result == "quit":
                     running = False
                 elif menu_result == "game":
-                    self.__init__()  # Reset game state
+                    self.__init__(self.screen)  # Reset game state
                     self.game_state = "waiting"
-                self.menu.draw(screen)
+                self.menu.draw(self.screen)
                 self.ui.update()
                 clock.tick(60)
                 continue
@@ -428,7 +432,7 @@ class Game:
                         running = False
                     elif event.type == pygame.KEYDOWN:
                         if event.key == pygame.K_r:  # Restart
-                            self.__init__()
+                            self.__init__(self.screen)
                             self.game_state = "waiting"
                         elif event.key == pygame.K_ESCAPE:  # Back to menu
                             self.game_state = "menu"
@@ -436,7 +440,7 @@ class Game:
                 clock.tick(60)
                 continue
 
-            screen.fill(BLACK)
+            self.screen.fill(BLACK)
             self.draw_background()
             
             for event in pygame.event.get():
@@ -491,8 +495,8 @@ class Game:
                     self.reset_game()
 
             # Draw game elements
-            self.player.draw(screen)
-            self.opponent.draw(screen)
+            self.player.draw(self.screen)
+            self.opponent.draw(self.screen)
             self.draw_health_bars()
             self.draw_ammo()
             self.draw_hitboxes()
@@ -512,6 +516,6 @@ class Game:
 
 # ---------------------------- Main Game Loop ----------------------------
 if __name__ == "__main__":
-    game = Game()
+    game = Game(init_display())
     game.run()
     pygame.quit()
\ No newline at end of file
@@ -0,0 +1,96 @@
+# Eagle Eyes - Input timestamping and frame pacing
+#
+# pygame 2.6 events carry no timestamp, and SDL only lets the main thread
+# pump its event queue, so events are stamped on the main thread as soon as
+# they are pumped. Instead of sleeping a whole frame in clock.tick(), the
+# frame clock waits in short slices and pumps input between them, so a click
+# is stamped with time.perf_counter_ns() within about poll_interval of when it
+# happened rather than whenever the next frame starts. The game loop only
+# consumes the stamped events.
+#
+# The same waits run timers set on that clock with call_at(), so a cue can
+# fire at its own time instead of at the next frame boundary.
+import heapq
+import itertools
+import time
+
+import pygame
+
+
+class InputSampler:
+    def __init__(self, poll_interval_ns=1_000_000):
+        self.poll_interval_ns = poll_interval_ns
+        self.pending = []
+        self.timers = []
+        self.timer_ids = itertools.count()
+
+    def call_at(self, due_ns, fn):
+        """Run fn() at perf_counter_ns due_ns, or at the next poll if that has passed"""
+        heapq.heappush(self.timers, (due_ns, next(self.timer_ids), fn))
+
+    def cancel_timers(self):
+        self.timers = []
+
+    def run_timers(self):
+        while self.timers and self.timers[0][0] <= time.perf_counter_ns():
+            heapq.heappop(self.timers)[2]()
+
+    def poll(self):
+        self.run_timers()
+        events = pygame.event.get()
+        if events:
+            stamp = time.perf_counter_ns()
+            self.pending.extend((stamp, event) for event in events)
+
+    def wait_until(self, deadline_ns):
+        """Sleep until deadline_ns (perf_counter_ns), stamping input and running timers meanwhile"""
+        while True:
+            self.poll()
+            now = time.perf_counter_ns()
+            remaining = deadline_ns - now
+            if remaining <= 0:
+                return
+            if self.timers:
+                remaining = min(remaining, max(0, self.timers[0][0] - now))
+            time.sleep(min(remaining, self.poll_interval_ns) / 1e9)
+
+    def drain(self):
+        """All (stamp_ns, event) pairs since the last drain, oldest first"""
+        self.poll()
+        events, self.pending = self.pending, []
+        return events
+
+    def events(self):
+        return [event for _, event in self.drain()]
+
+
+class FrameClock:
+    """clock.tick() replacement timed with perf_counter_ns; fps=0 runs uncapped"""
+
+    def __init__(self, fps=60, sampler=None):
+        self.sampler = sampler or InputSampler()
+        self.set_fps(fps)
+        self.last_ns = time.perf_counter_ns()
+        self.previous_ns = self.last_ns
+
+    def set_fps(self, fps):
+        self.fps = fps
+        self.period_ns = int(1e9 / fps) if fps else 0
+
+    def tick(self):
+        """Wait out the rest of the frame; returns milliseconds since the last tick"""
+        if self.period_ns:
+            self.sampler.wait_until(self.last_ns + self.period_ns)
+        else:
+            self.sampler.poll()
+        now = time.perf_counter_ns()
+        self.previous_ns, self.last_ns = self.last_ns, now
+        return (now - self.previous_ns) / 1e6
+
+    def to_engine_time(self, stamp_ns, engine_now):
+        """Engine ms for a stamp, given engine_now is the engine time at the previous tick"""
+        return engine_now + (stamp_ns - self.previous_ns) / 1e6
+
+    def to_stamp(self, engine_time, engine_now):
+        """perf_counter_ns for an engine time, given engine_now is the engine time at the last tick"""
+        return self.last_ns + int((engine_time - engine_now) * 1e6)
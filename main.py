@@ -1,27 +1,17 @@
-import pygame
-import random
-import math
-import csv
 import time
+# Reference point for the time-to-first-frame report
+STARTED = time.perf_counter()
+
+import pygame
 import os
 import sys
 from pygame import mixer
 
-# Initialize pygame
-pygame.init()
-screen = pygame.display.set_mode((800, 600))
-pygame.display.set_caption("Eagle Eyes")
-clock = pygame.time.Clock()
-
-# Game Constants
-GAME_STATES = {
-    "MENU": "menu",
-    "COUNTDOWN": "countdown",
-    "WAITING": "waiting",
-    "SHOOTING": "shooting",
-    "RESULT": "result",
-    "GAME_OVER": "game_over"
-}
+from profiler import FrameProfiler
+from renderer import FullRenderer, DirtyRectRenderer, LayerCache
+from input_timing import FrameClock, InputSampler
+from gallery import target_sprites
+from engine import GAME_STATES, HIT_FLASH_MS, PLAYER, SHOWN, START, FIRE, CONTINUE, MENU, DuelEngine, InputEvent
 
 # Colors
 WHITE = (255, 255, 255)
@@ -29,15 +19,36 @@ BLACK = (0, 0, 0)
 RED = (255, 0, 0)
 GREEN = (0, 255, 0)
 BLUE = (0, 0, 255)
-BROWN = (139, 69, 19)
-SKIN = (255, 220, 177)
-DARK_BLUE = (0, 0, 139)
-HAT = (160, 82, 45)
 YELLOW = (255, 255, 0)
 HIT_FLASH = (255, 100, 100, 100)
 MENU_BG_COLOR = WHITE
 MENU_TEXT_COLOR = BLACK
 
+# Game logic advances in fixed steps, independent of the render rate
+LOGIC_HZ = 120
+STEP_MS = 1000 / LOGIC_HZ
+# Longest stretch of logic caught up in one frame (e.g. after a stall)
+MAX_FRAME_MS = 250
+# How often the profiler overlay text is refreshed
+PROFILE_OVERLAY_MS = 250
+# Mixer buffer in samples: pygame's default, and the low-latency setting.
+# A cue can wait up to one buffer before it is mixed, then plays one buffer later.
+AUDIO_BUFFER = 512
+LOW_LATENCY_BUFFER = 256
+# How far ahead fixed-time cues are handed to the frame clock to play on time
+AUDIO_LOOKAHEAD_MS = 50
+# Baked assets; rebuilt in the background whenever assets/ changes
+ASSET_PACK = "assets.pack"
+
+def init_display(size=(800, 600), audio_buffer=AUDIO_BUFFER):
+    """Start pygame and open the window; importing this module does neither"""
+    # pygame.init() opens the mixer, so its buffer size has to be set first
+    pygame.mixer.pre_init(44100, -16, 2, audio_buffer)
+    pygame.init()
+    screen = pygame.display.set_mode(size)
+    pygame.display.set_caption("Eagle Eyes")
+    return screen
+
 def resource_path(relative_path):
     """Get absolute path to resource, works for dev and for PyInstaller"""
     try:
@@ -46,163 +57,18 @@ def resource_path(relative_path):
         base_path = os.path.abspath(".")
     return os.path.join(base_path, relative_path)
 
-class Timer:
-    def __init__(self):
-        self.start_time = None
-        self.end_time = None
-
-    def start(self):
-        self.start_time = time.time()
-
-    def stop(self):
-        self.end_time = time.time()
-
-    def get_reaction_time(self):
-        if self.start_time and self.end_time:
-            return round(self.end_time - self.start_time, 3)
-        return 0
-
-class Weapon:
-    def __init__(self, name, damage, accuracy, fire_rate=500, ammo=6):
-        self.name = name
-        self.damage = damage
-        self.accuracy = accuracy
-        self.fire_rate = fire_rate
-        self.max_ammo = ammo
-        self.current_ammo = ammo
-        self.last_shot_time = 0
-        
-    def can_fire(self):
-        now = pygame.time.get_ticks()
-        return (now - self.last_shot_time > self.fire_rate and 
-                self.current_ammo > 0)
-                
-    def fire(self):
-        if self.can_fire():
-            self.last_shot_time = pygame.time.get_ticks()
-            self.current_ammo -= 1
-            return random.random() <= self.accuracy
-        return False
-
-    def reload(self):
-        self.current_ammo = self.max_ammo
-
-class Player:
-    def __init__(self, name="Player"):
-        self.name = name
-        self.score = 0
-        self.health = 100
-        self.max_health = 100
-        self.reaction_time = 0
-        self.weapon = Weapon("Revolver", damage=50, accuracy=0.8)
-        self.rect = pygame.Rect(100, 300, 50, 100)
-        self.head_rect = pygame.Rect(100, 300, 50, 30)
-        self.body_rect = pygame.Rect(100, 330, 50, 70)
-        self.is_shooting = False
-        self.last_shot_time = 0
-
-    def check_hit(self, bullet_pos):
-        if self.head_rect.collidepoint(bullet_pos):
-            return "head"
-        elif self.body_rect.collidepoint(bullet_pos):
-            return "body"
-        return None
-
-    def draw_gun(self):
-        pass
-
-    def shoot(self):
-        return self.weapon.fire()
-
-    def update_score(self, amount):
-        self.score += amount
-
-    def draw(self, surface):
-        x, y, w, h = self.rect
-        pygame.draw.rect(surface, BROWN, (x + 10, y + 30, 30, 50))
-        pygame.draw.circle(surface, SKIN, (x + 25, y + 20), 15)
-        pygame.draw.rect(surface, HAT, (x + 10, y + 5, 30, 10))
-        pygame.draw.rect(surface, HAT, (x + 5, y + 15, 40, 5))
-        pygame.draw.rect(surface, DARK_BLUE, (x + 10, y + 80, 10, 20))
-        pygame.draw.rect(surface, DARK_BLUE, (x + 30, y + 80, 10, 20))
-        
-        if self.is_shooting:
-            pygame.draw.line(surface, YELLOW, (x + 40, y + 50), (x + 70, y + 40), 3)
-            self.is_shooting = False
-        else:
-            pygame.draw.line(surface, (192, 192, 192), (x + 40, y + 50), (x + 50, y + 50), 3)
-
-class Opponent:
-    def __init__(self, difficulty=5):
-        self.difficulty_level = difficulty
-        self.health = 100
-        self.max_health = 100
-        self.reaction_time = self.random_reaction_time()
-        self.weapon = Weapon("Revolver", damage=50, accuracy=0.7)
-        self.rect = pygame.Rect(650, 300, 50, 100)
-        self.head_rect = pygame.Rect(650, 300, 50, 30)
-        self.body_rect = pygame.Rect(650, 330, 50, 70)
-        self.is_shooting = False
-        self.last_shot_time = 0
-        self.has_shot_this_round = False  # New flag to track shooting per round
-
-    def reset_for_new_round(self):
-        """Reset shooting state for a new round"""
-        self.reaction_time = self.random_reaction_time()
-        self.is_shooting = False
-        self.has_shot_this_round = False
-        self.weapon.reload()
-
-    def check_hit(self, bullet_pos):
-        if self.head_rect.collidepoint(bullet_pos):
-            return "head"
-        elif self.body_rect.collidepoint(bullet_pos):
-            return "body"
-        return None
-
-    def draw_gun(self):
-        pass
-
-    def shoot(self):
-        accuracy_boost = min(0.2, self.difficulty_level * 0.02)
-        if self.weapon.can_fire():
-            self.weapon.last_shot_time = pygame.time.get_ticks()
-            self.weapon.current_ammo -= 1
-            self.is_shooting = True
-            return random.random() <= (self.weapon.accuracy + accuracy_boost)
-        return False
-
-    def random_reaction_time(self):
-        base = max(0.1, 1.0 - self.difficulty_level * 0.08)
-        variation = max(0.05, 0.3 - self.difficulty_level * 0.02)
-        return round(random.uniform(base, base + variation), 2)
-
-    def draw(self, surface):
-        x, y, w, h = self.rect
-        pygame.draw.rect(surface, BROWN, (x + 10, y + 30, 30, 50))
-        pygame.draw.circle(surface, SKIN, (x + 25, y + 20), 15)
-        pygame.draw.rect(surface, HAT, (x + 10, y + 5, 30, 10))
-        pygame.draw.rect(surface, HAT, (x + 5, y + 15, 40, 5))
-        pygame.draw.rect(surface, DARK_BLUE, (x + 10, y + 80, 10, 20))
-        pygame.draw.rect(surface, DARK_BLUE, (x + 30, y + 80, 10, 20))
-        
-        if self.is_shooting:
-            pygame.draw.line(surface, YELLOW, (x - 10, y + 50), (x - 40, y + 40), 3)
-            self.is_shooting = False
-        else:
-            pygame.draw.line(surface, (192, 192, 192), (x - 10, y + 50), (x, y + 50), 3)
-
 class MainMenu:
-    def __init__(self, sfx):
-        self.font_large = pygame.font.SysFont("Arial", 64)
-        self.font_small = pygame.font.SysFont("Arial", 32)
+    def __init__(self, sfx, text_cache):
+        self.text = text_cache
+        self.font_large = ("Arial", 64)
+        self.font_small = ("Arial", 32)
         self.options = ["Start Game", "How to Play", "Quit"]
         self.selected = 0
         self.show_instructions = False
         self.sfx = sfx
     
-    def handle_input(self):
-        for event in pygame.event.get():
+    def handle_input(self, events):
+        for event in events:
             if event.type == pygame.QUIT:
                 return "quit"
             elif event.type == pygame.KEYDOWN:
@@ -231,21 +97,15 @@ class MainMenu:
         surface.fill(MENU_BG_COLOR)
         
         if not self.show_instructions:
-            title = self.font_large.render("EAGLE EYES", True, MENU_TEXT_COLOR)
-            surface.blit(title, (400 - title.get_width()//2, 100))
+            title, rect = self.text.place("EAGLE EYES", *self.font_large, MENU_TEXT_COLOR, (400, 100), "midtop")
+            surface.blit(title, rect)
             
             for i, option in enumerate(self.options):
+                text, rect = self.text.place(option, *self.font_small, MENU_TEXT_COLOR, (400, 250 + i*50), "midtop")
                 if i == self.selected:
-                    text_rect = pygame.Rect(
-                        400 - self.font_small.size(option)[0]//2 - 10,
-                        240 + i*50,
-                        self.font_small.size(option)[0] + 20,
-                        40
-                    )
+                    text_rect = pygame.Rect(rect.x - 10, 240 + i*50, rect.width + 20, 40)
                     pygame.draw.rect(surface, (220, 220, 220), text_rect)
-                
-                text = self.font_small.render(option, True, MENU_TEXT_COLOR)
-                surface.blit(text, (400 - text.get_width()//2, 250 + i*50))
+                surface.blit(text, rect)
         else:
             instructions = [
                 "HOW TO PLAY",
@@ -266,165 +126,228 @@ class MainMenu:
             ]
             
             for i, line in enumerate(instructions):
-                text = self.font_small.render(line, True, MENU_TEXT_COLOR)
-                surface.blit(text, (400 - text.get_width()//2, 150 + i*30))
+                text, rect = self.text.place(line, *self.font_small, MENU_TEXT_COLOR, (400, 150 + i*30), "midtop")
+                surface.blit(text, rect)
 
 class UI:
-    def __init__(self):
-        self.font = pygame.font.SysFont("Arial", 24)
-        self.font_large = pygame.font.SysFont("Arial", 36)
+    def __init__(self, text_cache, screen):
+        self.text = text_cache
+        self.screen = screen
+        self.font = ("Arial", 24)
+        self.font_large = ("Arial", 36)
     
+    def place_text(self, text, x, y, color=BLACK, center=False, large=False):
+        font = self.font_large if large else self.font
+        return self.text.place(text, *font, color, (x, y), "center" if center else "topleft")
+
     def draw_text(self, text, x, y, color=BLACK, center=False):
-        render = self.font.render(text, True, color)
-        if center:
-            rect = render.get_rect(center=(x, y))
-            screen.blit(render, rect)
-        else:
-            screen.blit(render, (x, y))
+        self.screen.blit(*self.place_text(text, x, y, color, center))
     
     def draw_large_text(self, text, x, y, color=BLACK, center=False):
-        render = self.font_large.render(text, True, color)
-        if center:
-            rect = render.get_rect(center=(x, y))
-            screen.blit(render, rect)
-        else:
-            screen.blit(render, (x, y))
+        self.screen.blit(*self.place_text(text, x, y, color, center, large=True))
     
     def update(self):
         pygame.display.flip()
 
 class SFX:
-    def __init__(self):
+    # Only needed once a round is under way; these load after everything else
+    LAZY_SOUNDS = ("eagle", "desert_wind", "shell_drop")
+    # The player's timing references; never left to load on first play
+    TIME_CRITICAL = ("gun_pump", "reload", "gunshot")
+    # Cued on the same step often enough to mix once into a single voice
+    PREMIXED = (("eagle", "reload"),)
+
+    def __init__(self, resources, voices=12, steal="oldest"):
+        from voices import VoicePool
+
+        self.resources = resources
         self.sounds = {}
-        self.channels = []
         self.music_channel = None
+        self.pending_music = None
+        # priority: who may steal whose voice; voices: how many may overlap;
+        # retrigger False drops a repeat while one is still playing
         self.sound_config = {
-            "gunshot": {"file": "gunshot.wav", "volume": 0.7, "channel": 0},
-            "laser": {"file": "laser.wav", "volume": 0.5, "channel": 1},
-            "shell_drop": {"file": "shell_drop.wav", "volume": 0.4, "channel": 2, "max_time": 500},
-            "gun_pump": {"file": "gun_pump.wav", "volume": 0.6, "channel": 3},
-            "reload": {"file": "gun_pump.wav", "volume": 0.6, "channel": 4},
-            "menu_select": {"file": "menu_sound.wav", "volume": 0.5, "channel": 6},
-            "eagle": {"file": "eagle.wav", "volume": 0.6, "channel": 7},
-            "desert_wind": {"file": "desert_wind.wav", "volume": 0.2, "channel": 8, "loop": True}
+            "gunshot": {"file": "gunshot.wav", "volume": 0.7, "priority": 3, "voices": 4},
+            "laser": {"file": "laser.wav", "volume": 0.5, "priority": 1, "voices": 2},
+            "shell_drop": {"file": "shell_drop.wav", "volume": 0.4, "priority": 1, "voices": 2, "max_time": 500},
+            "gun_pump": {"file": "gun_pump.wav", "volume": 0.6, "priority": 3, "voices": 1, "retrigger": False},
+            "reload": {"file": "gun_pump.wav", "volume": 0.6, "priority": 2, "voices": 1},
+            "menu_select": {"file": "menu_sound.wav", "volume": 0.5, "priority": 2, "voices": 2},
+            "eagle": {"file": "eagle.wav", "volume": 0.6, "priority": 1, "voices": 1},
+            "desert_wind": {"file": "desert_wind.wav", "volume": 0.2, "priority": 2, "voices": 1,
+                            "loop": True, "retrigger": False}
         }
         self.music_files = {
             "menu_music": "menu_bg_music.wav"
         }
 
         pygame.mixer.init()
-        pygame.mixer.set_num_channels(10)
-        
-        for i in range(9):
-            self.channels.append(pygame.mixer.Channel(i))
-        self.music_channel = pygame.mixer.Channel(9)
-
-        print("\nInitializing audio system...")
-        
-        for name, config in self.sound_config.items():
-            path = resource_path(os.path.join("assets", "sounds", config["file"]))
-            try:
-                if os.path.exists(path):
-                    sound = pygame.mixer.Sound(path)
-                    sound.set_volume(config["volume"])
-                    self.sounds[name] = sound
-                    print(f"✅ Loaded sound: {name}")
-                else:
-                    print(f"❌ Sound file not found: {config['file']}")
-                    self.sounds[name] = self._create_silent_sound()
-            except Exception as e:
-                print(f"⚠️ Error loading {name}: {e}")
-                self.sounds[name] = self._create_silent_sound()
-        
-        self.music = {}
+        # The last channel is kept for music; the rest are the voice pool
+        pygame.mixer.set_num_channels(voices + 1)
+        self.pool = VoicePool([pygame.mixer.Channel(i) for i in range(voices)], steal)
+        self.channels = self.pool.channels
+        self.music_channel = pygame.mixer.Channel(voices)
+        self.silent = self._create_silent_sound()
+
+        print("\nLoading audio in the background...")
+        # Submission order is load order: the menu's sounds go first
         for name, file in self.music_files.items():
-            path = resource_path(os.path.join("assets", "sounds", file))
-            try:
-                if os.path.exists(path):
-                    self.music[name] = path
-                    print(f"✅ Loaded music: {name}")
-                else:
-                    print(f"❌ Music file not found: {file}")
-                    self.music[name] = None
-            except Exception as e:
-                print(f"⚠️ Error loading music {name}: {e}")
-                self.music[name] = None
-        
-        print("Audio system ready\n")
-    
+            self._submit("music:" + name, file, 0.4)
+        order = sorted(self.sound_config, key=lambda name: name != "menu_select")
+        for name in order:
+            if name not in self.LAZY_SOUNDS:
+                self._submit("sound:" + name, self.sound_config[name]["file"], self.sound_config[name]["volume"])
+
+    def _submit(self, key, file, volume):
+        path = resource_path(os.path.join("assets", "sounds", file))
+        self.resources.sound(key, path, volume)
+
+    def stream_lazy(self):
+        """Queue the round-only sounds behind everything submitted so far"""
+        for name in self.LAZY_SOUNDS:
+            self._submit("sound:" + name, self.sound_config[name]["file"], self.sound_config[name]["volume"])
+        # Mixed on the loader, queued behind the sounds they are made of
+        for combo in self.PREMIXED:
+            self.resources.loader.submit("premix:" + "+".join(combo), self._premix, combo)
+
     def _create_silent_sound(self):
         silent_sound = pygame.mixer.Sound(buffer=bytes(44))
         silent_sound.set_volume(0)
         return silent_sound
+
+    def sound(self, name):
+        """The decoded sound, waiting for it only if it has not finished loading"""
+        sound = self.sounds.get(name)
+        if sound is None:
+            key = "sound:" + name
+            if key not in self.resources.loader.futures:
+                self.stream_lazy()
+            sound = self.sounds[name] = self.resources.get(key) or self.silent
+        return sound
     
     def play(self, name):
-        if name not in self.sounds or name not in self.sound_config:
-            return
-        
-        channel_num = self.sound_config[name]["channel"]
-        channel = self.channels[channel_num]
-        
-        if name == "desert_wind":
-            if not channel.get_busy():
-                channel.play(self.sounds[name], loops=-1)
+        if name not in self.sound_config:
             return
-        
-        channel.play(self.sounds[name])
+
+        config = self.sound_config[name]
+        self.pool.play(name, self.sound(name), config["priority"], config["voices"],
+                       retrigger=config.get("retrigger", True), loops=-1 if config.get("loop") else 0,
+                       maxtime=config.get("max_time", 0))
+
+    def play_together(self, names):
+        """Play sounds cued at the same moment, as one premixed voice where there is one"""
+        names = list(names)
+        for combo in self.PREMIXED:
+            key = "premix:" + "+".join(combo)
+            if all(name in names for name in combo) and self.resources.ready(key):
+                sound = self.resources.get(key)
+                priority = max(self.sound_config[name]["priority"] for name in combo)
+                self.pool.play("+".join(combo), sound, priority)
+                names = [name for name in names if name not in combo]
+        for name in names:
+            self.play(name)
+
+    def _premix(self, combo):
+        from voices import premix
+
+        return premix([self.resources.get("sound:" + name) or self.silent for name in combo])
     
     def play_music(self, name):
-        if name in self.music and self.music[name]:
+        if name in self.music_files:
             self.music_channel.stop()
-            sound = pygame.mixer.Sound(self.music[name])
-            sound.set_volume(0.4)
-            self.music_channel.play(sound, loops=-1)
+            # Starts from update() once decoded, rather than holding up a frame
+            self.pending_music = name
+            self.update()
+
+    def update(self):
+        """Start music whose decode has finished since play_music()"""
+        if self.pending_music and self.resources.ready("music:" + self.pending_music):
+            sound = self.resources.get("music:" + self.pending_music)
+            self.pending_music = None
+            if sound:
+                self.music_channel.play(sound, loops=-1)
     
     def stop_music(self):
+        self.pending_music = None
         self.music_channel.stop()
     
     def stop_all(self):
+        self.pool.stop_all()
+        self.stop_music()
+
+    def prewarm(self):
+        """Resolve the time-critical sounds and run every channel once, so a cue is only a mix away"""
+        for name in self.TIME_CRITICAL:
+            self.sound(name)
         for channel in self.channels:
-            channel.stop()
-        self.music_channel.stop()
+            if not channel.get_busy():
+                channel.play(self.silent)
+                channel.stop()
 
 class Background:
-    def __init__(self, width, height):
+    # Particles per layer at density 1.0, back to front
+    LAYER_COUNTS = {"far_clouds": 14, "clouds": 2, "shimmer": 36, "dust": 320, "tumbleweeds": 3}
+    # With dirty rects, layers are split into cells of this many px, and the
+    # scenery layers that cover whole bands are only moved this often (Hz)
+    DIRTY_CELL = 64
+    AMBIENT = ("shimmer", "dust")
+    AMBIENT_FPS = 10
+
+    def __init__(self, width, height, resources, density=1.0, dirty_rects=False, seed=None):
         self.width = width
         self.height = height
+        self.resources = resources
+        self.density = density
+        # Seeds the particle layers' placement and speeds; None varies every run
+        self.seed = seed
+        self.dirty_rects = dirty_rects
+        # Ambient layer name -> (layer time, items) last drawn, while held still
+        self.held = {}
         self.cloud_path = resource_path(os.path.join("assets", "bg", "cloud.png"))
         self.desert_path = resource_path(os.path.join("assets", "bg", "desert.png"))
         
-        print("\nLoading background images...")
-        self.desert = self._load_image(self.desert_path, "desert_bg.png", True)
-        self.cloud_img = self._load_image(self.cloud_path, "cloud.png", False)
-        
-        self.clouds = [
-            {'x': random.randint(0, width), 'y': random.randint(50, 150), 'speed': random.uniform(0.2, 0.4)},
-            {'x': random.randint(0, width), 'y': random.randint(100, 200), 'speed': random.uniform(0.4, 0.6)}
-        ]
-        
+        # Decoded in the background; converted on first use, when the display is up
+        resources.image("image:desert", self.desert_path, (width, height))
+        self.cloud_scales = (0.8, 0.6)
+        for scale in self.cloud_scales:
+            resources.image(f"image:cloud@{scale}", self.cloud_path, scale=scale)
+        self.desert = None
+        self.layers = []
+
+    def _finish_loading(self):
+        import numpy as np
+
+        from particles import ParticleLayer, dust_sprites, shimmer_sprites, tumbleweed_frames
+
+        self.desert = self.resources.surface("image:desert", fallback=lambda: self._fallback("desert_bg.png", True))
         self.scaled_clouds = [
-            pygame.transform.scale(self.cloud_img, (int(self.cloud_img.get_width() * 0.8), int(self.cloud_img.get_height() * 0.8))),
-            pygame.transform.scale(self.cloud_img, (int(self.cloud_img.get_width() * 0.6), int(self.cloud_img.get_height() * 0.6)))
+            self.resources.surface(f"image:cloud@{scale}", alpha=True,
+                                   fallback=lambda scale=scale: self._fallback("cloud.png", False, scale))
+            for scale in self.cloud_scales
         ]
-        
-        print(f"\nDesert size: {self.desert.get_size()}")
-        print(f"Cloud size: {self.cloud_img.get_size()}")
-        print("Background system ready\n")
-    
-    def _load_image(self, path, display_name, is_background):
-        print(f"Attempting to load: {display_name}")
-        try:
-            if os.path.exists(path):
-                img = pygame.image.load(path)
-                print(f"✅ Successfully loaded: {display_name}")
-                if is_background:
-                    img = img.convert()
-                    return pygame.transform.scale(img, (self.width, self.height))
-                else:
-                    return img.convert_alpha()
-        except Exception as e:
-            print(f"⚠️ Error loading {display_name}: {e}")
-        
+        # Small and faded, so they read as distant
+        far_clouds = [pygame.transform.smoothscale_by(self.scaled_clouds[1], scale) for scale in (0.3, 0.2)]
+        for cloud in far_clouds:
+            cloud.set_alpha(150)
+        count = lambda name: int(self.LAYER_COUNTS[name] * self.density)
+        # Areas sit on the painted desert: sky above ~y 180, horizon at ~y 450.
+        # Speeds are in pixels per second, slower further back
+        width = self.width
+        rng = np.random.default_rng(self.seed)
+        self.layers = [
+            ParticleLayer("far_clouds", far_clouds, count("far_clouds"), (0, 20, width, 120), speed=(4, 10),
+                          rng=rng),
+            ParticleLayer("clouds", self.scaled_clouds, count("clouds"), (0, 50, width, 150), speed=(12, 36),
+                          rng=rng),
+            ParticleLayer("shimmer", shimmer_sprites(), count("shimmer"), (0, 425, width, 40),
+                          speed=(2, 6), sway=(2, 0.7), rng=rng),
+            ParticleLayer("dust", dust_sprites(), count("dust"), (0, 380, width, self.height - 380),
+                          speed=(15, 60), drift=(-8, 8), sway=(3, 0.4), rng=rng),
+            ParticleLayer("tumbleweeds", tumbleweed_frames(), count("tumbleweeds"), (0, 480, width, 80),
+                          speed=(40, 90), sway=(4, 1.5), spin=8, rng=rng),
+        ]
+
+    def _fallback(self, display_name, is_background, scale=1):
         print(f"Creating fallback surface for {display_name}")
         if is_background:
             surf = pygame.Surface((self.width, self.height))
@@ -435,448 +358,538 @@ class Background:
             surf = pygame.Surface((400, 200), pygame.SRCALPHA)
             pygame.draw.ellipse(surf, (200, 200, 200, 150), (0, 0, 400, 200))
             print("Created cloud fallback")
-            return surf
+            return pygame.transform.scale(surf, (int(400 * scale), int(200 * scale)))
     
-    def update(self):
-        for i, cloud in enumerate(self.clouds):
-            cloud['x'] -= cloud['speed']
-            if cloud['x'] < -self.scaled_clouds[i].get_width():
-                cloud['x'] = self.width
-                cloud['y'] = random.randint(50 if i == 0 else 100, 150 if i == 0 else 200)
-                cloud['speed'] = random.uniform(0.2 if i == 0 else 0.4, 0.4 if i == 0 else 0.6)
+    def update(self, dt):
+        """Advance every particle layer by one logic step of dt milliseconds"""
+        if self.desert is None:
+            self._finish_loading()
+        for layer in self.layers:
+            layer.update(dt)
     
-    def draw(self, surface):
-        surface.blit(self.desert, (0, 0))
-        for i, cloud in enumerate(self.clouds):
-            surface.blit(self.scaled_clouds[i], (cloud['x'], cloud['y']))
+    def draw(self, surface, alpha=1.0):
+        for _, _, paint in self.items(alpha):
+            paint(surface)
+
+    def items(self, alpha=1.0):
+        # alpha places the particles between the last two logic steps
+        if self.desert is None:
+            self._finish_loading()
+        items = [(("desert",), self.desert.get_rect(),
+                  lambda surface: surface.blit(self.desert, (0, 0)))]
+        if not self.dirty_rects:
+            # One batched blit per layer, however many particles it holds
+            items += [layer.item(alpha) for layer in self.layers if len(layer)]
+            return items
+        for layer in self.layers:
+            if not len(layer):
+                continue
+            if layer.name not in self.AMBIENT:
+                items += layer.cell_items(alpha, self.DIRTY_CELL)
+                continue
+            held = self.held.get(layer.name)
+            if held is None or abs(layer.time - held[0]) >= 1 / self.AMBIENT_FPS:
+                held = self.held[layer.name] = (layer.time, layer.cell_items(alpha, self.DIRTY_CELL))
+            items += held[1]
+        return items
+
 
 class Game:
-    def __init__(self):
-        self.sfx = SFX()
+    def __init__(self, screen, dirty_rects=False, telemetry=None, stats=None, resources=None, particles=1.0,
+                 shootout=False, gallery=0, replays=None):
+        # Subsystems are imported here rather than at module level, so importing main stays cheap
+        from telemetry_store import new_session_id
+
+        self.screen = screen
+        self.dirty_rects = dirty_rects
+        # Fonts, surfaces and sounds live as long as the process; restarts only reset the duel
+        if resources is None:
+            from asset_pack import AssetPack
+            from assets import AssetLoader, Resources
+            resources = Resources(AssetLoader(
+                pack=AssetPack.open(resource_path(ASSET_PACK), resource_path("assets"))))
+        self.resources = resources
+        if telemetry is None:
+            from telemetry import TelemetryWriter
+            from telemetry_store import TelemetryStore
+            telemetry = TelemetryWriter("game_data.csv", store=TelemetryStore("telemetry"))
+        self.telemetry = telemetry
+        # Every game (including restarts) is its own telemetry session
+        self.session = new_session_id()
+        # Lifetime reaction-time/hit-rate sketch, carried across restarts
+        if stats is None:
+            from round_stats import RoundStats
+            stats = RoundStats.load("round_stats.json")
+        self.stats = stats
+        self.sfx = SFX(self.resources)
         self.sfx.play_music("menu_music")
-        
-        self.player = Player()
-        self.opponent = Opponent(difficulty=5)
-        self.timer = Timer()
-        self.ui = UI()
-        self.background = Background(800, 600)
-        self.menu_bg = self._load_menu_bg()
-        self.game_state = GAME_STATES["MENU"]
-        self.round = 0
-        self.max_rounds = 5
-        self.game_over = False
-        self.reaction_times = []
-        self.results = []
-        self.countdown_start_time = None
-        self.countdown_duration = 3
-        self.draw_trigger_time = 0
-        self.bullet_trace = []
-        self.opponent_shot_time = 0
-        self.menu = MainMenu(self.sfx)
-        self.hit_flash_end = 0
-        self.played_eagle_sound = False
-        self.show_hitboxes = False
-        self.start_play_time = None
-        self.total_play_time = 0
-
-    def _load_menu_bg(self):
-        try:
-            path = resource_path(os.path.join("assets", "bg", "eagle_eyes.png"))
-            if os.path.exists(path):
-                img = pygame.image.load(path)
-                return pygame.transform.scale(img, (800, 600))
-        except:
-            # Fallback if image fails to load
-            surf = pygame.Surface((800, 600))
-            surf.fill((50, 50, 70))  # Dark blue fallback
-            return surf
-
-    def start_game(self):
-        if self.start_play_time is None:  # Only set on first round
-            self.start_play_time = time.time()
 
-        if self.game_over or self.round >= self.max_rounds:
-            return
-            
-        self.sfx.stop_music()
-        if not self.played_eagle_sound:
-            self.sfx.play("eagle")
-            self.played_eagle_sound = True
-            
-        self.sfx.play("desert_wind")
-        self.round += 1
-        
-        if self.opponent.health <= 0:
-            self.opponent = Opponent(difficulty=min(10, self.round + 3))
-        else:
-            self.opponent.reset_for_new_round()  # Use the new reset method
-        
-        self.game_state = GAME_STATES["COUNTDOWN"]
-        self.countdown_start_time = pygame.time.get_ticks()
-        delay = random.randint(2000, 4000)
-        self.draw_trigger_time = pygame.time.get_ticks() + delay
-        self.opponent_shot_time = self.draw_trigger_time + int(self.opponent.reaction_time * 1000)
-        pygame.time.set_timer(pygame.USEREVENT, delay)
-        pygame.time.set_timer(pygame.USEREVENT + 1, delay - 1800)
-        self.player.weapon.reload()
-        self.sfx.play("reload")
-        self.bullet_trace.clear()
-        self.timer = Timer()
-
-    def check_winner(self, player_shot_first):
-        now = pygame.time.get_ticks()
-        mouse_pos = pygame.mouse.get_pos()
-        
-        if player_shot_first:
-            if self.player.shoot():
-                self.player.is_shooting = True
-                self.player.last_shot_time = now
-                
-                start_pos = (self.player.rect.centerx + 30, self.player.rect.centery)
-                angle = math.atan2(mouse_pos[1] - start_pos[1], mouse_pos[0] - start_pos[0])
-                end_pos = (
-                    start_pos[0] + math.cos(angle) * 1000,
-                    start_pos[1] + math.sin(angle) * 1000
-                )
-                
-                hit_location = None
-                steps = 20
-                for i in range(1, steps + 1):
-                    check_pos = (
-                        start_pos[0] + (end_pos[0] - start_pos[0]) * (i/steps),
-                        start_pos[1] + (end_pos[1] - start_pos[1]) * (i/steps)
-                    )
-                    hit_location = self.opponent.check_hit(check_pos)
-                    if hit_location:
-                        break
-                
-                if hit_location:
-                    if hit_location == "head":
-                        damage = 50
-                        result = "Player Hit"
-                    else:
-                        damage = 20
-                        result = "Player Hit"
-                    self.opponent.health -= damage
-                    self.player.update_score(damage)
-                else:
-                    result = "Player Miss"
-                
-                self.results.append(result)
-                self.sfx.play("gunshot")
-                self.hit_flash_end = now + 200 if hit_location else 0
-                self.bullet_trace.append(("player", start_pos, end_pos, now))
-        else:
-            if self.opponent.shoot():
-                self.opponent.is_shooting = True
-                self.opponent.last_shot_time = now
-                
-                start_pos = (self.opponent.rect.centerx - 30, self.opponent.rect.centery)
-                target_choice = random.choices(
-                    ["head", "body", "miss"],
-                    weights=[0.3 + (0.02 * self.opponent.difficulty_level), 
-                            0.5, 
-                            0.2 - (0.02 * self.opponent.difficulty_level)]
-                )[0]
-                
-                if target_choice == "head":
-                    end_pos = (
-                        self.player.head_rect.centerx + random.randint(-20, 20),
-                        self.player.head_rect.centery + random.randint(-10, 10)
-                    )
-                elif target_choice == "body":
-                    end_pos = (
-                        self.player.body_rect.centerx + random.randint(-30, 30),
-                        self.player.body_rect.centery + random.randint(-20, 20)
-                    )
-                else:
-                    end_pos = (
-                        random.randint(100, 700),
-                        random.randint(200, 400)
-                    )
-                
-                hit_location = None
-                if target_choice != "miss":
-                    steps = 20
-                    for i in range(1, steps + 1):
-                        check_pos = (
-                            start_pos[0] + (end_pos[0] - start_pos[0]) * (i/steps),
-                            start_pos[1] + (end_pos[1] - start_pos[1]) * (i/steps)
-                        )
-                        hit_location = self.player.check_hit(check_pos)
-                        if hit_location:
-                            break
-                
-                if hit_location:
-                    if hit_location == "head":
-                        damage = 50
-                    else:
-                        damage = 20
-                    self.player.health -= damage
-                    result = "Opponent Hit"
-                else:
-                    result = "Opponent Miss"
-                
-                self.results.append(result)
-                self.sfx.play("gunshot")
-                self.hit_flash_end = now + 200 if hit_location else 0
-                self.bullet_trace.append(("opponent", start_pos, end_pos, now))
-
-    def reset_game(self):
-        if self.player.health <= 0 or self.opponent.health <= 0 or self.round >= self.max_rounds:
-            self.game_over = True
-            self.game_state = GAME_STATES["GAME_OVER"]
-            self.sfx.stop_all()
-            self.sfx.play_music("menu_music")
-            self.played_eagle_sound = False
+        self.engine = DuelEngine(shootout=shootout, gallery=gallery)
+        self.gallery_sprites = target_sprites() if gallery else None
+        # Folder each game is recorded to for replay, or None
+        self.replays = replays
+        self.recorder = None
+        self.text_cache = self.resources.text_cache
+        self.ui = UI(self.text_cache, screen)
+        self.background = Background(800, 600, self.resources, particles, dirty_rects=dirty_rects)
+        self.sprites = self.resources.sprites()
+        self.resources.image("image:menu_bg", resource_path(os.path.join("assets", "bg", "eagle_eyes.png")), (800, 600))
+        self.sfx.stream_lazy()
+        loader = self.resources.loader
+        if loader.pack is None:
+            from asset_pack import rebuild_pack
+            # Queued last, so the rebuild only runs once the game's own loads are done
+            loader.submit("asset_pack", rebuild_pack, resource_path("assets"), resource_path(ASSET_PACK))
+        self.layers = LayerCache()
+        self.menu = MainMenu(self.sfx, self.text_cache)
+        self.show_hitboxes = False
+        if dirty_rects:
+            self.renderer = DirtyRectRenderer((800, 600))
         else:
-            self.player.weapon.reload()
-            self.opponent.weapon.reload()
-            self.game_state = GAME_STATES["WAITING"]
-            self.save_data()
-            self.bullet_trace.clear()
-
-    def save_data(self):
-        # Calculate current playtime
-        current_time = time.time()
-        if self.start_play_time:
-            self.total_play_time = current_time - self.start_play_time
-        
-        write_header = not os.path.exists("game_data.csv")
-        with open("game_data.csv", "a", newline="") as file:
-            writer = csv.writer(file)
-            if write_header:
-                writer.writerow([
-                    "Round", 
-                    "Reaction Time", 
-                    "Result", 
-                    "Opponent Difficulty", 
-                    "Score",
-                    "Time Played (seconds)"
-                ])
-            
-            # Simplify results to just Hit/Miss
-            simple_result = "N/A"
-            if self.results:
-                last_result = self.results[-1]
-                if "Hit" in last_result:
-                    simple_result = "Player Hit" if "Player" in last_result else "Opponent Hit"
+            self.renderer = FullRenderer()
+        self.profiler = FrameProfiler()
+        self.profile_lines = []
+        self.profile_lines_time = None
+        # Set while run() is going; sounds handed to it to play on time, by name
+        self.frame_clock = None
+        self.scheduled_sounds = {}
+
+    def new_game(self):
+        """Start a fresh duel; everything loaded stays loaded"""
+        from telemetry_store import new_session_id
+
+        self.session = new_session_id()
+        self.cancel_scheduled_sounds()
+        self.sfx.prewarm()
+        self.sfx.play_music("menu_music")
+        # The session id seeds the game, so its telemetry rows lead to its recording
+        self.engine.new_game(seed=self.session)
+        self.close_recording()
+        if self.replays is not None:
+            from replay import SessionRecorder
+            self.recorder = SessionRecorder(os.path.join(self.replays, f"{self.session:016x}.eer"), self.engine)
+
+    def close_recording(self):
+        if self.recorder is not None:
+            self.recorder.close()
+            self.recorder = None
+
+    def step_engine(self, dt, events=()):
+        """engine.step(), recorded when recording"""
+        if self.recorder is not None:
+            return self.recorder.step(self.engine, dt, events)
+        return self.engine.step(dt, events)
+
+    def cancel_scheduled_sounds(self):
+        self.scheduled_sounds = {}
+        if self.frame_clock is not None:
+            self.frame_clock.sampler.cancel_timers()
+
+    def schedule_sounds(self, engine_now, lookahead):
+        """Hand fixed-time cues due within lookahead ms to the frame clock
+
+        engine_now is the engine time at the frame clock's last tick; the cue
+        then plays at its own time on the same clock that stamps input,
+        rather than at the start of the frame whose logic reaches it.
+        """
+        for when, cue in self.engine.scheduled_cues():
+            name = cue[1]
+            if name not in self.scheduled_sounds and when - engine_now <= lookahead:
+                self.scheduled_sounds[name] = when
+                self.frame_clock.sampler.call_at(self.frame_clock.to_stamp(when, engine_now),
+                                                 lambda name=name: self.sfx.play(name))
+
+    @property
+    def player(self):
+        return self.engine.player
+
+    @property
+    def opponent(self):
+        return self.engine.opponent
+
+    @property
+    def menu_bg(self):
+        return self.resources.surface("image:menu_bg", fallback=self._menu_bg_fallback)
+
+    def _menu_bg_fallback(self):
+        # Fallback if image fails to load
+        surf = pygame.Surface((800, 600))
+        surf.fill((50, 50, 70))  # Dark blue fallback
+        return surf
+
+    def handle_cues(self, cues):
+        sounds = []
+        for cue in cues:
+            kind = cue[0]
+            if kind == "sound":
+                # A scheduled sound has already played at its own time
+                if self.scheduled_sounds.pop(cue[1], None) is None:
+                    sounds.append(cue[1])
+            elif kind == "music":
+                self.sfx.play_music(cue[1])
+            elif kind == "stop_music":
+                self.sfx.stop_music()
+            elif kind == "stop_all":
+                sounds = []
+                self.cancel_scheduled_sounds()
+                self.sfx.stop_all()
+            elif kind == "round_complete":
+                self.save_data(cue[1])
+        self.sfx.play_together(sounds)
+
+    def save_data(self, record):
+        # Only a queue put; the writer thread does the disk work
+        self.telemetry.put(record, self.session)
+        self.stats.update(record)
+
+    def is_firing(self, fighter):
+        now = self.engine.now
+        return fighter.last_shot_time is not None and now - fighter.last_shot_time < 100
+
+    def toggle_profiler(self):
+        enabled = self.profiler.toggle()
+        self.renderer.profiler = self.profiler if enabled else None
+        self.profile_lines_time = None
+
+    def export_trace(self, path="profile_trace.json"):
+        count = self.profiler.export_chrome_trace(path)
+        print(f"📈 Wrote {count} trace events to {path}")
+
+    def profiler_items(self):
+        now = self.engine.now
+        if self.profile_lines_time is None or now - self.profile_lines_time >= PROFILE_OVERLAY_MS:
+            self.profile_lines = self.profiler.overlay_lines()
+            self.profile_lines_time = now
+        return [self.text_item(line, 10, 80 + 22 * i, BLUE) for i, line in enumerate(self.profile_lines)]
+
+    def text_item(self, text, x, y, color=BLACK, center=False, large=False):
+        render, rect = self.ui.place_text(text, x, y, color, center, large)
+        return (("text", text, color, large), rect, lambda surface: surface.blit(render, rect))
+
+    def hitbox_items(self):
+        rects = [self.player.head_rect, self.player.body_rect,
+                 self.opponent.head_rect, self.opponent.body_rect]
+
+        def paint(surface):
+            pygame.draw.rect(surface, RED, self.player.head_rect, 2)
+            pygame.draw.rect(surface, BLUE, self.player.body_rect, 2)
+            pygame.draw.rect(surface, RED, self.opponent.head_rect, 2)
+            pygame.draw.rect(surface, BLUE, self.opponent.body_rect, 2)
+
+        return [(("hitboxes",), rects[0].unionall(rects[1:]), paint)]
+
+    def pose(self, fighter):
+        now = self.engine.now
+        if self.is_firing(fighter):
+            return "shooting"
+        if fighter.last_hit_time is not None and now - fighter.last_hit_time < HIT_FLASH_MS:
+            return "hit"
+        return "idle"
+
+    def fighters(self):
+        """(fighter, facing, HUD x) on screen; the opponent sits gallery rounds out"""
+        if self.engine.gallery is not None:
+            return ((self.player, 1, 50),)
+        return ((self.player, 1, 50), (self.opponent, -1, 550))
+
+    def gallery_items(self):
+        gallery = self.engine.gallery
+        if gallery is None or not gallery.standing.any():
+            return []
+        sequence = gallery.blit_sequence(self.gallery_sprites)
+        return [(("gallery", gallery.standing.tobytes()), pygame.Rect(gallery.area),
+                 lambda surface: surface.blits(sequence, doreturn=False))]
+
+    def fighter_items(self):
+        items = []
+        for fighter, facing, _ in self.fighters():
+            pose = self.pose(fighter)
+            sprite, rect = self.sprites.place(facing, pose, fighter.rect)
+            items.append((("cowboy", facing, pose), rect,
+                          lambda surface, sprite=sprite, rect=rect: surface.blit(sprite, rect)))
+        return items
+
+    def projectile_items(self, alpha=1.0):
+        trails = self.engine.projectiles.trails(alpha)
+        if not trails:
+            return []
+        bounds = None
+        for owner, tail, head in trails:
+            rect = pygame.Rect(min(tail[0], head[0]) - 5, min(tail[1], head[1]) - 5,
+                               abs(head[0] - tail[0]) + 11, abs(head[1] - tail[1]) + 11)
+            bounds = rect if bounds is None else bounds.union(rect)
+
+        def paint(surface):
+            for owner, tail, head in trails:
+                if owner == PLAYER:
+                    pygame.draw.line(surface, GREEN, tail, head, 3)
                 else:
-                    simple_result = "Player Miss" if "Player" in last_result else "Opponent Miss"
-            
-            writer.writerow([
-                self.round,
-                self.player.reaction_time,
-                simple_result,
-                self.opponent.difficulty_level,
-                self.player.score,
-                round(self.total_play_time, 2)  # Time played in seconds with 2 decimal places
-            ])
-
-    def draw_hitboxes(self):
-        pygame.draw.rect(screen, RED, self.player.head_rect, 2)
-        pygame.draw.rect(screen, BLUE, self.player.body_rect, 2)
-        pygame.draw.rect(screen, RED, self.opponent.head_rect, 2)
-        pygame.draw.rect(screen, BLUE, self.opponent.body_rect, 2)
-
-    def draw_bullet_trace(self):
-        now = pygame.time.get_ticks()
-        self.bullet_trace = [trace for trace in self.bullet_trace if now - trace[3] < 500]
-        
-        for trace in self.bullet_trace:
-            color = GREEN if trace[0] == "player" else RED
-            width = 3 if trace[0] == "player" else 4
-            
-            # Draw the full trajectory
-            pygame.draw.line(screen, color, trace[1], trace[2], width)
-            
-            # Add bullet "head" at current position
-            progress = min(1.0, (now - trace[3]) / 200)  # Bullet travels in 200ms
-            bullet_pos = (
-                trace[1][0] + (trace[2][0] - trace[1][0]) * progress,
-                trace[1][1] + (trace[2][1] - trace[1][1]) * progress
-            )
-            pygame.draw.circle(screen, YELLOW, (int(bullet_pos[0]), int(bullet_pos[1])), 5)
-
-    def draw_muzzle_flash(self):
-        now = pygame.time.get_ticks()
-        if now - self.player.last_shot_time < 100 and self.player.is_shooting:
-            pos = (self.player.rect.centerx + 40, self.player.rect.centery)
-            pygame.draw.circle(screen, YELLOW, pos, 15)
-        
-        if now - self.opponent.last_shot_time < 100 and self.opponent.is_shooting:
-            pos = (self.opponent.rect.centerx - 40, self.opponent.rect.centery)
-            pygame.draw.circle(screen, YELLOW, pos, 15)
-
-    def draw_hit_flash(self):
-        now = pygame.time.get_ticks()
-        if now < self.hit_flash_end:
-            flash_surface = pygame.Surface((800, 600), pygame.SRCALPHA)
-            flash_surface.fill(HIT_FLASH)
-            screen.blit(flash_surface, (0, 0))
-
-    def draw_health_bars(self):
-        pygame.draw.rect(screen, RED, (50, 20, 200, 20))
-        pygame.draw.rect(screen, GREEN, (50, 20, 200 * (self.player.health/self.player.max_health), 20))
-        self.ui.draw_text(f"{self.player.health}/{self.player.max_health}", 150, 25, BLACK)
-        
-        pygame.draw.rect(screen, RED, (550, 20, 200, 20))
-        pygame.draw.rect(screen, GREEN, (550, 20, 200 * (self.opponent.health/self.opponent.max_health), 20))
-        self.ui.draw_text(f"{self.opponent.health}/{self.opponent.max_health}", 650, 25, BLACK)
-
-    def draw_ammo(self):
-        ammo_text = f"Ammo: {self.player.weapon.current_ammo}/{self.player.weapon.max_ammo}"
-        self.ui.draw_text(ammo_text, 50, 50, BLACK)
-        
-        opp_ammo_text = f"Ammo: {self.opponent.weapon.current_ammo}/{self.opponent.weapon.max_ammo}"
-        self.ui.draw_text(opp_ammo_text, 550, 50, BLACK)
+                    pygame.draw.line(surface, RED, tail, head, 4)
+                pygame.draw.circle(surface, YELLOW, head, 5)
+
+        key = ("projectiles", tuple((owner, *tail, *head) for owner, tail, head in trails))
+        return [(key, bounds, paint)]
+
+    def muzzle_flash_items(self):
+        items = []
+        if self.is_firing(self.player):
+            items.append(self._flash_item((self.player.rect.centerx + 40, self.player.rect.centery)))
+        if self.is_firing(self.opponent):
+            items.append(self._flash_item((self.opponent.rect.centerx - 40, self.opponent.rect.centery)))
+        return items
+
+    def _flash_item(self, pos):
+        return (("muzzle", pos), pygame.Rect(pos[0] - 15, pos[1] - 15, 31, 31),
+                lambda surface: pygame.draw.circle(surface, YELLOW, pos, 15))
+
+    def hit_flash_items(self):
+        if self.engine.now >= self.engine.hit_flash_end:
+            return []
+
+        flash = self.layers.get("hit_flash", self.screen.get_size(), self._build_hit_flash)
+        return [(("hit_flash",), flash.get_rect(), lambda surface: surface.blit(flash, (0, 0)))]
+
+    def _build_hit_flash(self, size):
+        flash_surface = pygame.Surface(size, pygame.SRCALPHA).convert_alpha()
+        flash_surface.fill(HIT_FLASH)
+        return flash_surface
+
+    def health_bar_items(self):
+        items = []
+        for fighter, _, x in self.fighters():
+            health, max_health = fighter.health, fighter.max_health
+
+            def paint(surface, x=x, health=health, max_health=max_health):
+                pygame.draw.rect(surface, RED, (x, 20, 200, 20))
+                pygame.draw.rect(surface, GREEN, (x, 20, 200 * (health/max_health), 20))
+
+            items.append((("health", x, health, max_health), pygame.Rect(x, 20, 200, 20), paint))
+            items.append(self.text_item(f"{health}/{max_health}", x + 100, 25))
+        return items
+
+    def ammo_items(self):
+        return [self.text_item(f"Ammo: {fighter.weapon.current_ammo}/{fighter.weapon.max_ammo}", x, 50)
+                for fighter, _, x in self.fighters()]
+
+    def state_text_items(self):
+        engine = self.engine
+        if engine.game_state == GAME_STATES["WAITING"]:
+            return [self.text_item("Press SPACE to start round", 400, 250, center=True)]
+        elif engine.game_state == GAME_STATES["COUNTDOWN"]:
+            return [self.text_item(f"Get Ready... {engine.countdown_remaining()}", 400, 250, center=True)]
+        elif engine.game_state == GAME_STATES["SHOOTING"]:
+            if engine.gallery is not None:
+                seconds = max(0, (engine.round_end_time - engine.now) // 1000)
+                return [self.text_item(f"Time: {seconds:.0f}s  Targets left: {engine.gallery.remaining}",
+                                       400, 510, center=True)]
+            return [self.text_item("DRAW! SHOOT NOW!", 400, 250, center=True)]
+        elif engine.game_state == GAME_STATES["RESULT"]:
+            items = []
+            result = engine.round_result()
+            if result:
+                items.append(self.text_item(f"Round {engine.round} Result: {result}", 400, 250, center=True))
+            items.append(self.text_item("Press SPACE to continue", 400, 300, center=True))
+            return items
+        return []
+
+    def scene_items(self, alpha=1.0):
+        """Display list for one game frame, back to front"""
+        items = self.background.items(alpha)
+        items += self.state_text_items()
+
+        # Game objects
+        items += self.gallery_items()
+        items += self.fighter_items()
+        items += self.health_bar_items()
+        items += self.ammo_items()
+        if self.show_hitboxes:
+            items += self.hitbox_items()
+        items += self.projectile_items(alpha)
+        items += self.muzzle_flash_items()
+        items += self.hit_flash_items()
+
+        # UI elements
+        items.append(self.text_item(f"Round: {self.engine.round}/{self.engine.max_rounds}", 400, 10, center=True))
+        items.append(self.text_item(f"Score: {self.player.score}", 400, 40, center=True))
+        items.append(self.text_item("Press H to toggle hitboxes, P for the profiler", 400, 550, center=True))
+        if self.profiler.enabled:
+            items += self.profiler_items()
+
+        if self.engine.game_state == GAME_STATES["RESULT"] and self.player.reaction_time > 0:
+            items.append(self.text_item(f"Your reaction time: {self.player.reaction_time}s", 400, 350, center=True))
+            items.append(self.text_item(f"Opponent's reaction time: {self.opponent.reaction_time}s", 400, 380, center=True))
+        return items
+
+    def draw_scene(self, surface=None, alpha=1.0):
+        for _, _, paint in self.scene_items(alpha):
+            paint(surface or self.screen)
 
     def draw_game_over(self):
-        # Draw background
-        screen.blit(self.menu_bg, (0, 0))
-        
+        lines = (
+            (self.engine.result_text(), 150, WHITE, True),
+            (f"Final Score: {self.player.score}", 200, BLACK, False),
+            (f"Rounds Played: {self.engine.round}/{self.engine.max_rounds}", 250, BLACK, False),
+            ("Press R to restart or ESC for menu", 300, BLACK, False),
+        )
+        # The whole screen is static until its text changes
+        frame = self.layers.get("game_over", self.screen.get_size(),
+                                lambda size: self._build_game_over(size, lines), version=lines)
+        self.screen.blit(frame, (0, 0))
+
+    def _build_game_over(self, size, lines):
+        base = self.layers.get("game_over_base", size, self._build_game_over_base)
+        frame = base.copy()
+        for text, y, color, large in lines:
+            frame.blit(*self.ui.place_text(text, 400, y, color, center=True, large=large))
+        return frame
+
+    def _build_game_over_base(self, size):
+        base = pygame.Surface(size).convert()
+        base.blit(self.menu_bg, (0, 0))
+
         # Semi-transparent overlay
-        overlay = pygame.Surface((800, 600), pygame.SRCALPHA)
+        overlay = pygame.Surface(size, pygame.SRCALPHA)
         overlay.fill((0, 0, 0, 180))  # Darker overlay for better text contrast
-        screen.blit(overlay, (0, 0))
-        
-        # Draw report text
-        if self.player.health <= 0:
-            result_text = "YOU LOST!"
-        elif self.opponent.health <= 0:
-            result_text = "YOU WON!"
-        else:
-            result_text = "GAME OVER"
-        
-        self.ui.draw_large_text(result_text, 400, 150, WHITE, center=True)
-        self.ui.draw_text(f"Final Score: {self.player.score}", 400, 200, BLACK, center=True)
-        self.ui.draw_text(f"Rounds Played: {self.round}/{self.max_rounds}", 400, 250, BLACK, center=True)
-        self.ui.draw_text("Press R to restart or ESC for menu", 400, 300, BLACK, center=True)
+        base.blit(overlay, (0, 0))
+        return base
 
-    def run(self):
+    def run(self, fps=60):
+        """Main loop; fps=0 renders as fast as possible"""
         running = True
+        dt = 0
+        # Clicks are stamped while the clock waits, not when the frame drains them
+        frame_clock = self.frame_clock = FrameClock(fps, InputSampler())
+        # Logic time not yet simulated, and stamped events not yet due
+        accumulator = 0.0
+        pending = []
+        # Draw (by its trigger time) whose frame has been reported as shown
+        shown_draw = None
+        first_frame = True
         while running:
-            current_time = pygame.time.get_ticks()
-            
+            self.sfx.update()
             # Handle menu/game over states
-            if self.game_state == GAME_STATES["MENU"]:
-                screen.fill(WHITE)
-                menu_result = self.menu.handle_input()
+            if self.engine.game_state == GAME_STATES["MENU"]:
+                self.screen.fill(WHITE)
+                menu_result = self.menu.handle_input(frame_clock.sampler.events())
                 if menu_result == "quit":
                     running = False
                 elif menu_result == "game":
-                    self.__init__()
-                    self.game_state = GAME_STATES["WAITING"]
-                self.menu.draw(screen)
+                    self.new_game()
+                self.menu.draw(self.screen)
                 pygame.display.flip()
-                clock.tick(60)
+                if first_frame:
+                    first_frame = False
+                    print(f"⏱️ First frame {(time.perf_counter() - STARTED) * 1000:.0f} ms after launch")
+                self.renderer.invalidate()
+                accumulator, pending = 0.0, []
+                dt = frame_clock.tick()
                 continue
             
-            if self.game_state == GAME_STATES["GAME_OVER"]:
+            if self.engine.game_state == GAME_STATES["GAME_OVER"]:
                 self.draw_game_over()
-                for event in pygame.event.get():
+                for event in frame_clock.sampler.events():
                     if event.type == pygame.QUIT:
                         running = False
                     elif event.type == pygame.KEYDOWN:
                         if event.key == pygame.K_r:
-                            self.__init__()
-                            self.game_state = GAME_STATES["WAITING"]
+                            self.new_game()
                         elif event.key == pygame.K_ESCAPE:
-                            self.game_state = GAME_STATES["MENU"]
+                            self.step_engine(0, [InputEvent(MENU)])
                         elif event.key == pygame.K_h:
                             self.show_hitboxes = not self.show_hitboxes
                 pygame.display.flip()
-                clock.tick(60)
+                self.renderer.invalidate()
+                accumulator, pending = 0.0, []
+                dt = frame_clock.tick()
                 continue
 
-            # Main game rendering
-            self.background.update()
-            self.background.draw(screen)
-            
-            # Event handling
-            for event in pygame.event.get():
+            profiling = self.profiler.enabled
+            if profiling:
+                self.profiler.begin_frame()
+
+            # Translate input into engine events, timed in engine milliseconds.
+            # The engine lags the wall clock by the unsimulated accumulator.
+            for stamp, event in frame_clock.sampler.drain():
+                when = frame_clock.to_engine_time(stamp, self.engine.now + accumulator)
                 if event.type == pygame.QUIT:
                     running = False
-                elif event.type == pygame.USEREVENT and self.game_state == GAME_STATES["COUNTDOWN"]:
-                    self.timer.start()
-                    self.game_state = GAME_STATES["SHOOTING"]
-                elif event.type == pygame.USEREVENT + 1 and self.game_state == GAME_STATES["COUNTDOWN"]:
-                    if not self.sfx.channels[3].get_busy():
-                        self.sfx.play("gun_pump")
-                elif event.type == pygame.MOUSEBUTTONDOWN and self.game_state == GAME_STATES["SHOOTING"]:
-                    self.timer.stop()
-                    self.player.reaction_time = self.timer.get_reaction_time()
-                    self.reaction_times.append(self.player.reaction_time)
-                    pygame.time.set_timer(pygame.USEREVENT + 2, 300, loops=1)
-                    self.check_winner(player_shot_first=True)
-                    self.game_state = GAME_STATES["RESULT"]
-                elif event.type == pygame.USEREVENT + 2:
-                    self.sfx.play("shell_drop")
+                elif event.type == pygame.MOUSEBUTTONDOWN:
+                    pending.append(InputEvent(FIRE, event.pos, when))
                 elif event.type == pygame.KEYDOWN:
-                    if self.game_state == GAME_STATES["WAITING"] and event.key == pygame.K_SPACE:
-                        self.start_game()
+                    if event.key == pygame.K_SPACE:
+                        if self.engine.game_state == GAME_STATES["RESULT"]:
+                            pending.append(InputEvent(CONTINUE, time=when))
+                        else:
+                            pending.append(InputEvent(START, time=when))
                     elif event.key == pygame.K_h:
                         self.show_hitboxes = not self.show_hitboxes
-
-            # Opponent shooting logic - ensure they always shoot
-            if (self.game_state == GAME_STATES["SHOOTING"] and 
-                current_time >= self.opponent_shot_time and 
-                not self.opponent.has_shot_this_round and
-                not self.timer.end_time):
-                
-                # Only shoot if player hasn't already shot first
-                if not self.player.is_shooting:
-                    self.timer.stop()
-                    if self.opponent.shoot():
-                        self.opponent.has_shot_this_round = True
-                        self.check_winner(player_shot_first=False)
-                        self.game_state = GAME_STATES["RESULT"]
-
-            # Game state rendering
-            if self.game_state == GAME_STATES["WAITING"]:
-                self.ui.draw_text("Press SPACE to start round", 400, 250, BLACK, center=True)
-            elif self.game_state == GAME_STATES["COUNTDOWN"]:
-                elapsed = (current_time - self.countdown_start_time) // 1000
-                remaining = max(0, self.countdown_duration - elapsed)
-                self.ui.draw_text(f"Get Ready... {remaining}", 400, 250, BLACK, center=True)
-            elif self.game_state == GAME_STATES["SHOOTING"]:
-                self.ui.draw_text("DRAW! SHOOT NOW!", 400, 250, BLACK, center=True)
-            elif self.game_state == GAME_STATES["RESULT"]:
-                if self.results:
-                    result_text = f"Round {self.round} Result: {self.results[-1]}"
-                    self.ui.draw_text(result_text, 400, 250, BLACK, center=True)
-                self.ui.draw_text("Press SPACE to continue", 400, 300, BLACK, center=True)
-                
-                if pygame.key.get_pressed()[pygame.K_SPACE]:
-                    self.reset_game()
-
-            # Draw all game objects
-            self.player.draw(screen)
-            self.opponent.draw(screen)
-            self.draw_health_bars()
-            self.draw_ammo()
-            if self.show_hitboxes:
-                self.draw_hitboxes()
-            self.draw_bullet_trace()
-            self.draw_muzzle_flash()
-            self.draw_hit_flash()
-            
-            # UI elements
-            self.ui.draw_text(f"Round: {self.round}/{self.max_rounds}", 400, 10, BLACK, center=True)
-            self.ui.draw_text(f"Score: {self.player.score}", 400, 40, BLACK, center=True)
-            self.ui.draw_text("Press H to toggle hitboxes", 400, 550, BLACK, center=True)
-            
-            if self.game_state == GAME_STATES["RESULT"] and self.player.reaction_time > 0:
-                self.ui.draw_text(f"Your reaction time: {self.player.reaction_time}s", 400, 350, BLACK, center=True)
-                self.ui.draw_text(f"Opponent's reaction time: {self.opponent.reaction_time}s", 400, 380, BLACK, center=True)
-
-            pygame.display.flip()
-            clock.tick(60)
+                    elif event.key == pygame.K_p:
+                        self.toggle_profiler()
+                    elif event.key == pygame.K_t and self.profiler.enabled:
+                        self.export_trace()
+            if profiling:
+                self.profiler.mark("events")
+
+            # Fixed logic steps; each event lands in the step that contains it,
+            # and the engine resolves it (and any deadline) at its exact time
+            accumulator += min(dt, MAX_FRAME_MS)
+            while accumulator >= STEP_MS:
+                step_end = self.engine.now + STEP_MS
+                due = [event for event in pending if event.time < step_end]
+                pending = [event for event in pending if event.time >= step_end]
+                self.handle_cues(self.step_engine(STEP_MS, due))
+                self.background.update(STEP_MS)
+                accumulator -= STEP_MS
+            self.schedule_sounds(self.engine.now + accumulator, max(AUDIO_LOOKAHEAD_MS, 2 * dt))
+            if profiling:
+                self.profiler.mark("logic")
+
+            items = self.scene_items(accumulator / STEP_MS)
+            if profiling:
+                self.profiler.mark("scene")
+            self.renderer.present(self.screen, items)
+            if self.engine.game_state == GAME_STATES["SHOOTING"] and shown_draw != self.engine.draw_trigger_time:
+                # This frame put DRAW on screen; reactions count from now, not from
+                # when the engine raised it, so display latency is not in them
+                shown_draw = self.engine.draw_trigger_time
+                shown = self.engine.now + accumulator + (time.perf_counter_ns() - frame_clock.last_ns) / 1e6
+                pending.append(InputEvent(SHOWN, time=shown))
+            dt = frame_clock.tick()
+            if profiling:
+                self.profiler.mark("wait")
 
 if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Eagle Eyes")
+    parser.add_argument("--dirty-rects", action="store_true",
+                        help="only repaint and update the screen regions that changed")
+    parser.add_argument("--fps", type=int, default=60,
+                        help="render rate, e.g. 120, 144 or 240; 0 for uncapped")
+    parser.add_argument("--low-latency", action="store_true",
+                        help=f"small mixer buffer ({LOW_LATENCY_BUFFER} samples) for tighter audio cues")
+    parser.add_argument("--audio-buffer", type=int,
+                        help=f"mixer buffer in samples (default {AUDIO_BUFFER}); too small can crackle")
+    parser.add_argument("--particles", type=float, default=1.0,
+                        help="background particle density; 0 for a still desert, 2 for twice as many")
+    parser.add_argument("--shootout", action="store_true",
+                        help="after the draw, both gunslingers keep firing until the time runs out")
+    parser.add_argument("--gallery", type=int, default=0, metavar="TARGETS",
+                        help="shooting-gallery rounds with this many outlaws and pop-up plates")
+    parser.add_argument("--no-record", action="store_true",
+                        help="do not record games to replays/ for replay.py")
+    args = parser.parse_args()
+    audio_buffer = args.audio_buffer or (LOW_LATENCY_BUFFER if args.low_latency else AUDIO_BUFFER)
+
     os.makedirs(resource_path(os.path.join("assets", "sounds")), exist_ok=True)
     os.makedirs(resource_path(os.path.join("assets", "bg")), exist_ok=True)
     
-    game = Game()
-    game.run()
+    game = Game(init_display(audio_buffer=audio_buffer), dirty_rects=args.dirty_rects,
+                particles=args.particles, shootout=args.shootout,
+                gallery=args.gallery, replays=None if args.no_record else "replays")
+    game.run(args.fps)
+    game.close_recording()
+    game.resources.loader.shutdown()
+    game.telemetry.close()
+    game.stats.save("round_stats.json")
     pygame.quit()
@@ -0,0 +1,190 @@
+# Eagle Eyes - Array-backed particle and parallax layers
+#
+# Each layer keeps its particles as NumPy arrays: position, the position one
+# logic step ago, and velocity, in pixels per second. update() moves all of
+# them in one vectorised step, wrapping particles that leave the layer's area
+# back in on the other side. blit_sequence() gives the (image, position) pairs
+# for one Surface.blits() call, interpolated between the last two steps like
+# the rest of the scene. Cost then grows with the number of pixels blitted,
+# not with Python work per particle.
+#
+# Particles drift left (negative x velocity) and respawn at the right edge
+# with a fresh height and speed. Vertical drift wraps within the area.
+# Optional sway adds a sine wobble to y, and spin steps through the images
+# with distance travelled, so a set of rotated frames rolls.
+#
+# item() draws a whole layer as one display-list item, which suits a full
+# repaint. For the dirty-rect renderer cell_items() splits the layer into
+# square cells of its area, one item each, so moving particles only damage
+# the cells they are in.
+import math
+
+import numpy as np
+import pygame
+
+
+class ParticleLayer:
+    def __init__(self, name, images, count, area, speed, drift=(0, 0), sway=(0, 0), spin=0, rng=None):
+        self.name = name
+        self.images = images
+        self.widths = np.array([image.get_width() for image in images], dtype=np.int32)
+        self.heights = np.array([image.get_height() for image in images], dtype=np.int32)
+        self.area = pygame.Rect(area)
+        self.speed = speed
+        self.drift = drift
+        # (amplitude px, frequency Hz) of the vertical wobble
+        self.sway = sway
+        # Pixels of travel per image step; 0 picks a fixed image per particle
+        self.spin = spin
+        self.rng = rng or np.random.default_rng()
+        self.time = 0.0
+
+        self.pos = np.empty((count, 2), dtype=np.float32)
+        self.pos[:, 0] = self.rng.uniform(self.area.left, self.area.right, count)
+        self.pos[:, 1] = self.rng.uniform(self.area.top, self.area.bottom, count)
+        self.vel = np.empty((count, 2), dtype=np.float32)
+        self._respawn_velocity(np.arange(count))
+        self.prev = self.pos.copy()
+        self.image_index = self.rng.integers(0, len(images), count)
+        self.phase = self.rng.uniform(0, 2 * math.pi, count).astype(np.float32)
+
+    def __len__(self):
+        return len(self.pos)
+
+    def _respawn_velocity(self, which):
+        self.vel[which, 0] = -self.rng.uniform(*self.speed, len(which))
+        self.vel[which, 1] = self.rng.uniform(*self.drift, len(which))
+
+    def update(self, dt):
+        """Advance every particle by one logic step of dt milliseconds"""
+        self.time += dt / 1000
+        self.prev[:] = self.pos
+        self.pos += self.vel * (dt / 1000)
+
+        gone = np.flatnonzero(self.pos[:, 0] < self.area.left - self.widths[self.image_index])
+        if len(gone):
+            self.pos[gone, 0] = self.area.right
+            self.pos[gone, 1] = self.rng.uniform(self.area.top, self.area.bottom, len(gone))
+            self.prev[gone] = self.pos[gone]
+            self._respawn_velocity(gone)
+
+        # Wrapping keeps prev on the same side, so interpolation does not streak
+        height = self.area.height
+        for edge, shift in ((self.pos[:, 1] < self.area.top, height),
+                            (self.pos[:, 1] >= self.area.bottom, -height)):
+            if edge.any():
+                self.pos[edge, 1] += shift
+                self.prev[edge, 1] += shift
+
+    def positions(self, alpha=1.0):
+        """Integer top-left of every particle, between the last two steps"""
+        pos = self.prev + (self.pos - self.prev) * alpha
+        if self.sway[0]:
+            pos[:, 1] += self.sway[0] * np.sin(self.phase + self.time * 2 * math.pi * self.sway[1])
+        # Blits land on whole pixels, so sub-pixel drift is not a change
+        return pos.astype(np.int32)
+
+    def frames(self, pos):
+        if not self.spin:
+            return self.image_index
+        return (self.image_index - pos[:, 0] // self.spin) % len(self.images)
+
+    def blit_sequence(self, alpha=1.0):
+        """(image, position) pairs for Surface.blits()"""
+        return self._sequence(self.positions(alpha))
+
+    def _sequence(self, pos):
+        images = self.images
+        return [(images[index], xy) for index, xy in zip(self.frames(pos).tolist(), pos.tolist())]
+
+    def bounds(self, pos):
+        """Rect covering every particle at pos"""
+        if not len(pos):
+            return pygame.Rect(0, 0, 0, 0)
+        right = pos[:, 0] + self.widths.max()
+        bottom = pos[:, 1] + max(image.get_height() for image in self.images)
+        left, top = pos.min(axis=0).tolist()
+        return pygame.Rect(left, top, int(right.max()) - left, int(bottom.max()) - top)
+
+    def item(self, alpha=1.0):
+        """One display-list item for the whole layer"""
+        pos = self.positions(alpha)
+        frames = self.frames(pos)
+        sequence = self._sequence(pos)
+        # The key changes whenever any particle lands on a different pixel or frame
+        key = ("particles", self.name, pos.tobytes(), frames.tobytes() if self.spin else b"")
+        return (key, self.bounds(pos),
+                lambda surface: surface.blits(sequence, doreturn=False))
+
+    def cell_items(self, alpha=1.0, cell=64):
+        """One display-list item per cell x cell square of the area holding particles"""
+        pos = self.positions(alpha)
+        if not len(pos):
+            return []
+        frames = self.frames(pos)
+        cols = max(1, -(-self.area.width // cell))
+        rows = max(1, -(-self.area.height // cell))
+        # Particles belong to the cell their top-left is in; swaying or
+        # respawning ones just outside the area go to the nearest cell
+        index = (np.clip((pos[:, 1] - self.area.top) // cell, 0, rows - 1) * cols +
+                 np.clip((pos[:, 0] - self.area.left) // cell, 0, cols - 1))
+        order = np.argsort(index, kind="stable")
+        index, pos, frames = index[order], pos[order], frames[order]
+        starts = np.flatnonzero(np.diff(index, prepend=-1))
+        ends = starts[1:].tolist() + [len(index)]
+        lefts = np.minimum.reduceat(pos[:, 0], starts).tolist()
+        tops = np.minimum.reduceat(pos[:, 1], starts).tolist()
+        rights = np.maximum.reduceat(pos[:, 0] + self.widths[frames], starts).tolist()
+        bottoms = np.maximum.reduceat(pos[:, 1] + self.heights[frames], starts).tolist()
+
+        images = self.images
+        xy = pos.tolist()
+        frame_list = frames.tolist()
+        items = []
+        for start, end, left, top, right, bottom in zip(starts.tolist(), ends, lefts, tops, rights, bottoms):
+            sequence = [(images[i], p) for i, p in zip(frame_list[start:end], xy[start:end])]
+            key = ("particles", self.name, int(index[start]), pos[start:end].tobytes(),
+                   frames[start:end].tobytes() if self.spin else b"")
+            items.append((key, pygame.Rect(left, top, right - left, bottom - top),
+                          lambda surface, sequence=sequence: surface.blits(sequence, doreturn=False)))
+        return items
+
+
+def dust_sprites(color=(235, 215, 175)):
+    """Soft specks of a few sizes and strengths"""
+    sprites = []
+    for radius, strength in ((1, 90), (1, 150), (2, 70), (2, 120)):
+        speck = pygame.Surface((radius * 2 + 1, radius * 2 + 1), pygame.SRCALPHA)
+        pygame.draw.circle(speck, color + (strength,), (radius, radius), radius)
+        sprites.append(speck.convert_alpha())
+    return sprites
+
+
+def shimmer_sprites(width=120, color=(255, 240, 210)):
+    """Faint horizontal streaks for heat haze above the ground"""
+    sprites = []
+    for length, strength in ((width, 28), (width * 2 // 3, 36), (width // 2, 44)):
+        streak = pygame.Surface((length, 4), pygame.SRCALPHA)
+        pygame.draw.ellipse(streak, color + (strength,), streak.get_rect())
+        sprites.append(streak.convert_alpha())
+    return sprites
+
+
+def tumbleweed_frames(size=28, steps=8):
+    """One tumbleweed rotated through a full turn, steps frames"""
+    weed = pygame.Surface((size, size), pygame.SRCALPHA)
+    center = size // 2
+    for i in range(7):
+        angle = i * math.pi / 7
+        dx, dy = math.cos(angle) * (center - 2), math.sin(angle) * (center - 2)
+        pygame.draw.line(weed, (120, 85, 45, 220), (center - dx, center - dy), (center + dx, center + dy), 2)
+    pygame.draw.circle(weed, (140, 100, 55, 200), (center, center), center - 2, 2)
+    pygame.draw.circle(weed, (160, 120, 70, 160), (center, center), center // 2, 1)
+    frames = []
+    # Rolling left turns anticlockwise; each frame is recentred at the same size
+    for step in range(steps):
+        rotated = pygame.transform.rotate(weed, step * 360 / steps)
+        frame = pygame.Surface((size, size), pygame.SRCALPHA)
+        frame.blit(rotated, rotated.get_rect(center=(center, center)))
+        frames.append(frame.convert_alpha())
+    return frames
@@ -0,0 +1,110 @@
+# Eagle Eyes - Frame profiler
+#
+# Sections are timed by marks: mark(name) charges the time since the previous
+# mark to `name`, so each instrumented point costs one perf_counter_ns() call.
+# Marks and frame boundaries go into fixed-size NumPy ring buffers, so a long
+# session never grows memory. Callers read `enabled` once per frame and guard
+# each mark with it, so a disabled profiler costs one branch per section.
+import json
+import time
+
+import numpy as np
+
+
+class FrameProfiler:
+    def __init__(self, frames=600, events=16384):
+        self.enabled = False
+        self.names = []
+        self.ids = {}
+        self.frame_start = np.zeros(frames, dtype=np.int64)
+        self.frame_time = np.zeros(frames, dtype=np.int64)
+        self.frame_count = 0
+        self.event_name = np.zeros(events, dtype=np.int32)
+        self.event_start = np.zeros(events, dtype=np.int64)
+        self.event_time = np.zeros(events, dtype=np.int64)
+        self.event_count = 0
+        self.last = None
+        self.current_frame = None
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.last = self.current_frame = None
+        return self.enabled
+
+    def begin_frame(self):
+        """Close the frame in progress (if any) and start a new one"""
+        now = time.perf_counter_ns()
+        if self.current_frame is not None:
+            i = self.frame_count % len(self.frame_time)
+            self.frame_start[i] = self.current_frame
+            self.frame_time[i] = now - self.current_frame
+            self.frame_count += 1
+        self.current_frame = self.last = now
+
+    def mark(self, name):
+        now = time.perf_counter_ns()
+        if self.last is None:
+            self.last = now
+            return
+        section = self.ids.get(name)
+        if section is None:
+            section = self.ids[name] = len(self.names)
+            self.names.append(name)
+        i = self.event_count % len(self.event_time)
+        self.event_name[i] = section
+        self.event_start[i] = self.last
+        self.event_time[i] = now - self.last
+        self.event_count += 1
+        self.last = now
+
+    def _frames(self):
+        count = min(self.frame_count, len(self.frame_time))
+        return self.frame_start[:count], self.frame_time[:count]
+
+    def _events(self):
+        count = min(self.event_count, len(self.event_time))
+        return self.event_name[:count], self.event_start[:count], self.event_time[:count]
+
+    def frame_stats(self):
+        """Frame-time percentiles in ms over the buffered frames"""
+        _, times = self._frames()
+        if not len(times):
+            return None
+        p50, p95, p99 = np.percentile(times, (50, 95, 99)) / 1e6
+        return {"frames": len(times), "p50": p50, "p95": p95, "p99": p99, "max": times.max() / 1e6}
+
+    def section_stats(self, top=5, exclude=("wait",)):
+        """Sections by mean ms per frame, largest first: (name, mean, worst single)"""
+        names, _, times = self._events()
+        frames = max(1, min(self.frame_count, len(self.frame_time)))
+        if not len(names):
+            return []
+        totals = np.bincount(names, weights=times, minlength=len(self.names))
+        worst = np.zeros(len(self.names))
+        np.maximum.at(worst, names, times)
+        order = [i for i in np.argsort(totals)[::-1] if self.names[i] not in exclude and totals[i]]
+        return [(self.names[i], totals[i] / frames / 1e6, worst[i] / 1e6) for i in order[:top]]
+
+    def overlay_lines(self):
+        stats = self.frame_stats()
+        if stats is None:
+            return ["profiler: collecting..."]
+        lines = [f"frame ms  p50 {stats['p50']:.2f}  p95 {stats['p95']:.2f}  "
+                 f"p99 {stats['p99']:.2f}  max {stats['max']:.2f}"]
+        for name, mean, worst in self.section_stats():
+            lines.append(f"{name:<14} {mean:6.3f} ms/frame  worst {worst:.2f}")
+        return lines
+
+    def export_chrome_trace(self, path):
+        """Write buffered frames and sections as Chrome trace-event JSON"""
+        events = []
+        for start, duration in zip(*self._frames()):
+            events.append({"name": "frame", "ph": "X", "pid": 1, "tid": 1,
+                           "ts": start / 1000, "dur": duration / 1000})
+        for name, start, duration in zip(*self._events()):
+            events.append({"name": self.names[name], "ph": "X", "pid": 1, "tid": 2,
+                           "ts": start / 1000, "dur": duration / 1000})
+        events.sort(key=lambda event: event["ts"])
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, file)
+        return len(events)
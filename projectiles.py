@@ -0,0 +1,213 @@
+# Eagle Eyes - Pooled projectiles
+#
+# Bullets in flight live in preallocated struct-of-arrays storage: position,
+# position one step ago, velocity, origin, owner, spawn time, flight time
+# left and whether the bullet can hit. Firing writes into a free slot, so no
+# objects are created per shot. When every slot is in use, the oldest bullet
+# is recycled.
+#
+# step() moves every slot at once and tests each bullet's path this step
+# against the targets' hitboxes with the same slab test as hitscan.py. A
+# bullet therefore hits exactly what a hitscan segment along its flight would
+# have hit, however far it moves per step. The work runs in scratch arrays
+# that are also preallocated, over the slots up to the highest one in use:
+# a step never costs more than a full pool, costs little for a duel's
+# handful of bullets, and allocates nothing unless something hit or retired.
+#
+# Targets are a (T, Z, 4) array of (left, top, width, height): Z zones for
+# each of T targets, target i belonging to owner i. A bullet never hits its
+# owner, and on a tie the earlier zone wins.
+import numpy as np
+
+
+class ProjectilePool:
+    def __init__(self, targets, capacity=512, bounds=(-50, -50, 900, 700)):
+        self.capacity = capacity
+        # Bullets leaving this (left, top, width, height) area are retired
+        self.bounds = bounds
+        self.pos = np.zeros((capacity, 2))
+        self.prev = np.zeros((capacity, 2))
+        self.vel = np.zeros((capacity, 2))
+        self.origin = np.zeros((capacity, 2))
+        self.owner = np.zeros(capacity, dtype=np.int8)
+        self.spawn_time = np.zeros(capacity)
+        self.life = np.zeros(capacity)
+        self.lethal = np.zeros(capacity, dtype=bool)
+        self.active = np.zeros(capacity, dtype=bool)
+        self.count = 0
+        # Every active slot is below this; only slots below it are stepped
+        self.used = 0
+        self.set_targets(targets)
+
+        self._dt = np.zeros(capacity)
+        self._delta = np.zeros((capacity, 2))
+        self._inv = np.zeros((capacity, 2))
+        self._zero = np.zeros((capacity, 2), dtype=bool)
+        self._live = np.zeros(capacity, dtype=bool)
+        self._idle = np.zeros(capacity, dtype=bool)
+        self._best = np.zeros(capacity)
+        self._hit = np.zeros(capacity, dtype=bool)
+        self._gone = np.zeros(capacity, dtype=bool)
+        self._gone_axis = np.zeros(capacity, dtype=bool)
+
+    def set_targets(self, targets):
+        targets = np.asarray(targets, dtype=float)
+        self.zones = targets.shape[1]
+        flat = targets.reshape(-1, 4)
+        self.low = flat[:, :2].copy()
+        self.high = flat[:, :2] + flat[:, 2:]
+        # Which target each flattened zone belongs to
+        self.zone_target = np.repeat(np.arange(len(targets), dtype=np.int8), self.zones)
+        rects = len(flat)
+        self._t_near = np.zeros((self.capacity, rects))
+        self._t_far = np.zeros((self.capacity, rects))
+        self._t1 = np.zeros((self.capacity, rects))
+        self._t2 = np.zeros((self.capacity, rects))
+        self._t3 = np.zeros((self.capacity, rects))
+        self._blocked = np.zeros((self.capacity, rects), dtype=bool)
+        self._own = np.zeros((self.capacity, rects), dtype=bool)
+
+    def spawn(self, owner, origin, velocity, now, life, lethal=True):
+        """Fire a bullet from origin at velocity (px/s) for life ms; returns its slot"""
+        if self.count < self.capacity:
+            # The lowest free slot, keeping the used range short
+            slot = int(self.active.argmin())
+            self.count += 1
+            self.used = max(self.used, slot + 1)
+        else:
+            slot = int(self.spawn_time.argmin())
+        self.pos[slot] = self.prev[slot] = self.origin[slot] = origin
+        self.vel[slot] = velocity
+        self.owner[slot] = owner
+        self.spawn_time[slot] = now
+        self.life[slot] = life
+        self.lethal[slot] = lethal
+        self.active[slot] = True
+        return slot
+
+    def clear(self):
+        self.active[:] = False
+        self.life[:] = 0
+        self.count = 0
+        self.used = 0
+
+    def flight_time(self):
+        """ms until every bullet in flight has run out of range"""
+        return float(self.life.max()) if self.count else 0.0
+
+    def trails(self, alpha=1.0, length=160):
+        """(owner, tail, head) of every bullet in flight, between the last two steps
+
+        The tail trails the head by up to length px, never reaching back
+        past the muzzle.
+        """
+        live = np.flatnonzero(self.active[:self.used])
+        if not len(live):
+            return []
+        prev = self.prev[live]
+        head = prev + (self.pos[live] - prev) * alpha
+        back = self.origin[live] - head
+        flown = np.hypot(back[:, 0], back[:, 1])
+        tail = head + back * (np.minimum(flown, length) / np.maximum(flown, 1e-9))[:, np.newaxis]
+        return list(zip(self.owner[live].tolist(), tail.astype(int).tolist(), head.astype(int).tolist()))
+
+    def step(self, dt):
+        """Move every bullet dt ms; returns (hits, retired)
+
+        hits is a list of (slot, target, zone, ms into the step) in time
+        order; retired lists the slots that ran out of range or left the
+        bounds without hitting. Both are usually empty.
+        """
+        if not self.count:
+            return [], []
+        n = self.used
+        life, pos, prev = self.life[:n], self.pos[:n], self.prev[:n]
+        # Each bullet flies for dt, or for what is left of its range
+        step_dt = np.minimum(life, dt, out=self._dt[:n])
+        life -= step_dt
+        step_dt *= 0.001
+        delta = np.multiply(self.vel[:n], step_dt[:, np.newaxis], out=self._delta[:n])
+        prev[:] = pos
+        pos += delta
+
+        hits = self._collide(n)
+        retired = self._retire(n)
+        for slot, _, _, _ in hits:
+            self.active[slot] = False
+            self.life[slot] = 0
+        self.count -= len(hits)
+        # Free slots at the end of the used range no longer need stepping
+        while self.used and not self.active[self.used - 1]:
+            self.used -= 1
+        return hits, retired
+
+    def _collide(self, n):
+        """Slab test of every segment prev->pos against every zone"""
+        prev, delta, inv = self.prev[:n], self._delta[:n], self._inv[:n]
+        # A zero direction component becomes a tiny one, as in batch_first_hit
+        zero = np.equal(delta, 0, out=self._zero[:n])
+        np.copyto(inv, delta)
+        np.copyto(inv, 1e-300, where=zero)
+        np.divide(1.0, inv, out=inv)
+
+        t_near, t_far = self._t_near[:n], self._t_far[:n]
+        t1, t2, t3 = self._t1[:n], self._t2[:n], self._t3[:n]
+        t_near.fill(0.0)
+        t_far.fill(1.0)
+        with np.errstate(over="ignore", invalid="ignore"):
+            for axis in (0, 1):
+                np.subtract(self.low[:, axis], prev[:, axis, np.newaxis], out=t1)
+                t1 *= inv[:, axis, np.newaxis]
+                np.subtract(self.high[:, axis], prev[:, axis, np.newaxis], out=t2)
+                t2 *= inv[:, axis, np.newaxis]
+                np.maximum(t1, t2, out=t3)
+                np.minimum(t1, t2, out=t1)
+                np.maximum(t_near, t1, out=t_near)
+                np.minimum(t_far, t3, out=t_far)
+
+        # Misses, idle slots, tracers and a bullet's own owner never count
+        blocked, own = self._blocked[:n], self._own[:n]
+        live, idle = self._live[:n], self._idle[:n]
+        np.greater(t_near, t_far, out=blocked)
+        np.logical_and(self.active[:n], self.lethal[:n], out=live)
+        np.logical_not(live, out=idle)
+        np.logical_or(blocked, idle[:, np.newaxis], out=blocked)
+        np.equal(self.owner[:n, np.newaxis], self.zone_target, out=own)
+        np.logical_or(blocked, own, out=blocked)
+        np.copyto(t_near, np.inf, where=blocked)
+
+        best, hit = self._best[:n], self._hit[:n]
+        t_near.min(axis=1, out=best)
+        np.isfinite(best, out=hit)
+        if not hit.any():
+            return []
+        hits = []
+        for slot in np.flatnonzero(hit).tolist():
+            flat = int(t_near[slot].argmin())
+            ms = float(best[slot] * self._dt[slot] * 1000)
+            hits.append((slot, flat // self.zones, flat % self.zones, ms))
+            # The bullet stops where it entered
+            self.pos[slot] = prev[slot] + delta[slot] * best[slot]
+        hits.sort(key=lambda hit: hit[3])
+        return hits
+
+    def _retire(self, n):
+        gone, axis = self._gone[:n], self._gone_axis[:n]
+        pos = self.pos[:n]
+        np.less_equal(self.life[:n], 0, out=gone)
+        left, top, width, height = self.bounds
+        for column, low, high in ((0, left, left + width), (1, top, top + height)):
+            np.less(pos[:, column], low, out=axis)
+            np.logical_or(gone, axis, out=gone)
+            np.greater(pos[:, column], high, out=axis)
+            np.logical_or(gone, axis, out=gone)
+        np.logical_and(gone, self.active[:n], out=gone)
+        np.logical_not(self._hit[:n], out=axis)
+        np.logical_and(gone, axis, out=gone)
+        if not gone.any():
+            return []
+        retired = np.flatnonzero(gone).tolist()
+        self.active[:n][gone] = False
+        self.life[:n][gone] = 0
+        self.count -= len(retired)
+        return retired
@@ -0,0 +1,139 @@
+# Eagle Eyes - Frame presenters
+#
+# A scene is a display list of (key, rect, paint) items painted in order,
+# where paint(surface) draws the item and key describes what it looks like.
+# FullRenderer repaints everything and flips. DirtyRectRenderer compares the
+# list with the previous frame: only items whose key or rect changed are
+# damaged, the damaged regions are repainted under a clip, and only those
+# regions are sent to pygame.display.update().
+#
+# With a profiler attached, each paint is charged to "draw:<key kind>" and
+# the flip/update to "flip".
+import pygame
+
+
+def paint_items(surface, items, profiler=None):
+    if profiler is None:
+        for _, _, paint in items:
+            paint(surface)
+        return
+    for key, _, paint in items:
+        paint(surface)
+        profiler.mark("draw:" + key[0])
+
+
+class FullRenderer:
+    def __init__(self):
+        self.frames = 0
+        self.profiler = None
+
+    def invalidate(self):
+        pass
+
+    def present(self, surface, items):
+        paint_items(surface, items, self.profiler)
+        pygame.display.flip()
+        if self.profiler is not None:
+            self.profiler.mark("flip")
+        self.frames += 1
+
+
+class DirtyRectRenderer:
+    def __init__(self, size, full_threshold=0.5):
+        self.screen_rect = pygame.Rect((0, 0), size)
+        # Fraction of the screen above which one flip beats many small updates
+        self.full_threshold = full_threshold
+        self.previous = set()
+        self.needs_full = True
+        self.frames = 0
+        self.full_frames = 0
+        self.partial_frames = 0
+        self.idle_frames = 0
+        self.pixels_updated = 0
+        self.profiler = None
+
+    def invalidate(self):
+        """Force a full repaint next frame, e.g. after another screen drew"""
+        self.needs_full = True
+
+    def damage(self, items):
+        current = {(key, tuple(rect)) for key, rect, _ in items}
+        changed = current.symmetric_difference(self.previous)
+        self.previous = current
+        rects = [self.screen_rect.clip(pygame.Rect(rect)) for _, rect in changed]
+        return merge_rects([rect for rect in rects if rect.width and rect.height])
+
+    def present(self, surface, items):
+        self.frames += 1
+        dirty = self.damage(items)
+        area = sum(rect.width * rect.height for rect in dirty)
+        screen_area = self.screen_rect.width * self.screen_rect.height
+
+        if self.needs_full or area >= screen_area * self.full_threshold:
+            paint_items(surface, items, self.profiler)
+            pygame.display.flip()
+            if self.profiler is not None:
+                self.profiler.mark("flip")
+            self.needs_full = False
+            self.full_frames += 1
+            self.pixels_updated += screen_area
+            return
+
+        if not dirty:
+            self.idle_frames += 1
+            return
+
+        for region in dirty:
+            surface.set_clip(region)
+            paint_items(surface, [item for item in items if region.colliderect(item[1])], self.profiler)
+        surface.set_clip(None)
+        pygame.display.update(dirty)
+        if self.profiler is not None:
+            self.profiler.mark("flip")
+        self.partial_frames += 1
+        self.pixels_updated += area
+
+    def stats(self):
+        return {
+            "frames": self.frames,
+            "full": self.full_frames,
+            "partial": self.partial_frames,
+            "idle": self.idle_frames,
+            "pixels_per_frame": self.pixels_updated / max(1, self.frames),
+        }
+
+
+def merge_rects(rects):
+    """Union overlapping rects until the remaining ones are disjoint"""
+    merged = []
+    for rect in rects:
+        rect = rect.copy()
+        i = 0
+        while i < len(merged):
+            if rect.colliderect(merged[i]):
+                rect.union_ip(merged.pop(i))
+                i = 0
+            else:
+                i += 1
+        merged.append(rect)
+    return merged
+
+
+class LayerCache:
+    """Full-screen overlays and composites, built once per size and reused"""
+
+    def __init__(self):
+        self.layers = {}
+        self.builds = 0
+
+    def get(self, name, size, build, version=None):
+        # build(size) makes the surface; a new version replaces the old one
+        entry = self.layers.get(name)
+        if entry is None or entry[0] != size or entry[1] != version:
+            entry = (size, version, build(size))
+            self.layers[name] = entry
+            self.builds += 1
+        return entry[2]
+
+    def clear(self):
+        self.layers.clear()
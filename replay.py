@@ -0,0 +1,358 @@
+# Eagle Eyes - Session recording and replay
+#
+# Every game is seeded (the seed is the telemetry session id) and the engine
+# only changes in step(), so a game is fully described by its seed and the
+# sequence of step(dt, events) calls. SessionRecorder writes that sequence to
+# a compact binary file; SessionReplay feeds it to a fresh engine with
+# rendering, audio and the wall clock out of the picture, as fast as the
+# engine can go or paced at any multiple of real time.
+#
+# Layout: a fixed header (format version, seed, start time, game mode), then
+# tagged records:
+#   S  a run of steps of the same dt with no input
+#   E  one step with its input events
+#   K  a keyframe: the engine's state before a round starts
+#   C  the round_complete record the round produced, to check replays against
+# then, once the recording is closed, an index of the keyframes and a footer
+# pointing at it. A replay can start at any round from its keyframe instead
+# of from the beginning. A recording cut short (the game crashed or was
+# killed) has no footer; its keyframes are found by scanning instead.
+#
+# A keyframe is a fixed set of packed fields (clock, scores, health, ammo,
+# the opponent, the random generator's state) rather than a pickle, so
+# opening a recording someone else sent can only ever yield numbers, and old
+# recordings do not depend on the engine's class layout.
+#
+#   python replay.py info replays/<session>.eer
+#   python replay.py play replays/<session>.eer --round 3 --speed 200
+#   python replay.py verify replays/<session>.eer
+import math
+import os
+import struct
+import time
+
+from engine import CONTINUE, FIRE, GAME_STATES, MENU, RESTART, SHOWN, START, DuelEngine, InputEvent
+from telemetry_store import RESULTS, result_code
+
+MAGIC = b"EEYEREC1"
+VERSION = 1
+HEADER = struct.Struct("<8sHQdHBH")
+FOOTER = struct.Struct("<Q8s")
+INDEX_MAGIC = b"EEYEIDX1"
+RUN = struct.Struct("<dI")
+STEP = struct.Struct("<dB")
+EVENT = struct.Struct("<Bddd")
+KEYFRAME = struct.Struct("<HI")
+CHECK = struct.Struct("<HdBHqd")
+INDEX_ENTRY = struct.Struct("<HQ")
+# New kinds go at the end, so older recordings keep their meaning
+KINDS = (START, FIRE, CONTINUE, RESTART, MENU, SHOWN)
+STATES = tuple(GAME_STATES.values())
+# Keyframe body: the engine, then the player, then the opponent, then the
+# lengths of the reaction time and result lists that follow the rng state.
+# Times that may be unset are NaN.
+SNAPSHOT = struct.Struct("<HBBBBId10d" "qidB3d" "HidB3dB" "HH")
+# random.Random state: 624 words of Mersenne Twister plus the position, and
+# the cached gauss value
+RNG_STATE = struct.Struct("<625Id")
+ENGINE_TIMES = ("start_play_time", "total_play_time", "hit_flash_end", "countdown_start_time",
+                "draw_trigger_time", "pump_time", "opponent_shot_time", "round_end_time",
+                "reload_time", "shell_drop_time")
+
+
+class SessionRecorder:
+    def __init__(self, path, engine):
+        """Record engine from now on; it should have just started a seeded game"""
+        if engine.seed is None:
+            raise ValueError("only a seeded game can be recorded")
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.file = open(path, "wb")
+        self.file.write(HEADER.pack(MAGIC, VERSION, engine.seed, engine.now, engine.max_rounds,
+                                    engine.shootout, engine.gallery_size))
+        # Steps without input are written as one run per dt
+        self.run_dt = None
+        self.run_length = 0
+        self.keyframes = []
+        self.keyframe_round = None
+        self.steps = 0
+        self._keyframe(engine)
+
+    def step(self, engine, dt, events=()):
+        """engine.step(dt, events), recorded"""
+        if engine.game_state == GAME_STATES["WAITING"] and engine.round != self.keyframe_round:
+            self._keyframe(engine)
+        self.steps += 1
+        if events:
+            self._end_run()
+            self.file.write(b"E" + STEP.pack(dt, len(events)))
+            for event in events:
+                x, y = event.pos if event.pos is not None else (math.nan, math.nan)
+                self.file.write(EVENT.pack(KINDS.index(event.kind), x, y,
+                                           math.nan if event.time is None else event.time))
+        elif dt == self.run_dt:
+            self.run_length += 1
+        else:
+            self._end_run()
+            self.run_dt, self.run_length = dt, 1
+
+        cues = engine.step(dt, events)
+        for cue in cues:
+            if cue[0] == "round_complete":
+                self._end_run()
+                number, reaction, result, difficulty, score, played = cue[1]
+                self.file.write(b"C" + CHECK.pack(number, reaction, result_code(result), difficulty, score, played))
+                # A crash loses at most the round being played
+                self.file.flush()
+        return cues
+
+    def _end_run(self):
+        if self.run_length:
+            self.file.write(b"S" + RUN.pack(self.run_dt, self.run_length))
+        self.run_dt, self.run_length = None, 0
+
+    def _keyframe(self, engine):
+        self._end_run()
+        snapshot = pack_engine(engine)
+        self.keyframes.append((engine.round, self.file.tell()))
+        self.file.write(b"K" + KEYFRAME.pack(engine.round, len(snapshot)) + snapshot)
+        self.keyframe_round = engine.round
+
+    def close(self):
+        if self.file.closed:
+            return
+        self._end_run()
+        index_offset = self.file.tell()
+        self.file.write(struct.pack("<I", len(self.keyframes)))
+        for entry in self.keyframes:
+            self.file.write(INDEX_ENTRY.pack(*entry))
+        self.file.write(FOOTER.pack(index_offset, INDEX_MAGIC))
+        self.file.close()
+
+
+class SessionReplay:
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self.data = f.read()
+        if self.data[:len(MAGIC)] != MAGIC or len(self.data) < HEADER.size:
+            raise ValueError(f"{path} is not an Eagle Eyes recording")
+        _, version, self.seed, self.start_now, self.max_rounds, shootout, self.gallery = \
+            HEADER.unpack_from(self.data)
+        if version != VERSION:
+            raise ValueError(f"{path} is a version {version} recording; this build reads version {VERSION}")
+        self.shootout = bool(shootout)
+        self.end = len(self.data)
+        self.complete = False
+        if len(self.data) >= HEADER.size + FOOTER.size:
+            index_offset, index_magic = FOOTER.unpack_from(self.data, len(self.data) - FOOTER.size)
+            self.complete = index_magic == INDEX_MAGIC
+        if self.complete:
+            self.end = index_offset
+            count, = struct.unpack_from("<I", self.data, index_offset)
+            self.keyframes = dict(INDEX_ENTRY.unpack_from(self.data, index_offset + 4 + i * INDEX_ENTRY.size)
+                                  for i in range(count))
+        else:
+            self.keyframes = {number: start for start, kind, number in self._scan() if kind == "keyframe"}
+
+    def rounds(self):
+        """Rounds a replay can start at"""
+        return sorted(completed + 1 for completed in self.keyframes)
+
+    def _scan(self, offset=HEADER.size):
+        """(offset, kind, payload) for each whole record from offset on"""
+        data, end = self.data, self.end
+        try:
+            while offset < end:
+                tag = data[offset:offset + 1]
+                start = offset
+                offset += 1
+                if tag == b"S":
+                    dt, count = RUN.unpack_from(data, offset)
+                    offset += RUN.size
+                    yield start, "run", (dt, count)
+                elif tag == b"E":
+                    dt, count = STEP.unpack_from(data, offset)
+                    offset += STEP.size
+                    events = []
+                    for _ in range(count):
+                        kind, x, y, when = EVENT.unpack_from(data, offset)
+                        offset += EVENT.size
+                        events.append(InputEvent(KINDS[kind], None if math.isnan(x) else (x, y),
+                                                 None if math.isnan(when) else when))
+                    yield start, "step", (dt, events)
+                elif tag == b"K":
+                    number, length = KEYFRAME.unpack_from(data, offset)
+                    offset += KEYFRAME.size + length
+                    if offset > end:
+                        return
+                    yield start, "keyframe", number
+                elif tag == b"C":
+                    number, reaction, result, difficulty, score, played = CHECK.unpack_from(data, offset)
+                    offset += CHECK.size
+                    yield start, "check", [number, reaction, RESULTS[result], difficulty, score, played]
+                else:
+                    raise ValueError(f"bad record tag {tag!r} at {start} in {self.path}")
+        except struct.error:
+            # The last record of an unfinished recording may be cut short
+            return
+
+    def engine(self, round=1):
+        """(engine, offset) ready to play from the start of round"""
+        completed = round - 1
+        if completed not in self.keyframes:
+            raise ValueError(f"{self.path} has no keyframe for round {round}; rounds: {self.rounds()}")
+        offset = self.keyframes[completed]
+        length = KEYFRAME.unpack_from(self.data, offset + 1)[1]
+        body = offset + 1 + KEYFRAME.size
+        engine = DuelEngine(max_rounds=self.max_rounds, shootout=self.shootout, gallery=self.gallery)
+        engine.seed = self.seed
+        try:
+            unpack_engine(engine, self.data[body:body + length])
+        except (struct.error, IndexError, ValueError) as e:
+            raise ValueError(f"bad keyframe for round {round} in {self.path}: {e}") from None
+        return engine, offset
+
+    def play(self, round=1, speed=0):
+        """Replay from round to the end of the recording
+
+        Yields (replayed, recorded) round records as each round completes.
+        speed paces the replay at that multiple of real time; 0 runs flat out.
+        self.replayed is the engine being driven.
+        """
+        engine, offset = self.engine(round)
+        self.replayed = engine
+        self.steps = 0
+        self.started_now = started_now = engine.now
+        started_at = time.perf_counter()
+        replayed = []
+        for _, kind, payload in self._scan(offset):
+            if kind == "check":
+                yield (replayed.pop(0) if replayed else None), payload
+                continue
+            if kind == "keyframe":
+                continue
+            dt, count = payload if kind == "run" else (payload[0], 1)
+            events = payload[1] if kind == "step" else ()
+            for _ in range(count):
+                for cue in engine.step(dt, events):
+                    if cue[0] == "round_complete":
+                        replayed.append(cue[1])
+                self.steps += 1
+                if speed:
+                    ahead = (engine.now - started_now) / 1000 / speed - (time.perf_counter() - started_at)
+                    if ahead > 0.002:
+                        time.sleep(ahead)
+
+
+def _time(value):
+    return math.nan if value is None else value
+
+
+def _maybe(value):
+    return None if math.isnan(value) else value
+
+
+def pack_engine(engine):
+    """Keyframe body for an engine between rounds"""
+    if engine.projectiles.count:
+        raise ValueError("cannot snapshot the engine with bullets in flight")
+    player, opponent = engine.player, engine.opponent
+    version, words, gauss = engine.rng.getstate()
+    return b"".join((
+        SNAPSHOT.pack(
+            engine.round, STATES.index(engine.game_state), engine.game_over,
+            engine.played_eagle_sound, engine.player_fired, engine.round_results_from,
+            engine.now, *(_time(getattr(engine, name)) for name in ENGINE_TIMES),
+            player.score, player.health, player.reaction_time, player.weapon.current_ammo,
+            player.weapon.last_shot_time, _time(player.last_shot_time), _time(player.last_hit_time),
+            opponent.difficulty_level, opponent.health, opponent.reaction_time,
+            opponent.weapon.current_ammo, opponent.weapon.last_shot_time,
+            _time(opponent.last_shot_time), _time(opponent.last_hit_time), opponent.has_shot_this_round,
+            len(engine.reaction_times), len(engine.results)),
+        RNG_STATE.pack(*words, _time(gauss)),
+        struct.pack(f"<{len(engine.reaction_times)}d", *engine.reaction_times),
+        bytes(result_code(result) for result in engine.results),
+    ))
+
+
+def unpack_engine(engine, body):
+    """Set a freshly built engine to the state a keyframe body describes"""
+    fields = SNAPSHOT.unpack_from(body)
+    (engine.round, state, game_over, played_eagle_sound, player_fired,
+     engine.round_results_from, engine.now) = fields[:7]
+    times = fields[7:17]
+    (score, health, reaction_time, ammo, weapon_shot, shot, hit,
+     difficulty, opponent_health, opponent_reaction, opponent_ammo, opponent_weapon_shot,
+     opponent_shot, opponent_hit, has_shot, reactions, results) = fields[17:]
+
+    engine.game_state = STATES[state]
+    engine.game_over = bool(game_over)
+    engine.played_eagle_sound = bool(played_eagle_sound)
+    engine.player_fired = bool(player_fired)
+    for name, value in zip(ENGINE_TIMES, times):
+        setattr(engine, name, _maybe(value))
+
+    player = engine.player
+    player.score, player.health, player.reaction_time = score, health, reaction_time
+    player.weapon.current_ammo, player.weapon.last_shot_time = ammo, weapon_shot
+    player.last_shot_time, player.last_hit_time = _maybe(shot), _maybe(hit)
+
+    opponent = engine.opponent
+    opponent.difficulty_level, opponent.health = difficulty, opponent_health
+    opponent.reaction_time, opponent.has_shot_this_round = opponent_reaction, bool(has_shot)
+    opponent.weapon.current_ammo, opponent.weapon.last_shot_time = opponent_ammo, opponent_weapon_shot
+    opponent.last_shot_time, opponent.last_hit_time = _maybe(opponent_shot), _maybe(opponent_hit)
+
+    offset = SNAPSHOT.size
+    *words, gauss = RNG_STATE.unpack_from(body, offset)
+    engine.rng.setstate((3, tuple(words), _maybe(gauss)))
+    offset += RNG_STATE.size
+    engine.reaction_times = list(struct.unpack_from(f"<{reactions}d", body, offset))
+    offset += reactions * 8
+    engine.results = [RESULTS[code] for code in body[offset:offset + results]]
+    if len(engine.results) != results:
+        raise ValueError("keyframe is cut short")
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Inspect, replay or verify an Eagle Eyes recording")
+    parser.add_argument("command", choices=("info", "play", "verify"))
+    parser.add_argument("path")
+    parser.add_argument("--round", type=int, default=1, help="round to start from")
+    parser.add_argument("--speed", type=float, default=0,
+                        help="multiple of real time to replay at; 0 is as fast as possible")
+    args = parser.parse_args()
+
+    replay = SessionReplay(args.path)
+    mode = "gallery" if replay.gallery else "shootout" if replay.shootout else "duel"
+    print(f"{args.path}: seed {replay.seed}, {mode}, {os.path.getsize(args.path) / 1e3:.1f} kB, "
+          f"rounds {replay.rounds()}" + ("" if replay.complete else " (unfinished, index rebuilt)"))
+    if args.command == "info":
+        return 0
+
+    if args.round not in replay.rounds():
+        print(f"no keyframe for round {args.round}")
+        return 1
+    mismatches = 0
+    started = time.perf_counter()
+    for replayed, recorded in replay.play(args.round, args.speed):
+        ok = replayed == recorded
+        mismatches += not ok
+        if args.command == "play" or not ok:
+            print(f"  round {recorded[0]}: {replayed}" + ("" if ok else f"  recorded {recorded}"))
+    elapsed = time.perf_counter() - started
+    engine = replay.replayed
+    played_ms = engine.now - replay.started_now
+    print(f"{replay.steps} steps, {played_ms / 1000:.1f} s of play in {elapsed:.2f} s "
+          f"({played_ms / 1000 / max(elapsed, 1e-9):.0f}x real time); final score {engine.player.score}")
+    if mismatches:
+        print(f"{mismatches} round(s) replayed differently")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,320 @@
+# Eagle Eyes - Analytics report
+#
+# Renders the five charts from screenshots/visualization (score, accuracy,
+# reaction_time, difficulty, time_played) from game_data.csv.
+#
+# The CSV is split into line-aligned byte chunks. Each chunk is reduced to a
+# small aggregate (hit/miss counts, value counts, and per-block
+# count/sum/min/max for the per-entry series), cached on disk keyed by its
+# byte range and content hash. A rerun checks the cached chunks still match
+# the file and only reads the bytes appended since, so a daily report over a
+# long history costs about as much as the new rows. New chunks are reduced,
+# and the charts drawn, in parallel worker processes.
+#
+#   python report.py game_data.csv --out reports
+import hashlib
+import io
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+COLUMNS = ["Round", "Reaction Time", "Result", "Opponent Difficulty", "Score", "Time Played (seconds)"]
+# game.py (legacy) logged the player's shot as a bare "Hit"/"Miss"
+RESULT_ALIASES = {"Hit": "Player Hit", "Miss": "Player Miss"}
+NUMERIC_DTYPES = {name: float for name in COLUMNS if name != "Result"}
+HEADER_LINE = re.compile(rb"^Round,[^\n]*\n", re.MULTILINE)
+CHUNK_BYTES = 8 << 20
+# Per-entry series keep at most this many blocks per chunk and plot points per chart
+MAX_BLOCKS = 2048
+MAX_POINTS = 2000
+CHARTS = ("score", "accuracy", "reaction_time", "difficulty", "time_played")
+
+
+def block_stats(values):
+    """(count, sum, min, max) per block of consecutive values"""
+    if not len(values):
+        return np.zeros((0, 4))
+    size = -(-len(values) // MAX_BLOCKS)
+    starts = np.arange(0, len(values), size)
+    counts = np.diff(np.append(starts, len(values)))
+    return np.column_stack([
+        counts,
+        np.add.reduceat(values, starts),
+        np.minimum.reduceat(values, starts),
+        np.maximum.reduceat(values, starts),
+    ])
+
+
+def value_counts(values):
+    values, counts = np.unique(values, return_counts=True)
+    return np.column_stack([values, counts]).astype(np.int64)
+
+
+def read_chunk(path, start, end):
+    with open(path, "rb") as file:
+        file.seek(start)
+        return file.read(end - start)
+
+
+def chunk_hash(data):
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def parse_chunk(data):
+    # Header lines recur wherever a new file was appended to the history
+    data = HEADER_LINE.sub(b"", data)
+    try:
+        return pd.read_csv(io.BytesIO(data), header=None, names=COLUMNS, dtype=NUMERIC_DTYPES)
+    except ValueError:
+        # Stray non-numeric rows: take the slow path and drop them
+        frame = pd.read_csv(io.BytesIO(data), header=None, names=COLUMNS, dtype=str,
+                            on_bad_lines="skip")
+        return frame[pd.to_numeric(frame["Round"], errors="coerce").notna()]
+
+
+def aggregate_chunk(path, start, end):
+    data = read_chunk(path, start, end)
+    frame = parse_chunk(data)
+
+    reaction = pd.to_numeric(frame["Reaction Time"], errors="coerce").to_numpy(float)
+    score = pd.to_numeric(frame["Score"], errors="coerce").to_numpy(float)
+    difficulty = pd.to_numeric(frame["Opponent Difficulty"], errors="coerce").dropna()
+    played = pd.to_numeric(frame["Time Played (seconds)"], errors="coerce").dropna()
+    result = frame["Result"].replace(RESULT_ALIASES)
+
+    return chunk_hash(data), {
+        "rows": np.array([len(frame)]),
+        "hits": np.array([(result == "Player Hit").sum(), (result == "Player Miss").sum()]),
+        "difficulty": value_counts(difficulty.to_numpy().astype(np.int64)),
+        # Play time is logged to 2 decimals, so centiseconds count it exactly
+        "time_played": value_counts(np.round(played.to_numpy() * 100).astype(np.int64)),
+        "score": block_stats(score[~np.isnan(score)]),
+        # 0 means the player never fired that round
+        "reaction_time": block_stats(reaction[reaction > 0]),
+    }
+
+
+def chunk_bounds(path, start, size):
+    """Line-aligned (start, end) byte ranges from start to the last full line"""
+    bounds = []
+    with open(path, "rb") as file:
+        while start < size:
+            end = min(start + CHUNK_BYTES, size)
+            if end < size:
+                # Finish the line the chunk stops in
+                file.seek(end)
+                end += len(file.readline())
+            if end == size:
+                # A trailing row without its newline is still being written
+                tail_start = max(start, end - 65536)
+                file.seek(tail_start)
+                newline = file.read(end - tail_start).rfind(b"\n")
+                if newline < 0:
+                    break
+                end = tail_start + newline + 1
+            bounds.append((start, end))
+            start = end
+    return bounds
+
+
+class ReportCache:
+    def __init__(self, root=".report_cache"):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self.manifest_path = os.path.join(root, "manifest.json")
+        try:
+            with open(self.manifest_path, encoding="utf-8") as file:
+                self.manifest = json.load(file)
+        except (OSError, ValueError):
+            self.manifest = {}
+
+    def chunks(self, path):
+        return self.manifest.get(os.path.abspath(path), [])
+
+    def valid_chunks(self, path):
+        """Cached chunks, or none if the file no longer starts with them"""
+        chunks = self.chunks(path)
+        if not chunks:
+            return []
+        size = os.path.getsize(path)
+        if size < chunks[-1]["end"]:
+            return []
+        # Appends never touch old bytes, so spot-check the first and last chunk
+        for chunk in {0: chunks[0], len(chunks) - 1: chunks[-1]}.values():
+            if chunk_hash(read_chunk(path, chunk["start"], chunk["end"])) != chunk["hash"]:
+                return []
+        return chunks
+
+    def load(self, chunk):
+        with np.load(os.path.join(self.root, chunk["hash"] + ".npz")) as data:
+            return {name: data[name] for name in data.files}
+
+    def store(self, path, chunks, new_chunks, aggregates):
+        for chunk, aggregate in zip(new_chunks, aggregates):
+            np.savez(os.path.join(self.root, chunk["hash"] + ".npz"), **aggregate)
+        self.manifest[os.path.abspath(path)] = chunks + new_chunks
+        temp = self.manifest_path + ".tmp"
+        with open(temp, "w", encoding="utf-8") as file:
+            json.dump(self.manifest, file)
+        os.replace(temp, self.manifest_path)
+
+
+def merge_counts(parts):
+    parts = [p for p in parts if len(p)]
+    if not parts:
+        return np.zeros((0, 2), dtype=np.int64)
+    stacked = np.concatenate(parts)
+    values, inverse = np.unique(stacked[:, 0], return_inverse=True)
+    counts = np.zeros(len(values), dtype=np.int64)
+    np.add.at(counts, inverse, stacked[:, 1])
+    return np.column_stack([values, counts])
+
+
+def series(blocks):
+    """Entry positions and mean/min/max, re-bucketed to at most MAX_POINTS"""
+    if not len(blocks):
+        return {"x": np.zeros(0), "mean": np.zeros(0), "min": np.zeros(0), "max": np.zeros(0)}
+    group = -(-len(blocks) // MAX_POINTS)
+    starts = np.arange(0, len(blocks), group)
+    counts = np.add.reduceat(blocks[:, 0], starts)
+    sums = np.add.reduceat(blocks[:, 1], starts)
+    first = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    return {
+        # Entry numbers start at 1, as in the original charts
+        "x": first + (counts + 1) / 2,
+        "mean": sums / counts,
+        "min": np.minimum.reduceat(blocks[:, 2], starts),
+        "max": np.maximum.reduceat(blocks[:, 3], starts),
+    }
+
+
+def box_stats(counts):
+    """Box-plot stats (1.5 IQR whiskers) from exact value counts"""
+    values = counts[:, 0] / 100
+    cumulative = np.cumsum(counts[:, 1])
+    total = cumulative[-1]
+
+    def quantile(q):
+        # Same linear interpolation as numpy.quantile on the expanded data
+        position = q * (total - 1)
+        low = values[np.searchsorted(cumulative, np.floor(position), side="right")]
+        high = values[np.searchsorted(cumulative, np.ceil(position), side="right")]
+        return low + (high - low) * (position - np.floor(position))
+
+    q1, med, q3 = quantile(0.25), quantile(0.5), quantile(0.75)
+    iqr = q3 - q1
+    inside = values[(values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)]
+    return {"med": med, "q1": q1, "q3": q3, "whislo": inside.min(), "whishi": inside.max(),
+            "fliers": [], "label": ""}
+
+
+def combine(aggregates):
+    hits, misses = np.sum([a["hits"] for a in aggregates], axis=0) if aggregates else (0, 0)
+    return {
+        "rows": int(sum(a["rows"][0] for a in aggregates)),
+        "hits": int(hits),
+        "misses": int(misses),
+        "difficulty": merge_counts([a["difficulty"] for a in aggregates]),
+        "time_played": merge_counts([a["time_played"] for a in aggregates]),
+        "score": series(np.concatenate([a["score"] for a in aggregates]) if aggregates else []),
+        "reaction_time": series(np.concatenate([a["reaction_time"] for a in aggregates])
+                                if aggregates else []),
+    }
+
+
+def plot_series(ax, data, color):
+    if not len(data["x"]):
+        return
+    if np.array_equal(data["min"], data["max"]):
+        ax.plot(data["x"], data["mean"], marker="o", markersize=4, color=color)
+    else:
+        ax.fill_between(data["x"], data["min"], data["max"], color=color, alpha=0.2, linewidth=0)
+        ax.plot(data["x"], data["mean"], color=color)
+
+
+def render_chart(name, report, out_dir):
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=(8, 5))
+    ax.grid(True, linestyle="--", alpha=0.6)
+    if name == "score":
+        plot_series(ax, report["score"], "green")
+        ax.set_title("Score Over Entries")
+        ax.set_xlabel("Entry Number")
+        ax.set_ylabel("Score")
+    elif name == "reaction_time":
+        plot_series(ax, report["reaction_time"], "blue")
+        ax.set_title("Player Reaction Time Over Entries")
+        ax.set_xlabel("Entry Number")
+        ax.set_ylabel("Reaction Time (seconds)")
+    elif name == "accuracy":
+        shots = report["hits"] + report["misses"]
+        rate = report["hits"] / shots * 100 if shots else 0
+        ax.bar(["Player Hit", "Player Miss"], [report["hits"], report["misses"]],
+               color=["#3b6582", "#45a874"])
+        ax.set_title(f"Player Accuracy (Hit Rate: {rate:.2f}%)")
+        ax.set_ylabel("Count")
+    elif name == "difficulty":
+        counts = report["difficulty"]
+        if len(counts):
+            ax.bar(counts[:, 0], counts[:, 1], width=1.0, align="edge",
+                   color="#ffb833", edgecolor="black")
+        ax.set_title("Distribution of Opponent Difficulty")
+        ax.set_xlabel("Opponent Difficulty")
+        ax.set_ylabel("Count")
+    elif name == "time_played":
+        if len(report["time_played"]):
+            ax.bxp([box_stats(report["time_played"])], showfliers=False, widths=0.8,
+                   patch_artist=True, boxprops={"facecolor": "purple"})
+        ax.set_title("Distribution of Time Played")
+        ax.set_ylabel("Time Played (seconds)")
+    path = os.path.join(out_dir, name + ".png")
+    fig.tight_layout()
+    fig.savefig(path)
+    plt.close(fig)
+    return path
+
+
+def build_report(path, out_dir="reports", cache_dir=".report_cache", workers=None):
+    cache = ReportCache(cache_dir)
+    chunks = cache.valid_chunks(path)
+    start = chunks[-1]["end"] if chunks else 0
+    bounds = chunk_bounds(path, start, os.path.getsize(path))
+    os.makedirs(out_dir, exist_ok=True)
+
+    with ProcessPoolExecutor(workers) as pool:
+        fresh = list(pool.map(aggregate_chunk, [path] * len(bounds),
+                              *zip(*bounds))) if bounds else []
+        new_chunks = [{"start": s, "end": e, "hash": h} for (s, e), (h, _) in zip(bounds, fresh)]
+        if new_chunks:
+            cache.store(path, chunks, new_chunks, [a for _, a in fresh])
+
+        aggregates = [cache.load(chunk) for chunk in chunks] + [a for _, a in fresh]
+        report = combine(aggregates)
+        paths = list(pool.map(render_chart, CHARTS, [report] * len(CHARTS), [out_dir] * len(CHARTS)))
+    return report, len(chunks), len(new_chunks), paths
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Render the Eagle Eyes analytics charts")
+    parser.add_argument("csv_path", nargs="?", default="game_data.csv")
+    parser.add_argument("--out", default="reports")
+    parser.add_argument("--cache", default=".report_cache")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    report, reused, fresh, paths = build_report(args.csv_path, args.out, args.cache, args.workers)
+    print(f"{report['rows']} rows: {reused} cached chunk(s), {fresh} new, "
+          f"{time.perf_counter() - started:.2f}s")
+    for path in paths:
+        print(f"  {path}")
@@ -0,0 +1,325 @@
+# Eagle Eyes - Streaming round statistics
+#
+# Reaction time and hit rate over the whole play history in constant memory:
+# Welford running moments for mean/variance and a merging t-digest for
+# quantiles, overall and per opponent difficulty. Each round is an O(1)
+# update (amortised for the digest). State is saved as JSON, so a restart
+# picks up where it left off, and states from several machines can be
+# combined with merge().
+#
+#   python round_stats.py game_data.csv --state round_stats.json
+import csv
+import json
+import math
+import os
+
+HIT_RESULTS = ("Player Hit", "Hit")
+
+
+class RunningMoments:
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def update(self, x):
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+
+    def merge(self, other):
+        # Chan et al. parallel combination
+        if not other.count:
+            return self
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta * delta * self.count * other.count / total
+        self.count = total
+        return self
+
+    @property
+    def variance(self):
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stddev(self):
+        return math.sqrt(self.variance)
+
+    def to_dict(self):
+        return {"count": self.count, "mean": self.mean, "m2": self.m2}
+
+    @classmethod
+    def from_dict(cls, data):
+        moments = cls()
+        moments.count = data["count"]
+        moments.mean = data["mean"]
+        moments.m2 = data["m2"]
+        return moments
+
+
+class TDigest:
+    """Merging t-digest; keeps at most about `compression` centroids"""
+
+    def __init__(self, compression=100):
+        self.compression = compression
+        self.centroids = []
+        self.buffer = []
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, x, weight=1.0):
+        self.buffer.append((x, weight))
+        self.total += weight
+        self.min = min(self.min, x)
+        self.max = max(self.max, x)
+        if len(self.buffer) >= 4 * self.compression:
+            self._compress()
+
+    def merge(self, other):
+        self.buffer.extend(other.centroids)
+        self.buffer.extend(other.buffer)
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+        return self
+
+    def _k(self, q):
+        # k1 scale: small centroids at the tails, large ones near the median
+        return self.compression / (2 * math.pi) * math.asin(2 * min(max(q, 0.0), 1.0) - 1)
+
+    def _compress(self):
+        if not self.buffer:
+            return
+        points = sorted(self.centroids + self.buffer)
+        self.buffer = []
+        merged = []
+        mean, weight = points[0]
+        before = 0.0
+        k_left = self._k(0.0)
+        for x, w in points[1:]:
+            if self._k((before + weight + w) / self.total) - k_left <= 1:
+                weight += w
+                mean += (x - mean) * w / weight
+            else:
+                merged.append((mean, weight))
+                before += weight
+                k_left = self._k(before / self.total)
+                mean, weight = x, w
+        merged.append((mean, weight))
+        self.centroids = merged
+
+    def quantile(self, q):
+        self._compress()
+        if not self.centroids:
+            return math.nan
+        if len(self.centroids) == 1:
+            return self.centroids[0][0]
+        target = q * self.total
+        # Interpolate between centroid centres, pinned to min/max at the ends
+        prev_mean, prev_pos = self.min, 0.0
+        cumulative = 0.0
+        for mean, weight in self.centroids:
+            centre = cumulative + weight / 2
+            if target < centre:
+                span = centre - prev_pos
+                return prev_mean + (mean - prev_mean) * ((target - prev_pos) / span if span else 0)
+            prev_mean, prev_pos = mean, centre
+            cumulative += weight
+        span = self.total - prev_pos
+        return prev_mean + (self.max - prev_mean) * ((target - prev_pos) / span if span else 0)
+
+    def to_dict(self):
+        self._compress()
+        return {
+            "compression": self.compression,
+            "centroids": self.centroids,
+            "total": self.total,
+            "min": self.min if self.centroids else None,
+            "max": self.max if self.centroids else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        digest = cls(data["compression"])
+        digest.centroids = [tuple(c) for c in data["centroids"]]
+        digest.total = data["total"]
+        if data["min"] is not None:
+            digest.min = data["min"]
+            digest.max = data["max"]
+        return digest
+
+
+class ReactionStats:
+    """Reaction-time moments and quantiles plus hit rate for one bucket"""
+
+    def __init__(self, compression=100):
+        self.moments = RunningMoments()
+        self.digest = TDigest(compression)
+        self.rounds = 0
+        self.hits = 0
+
+    def update(self, reaction_time, hit):
+        self.rounds += 1
+        self.hits += bool(hit)
+        # 0 means the player never fired that round
+        if reaction_time > 0:
+            self.moments.update(reaction_time)
+            self.digest.add(reaction_time)
+
+    def merge(self, other):
+        self.moments.merge(other.moments)
+        self.digest.merge(other.digest)
+        self.rounds += other.rounds
+        self.hits += other.hits
+        return self
+
+    def summary(self):
+        return {
+            "rounds": self.rounds,
+            "hit_rate": self.hits / self.rounds if self.rounds else math.nan,
+            "mean": self.moments.mean if self.moments.count else math.nan,
+            "stddev": self.moments.stddev,
+            "p50": self.digest.quantile(0.5),
+            "p90": self.digest.quantile(0.9),
+            "p99": self.digest.quantile(0.99),
+        }
+
+    def to_dict(self):
+        return {"moments": self.moments.to_dict(), "digest": self.digest.to_dict(),
+                "rounds": self.rounds, "hits": self.hits}
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls()
+        stats.moments = RunningMoments.from_dict(data["moments"])
+        stats.digest = TDigest.from_dict(data["digest"])
+        stats.rounds = data["rounds"]
+        stats.hits = data["hits"]
+        return stats
+
+
+class RoundStats:
+    def __init__(self, compression=100):
+        self.compression = compression
+        self.overall = ReactionStats(compression)
+        self.by_difficulty = {}
+        # Bytes of each CSV already ingested, so reruns only read new rows
+        self.offsets = {}
+
+    def update(self, record):
+        """Add one round, as logged to game_data.csv (5 or 6 columns)"""
+        reaction_time, result, difficulty = float(record[1]), record[2], int(record[3])
+        hit = result in HIT_RESULTS
+        self.overall.update(reaction_time, hit)
+        bucket = self.by_difficulty.get(difficulty)
+        if bucket is None:
+            bucket = self.by_difficulty[difficulty] = ReactionStats(self.compression)
+        bucket.update(reaction_time, hit)
+
+    def merge(self, other):
+        self.overall.merge(other.overall)
+        for difficulty, stats in other.by_difficulty.items():
+            bucket = self.by_difficulty.setdefault(difficulty, ReactionStats(self.compression))
+            bucket.merge(stats)
+        return self
+
+    def ingest_csv(self, path):
+        """Read rows appended to path since the last call; returns how many"""
+        key = os.path.abspath(path)
+        offset = self.offsets.get(key, 0)
+        if os.path.getsize(path) < offset:
+            # The file was replaced or truncated; start over on it
+            offset = 0
+        count = 0
+        with open(path, "rb") as file:
+            file.seek(offset)
+            for line in file:
+                if not line.endswith(b"\n"):
+                    # A row still being written; pick it up next time
+                    break
+                offset += len(line)
+                row = next(csv.reader([line.decode("utf-8")]), None)
+                if not row or row[0] == "Round" or len(row) not in (5, 6):
+                    continue
+                try:
+                    self.update(row)
+                except ValueError:
+                    continue
+                count += 1
+        self.offsets[key] = offset
+        return count
+
+    def summary(self):
+        return {
+            "overall": self.overall.summary(),
+            "by_difficulty": {d: self.by_difficulty[d].summary() for d in sorted(self.by_difficulty)},
+        }
+
+    def to_dict(self):
+        return {
+            "compression": self.compression,
+            "overall": self.overall.to_dict(),
+            "by_difficulty": {str(d): s.to_dict() for d, s in self.by_difficulty.items()},
+            "offsets": self.offsets,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls(data["compression"])
+        stats.overall = ReactionStats.from_dict(data["overall"])
+        stats.by_difficulty = {int(d): ReactionStats.from_dict(s) for d, s in data["by_difficulty"].items()}
+        stats.offsets = data.get("offsets", {})
+        return stats
+
+    def save(self, path):
+        temp = path + ".tmp"
+        with open(temp, "w", encoding="utf-8") as file:
+            json.dump(self.to_dict(), file)
+        os.replace(temp, path)
+
+    @classmethod
+    def load(cls, path, compression=100):
+        if not os.path.exists(path):
+            return cls(compression)
+        try:
+            with open(path, encoding="utf-8") as file:
+                return cls.from_dict(json.load(file))
+        except (ValueError, KeyError):
+            print(f"⚠️ Ignoring unreadable stats file {path}")
+            return cls(compression)
+
+
+def format_summary(summary):
+    lines = [f"{'':<10} {'rounds':>7} {'hit %':>6} {'mean':>6} {'sd':>6} {'p50':>6} {'p90':>6} {'p99':>6}"]
+    rows = [("all", summary["overall"])]
+    rows += [(f"diff {d}", s) for d, s in summary["by_difficulty"].items()]
+    for label, s in rows:
+        lines.append(f"{label:<10} {s['rounds']:>7} {s['hit_rate'] * 100:>6.1f} {s['mean']:>6.3f} "
+                     f"{s['stddev']:>6.3f} {s['p50']:>6.3f} {s['p90']:>6.3f} {s['p99']:>6.3f}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Reaction time and hit rate statistics")
+    parser.add_argument("csv_paths", nargs="*", default=["game_data.csv"])
+    parser.add_argument("--state", default="round_stats_offline.json",
+                        help="saved sketch to resume from and update")
+    parser.add_argument("--merge", nargs="*", default=[],
+                        help="other saved sketches (e.g. from other machines) to fold in")
+    args = parser.parse_args()
+
+    stats = RoundStats.load(args.state)
+    for path in args.csv_paths:
+        print(f"{path}: {stats.ingest_csv(path)} new rows")
+    stats.save(args.state)
+
+    combined = RoundStats.from_dict(stats.to_dict())
+    for path in args.merge:
+        combined.merge(RoundStats.load(path))
+    print(format_summary(combined.summary()))
@@ -0,0 +1,224 @@
+# Eagle Eyes - Background telemetry writer
+#
+# The game loop hands finished-round rows to put(), which is a non-blocking
+# queue put. A writer thread drains the queue, appends each row to an
+# append-only journal straight away, and writes rows to the CSV in batches
+# (every flush_size rows or flush_interval seconds, whichever comes first).
+# A batch is marked committed in the journal once the CSV write is synced,
+# so after a crash the rows that never reached the CSV are replayed from the
+# journal on the next start. Delivery is at-least-once.
+#
+# With a TelemetryStore attached, each committed batch is also appended to
+# the columnar store along with its session id and wall-clock timestamp.
+#
+# A failed write (disk full, the CSV locked by another program) is counted
+# in stats() and the batch retried after flush_interval; the thread keeps
+# draining the queue, and flush() and close() never wait longer than their
+# timeout. Recovery at startup is guarded the same way: if the journal's
+# rows cannot be written, the game still starts, the journal is kept and the
+# rows become the writer's first batch.
+import csv
+import json
+import os
+import queue
+import threading
+import time
+
+CSV_HEADER = [
+    "Round",
+    "Reaction Time",
+    "Result",
+    "Opponent Difficulty",
+    "Score",
+    "Time Played (seconds)"
+]
+COMMIT_MARK = "#commit"
+
+_STOP = object()
+
+
+class TelemetryWriter:
+    def __init__(self, path="game_data.csv", header=CSV_HEADER, max_queue=1024,
+                 flush_size=32, flush_interval=1.0, journal_path=None, store=None):
+        self.path = path
+        self.store = store
+        self.header = header
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.journal_path = journal_path or path + ".journal"
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.dropped = 0
+        self.written = 0
+        self.batches = 0
+        self.errors = 0
+        self.last_error = None
+        # Recovered rows that could not be written yet
+        self.backlog = []
+        self.recovered = self._recover()
+        self.journal = open(self.journal_path, "a", encoding="utf-8")
+        self.closed = False
+        self.thread = threading.Thread(target=self._run, name="telemetry-writer", daemon=True)
+        self.thread.start()
+
+    def put(self, row, session=0, timestamp=None):
+        """Queue a row; never blocks the caller. Returns False if it was dropped"""
+        try:
+            self.queue.put_nowait((row, session, time.time() if timestamp is None else timestamp))
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def flush(self, timeout=None):
+        """Block until everything queued so far has been written; False on timeout"""
+        if not self.thread.is_alive():
+            return False
+        done = threading.Event()
+        try:
+            self.queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def close(self, timeout=5.0):
+        if self.closed:
+            return
+        self.closed = True
+        deadline = time.monotonic() + timeout
+        if self.thread.is_alive():
+            try:
+                self.queue.put(_STOP, timeout=timeout)
+            except queue.Full:
+                pass
+            self.thread.join(max(0.0, deadline - time.monotonic()))
+        # A writer still stuck in a write keeps its files; the journal
+        # replays its rows on the next start
+        if self.thread.is_alive():
+            return
+        self.journal.close()
+        if self.store is not None:
+            self.store.close()
+
+    def stats(self):
+        return {
+            "queue_depth": self.queue.qsize(),
+            "dropped": self.dropped,
+            "written": self.written,
+            "batches": self.batches,
+            "recovered": self.recovered,
+            "errors": self.errors,
+        }
+
+    def _run(self):
+        batch, self.backlog = self.backlog, []
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            timeout = None if not batch else max(0.0, deadline - time.monotonic())
+            try:
+                item = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is _STOP:
+                self._commit(batch)
+                return
+            if isinstance(item, threading.Event):
+                if self._commit(batch):
+                    batch = []
+                item.set()
+                continue
+            if item is not None:
+                try:
+                    self.journal.write(json.dumps(item) + "\n")
+                    self.journal.flush()
+                except OSError as e:
+                    self._failed(e)
+                if not batch:
+                    deadline = time.monotonic() + self.flush_interval
+                batch.append(item)
+
+            if batch and (len(batch) >= self.flush_size or time.monotonic() >= deadline):
+                if self._commit(batch):
+                    batch = []
+                else:
+                    # Keep the rows and try again later
+                    deadline = time.monotonic() + self.flush_interval
+
+    def _failed(self, error):
+        self.errors += 1
+        self.last_error = error
+
+    def _write_rows(self, rows):
+        write_header = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+        with open(self.path, "a", newline="") as file:
+            writer = csv.writer(file)
+            if write_header:
+                writer.writerow(self.header)
+            writer.writerows(rows)
+            file.flush()
+            os.fsync(file.fileno())
+
+    def _commit(self, batch):
+        """Write a batch; False (and the batch still pending) if the CSV write failed"""
+        if not batch:
+            return True
+        try:
+            self._write_rows([row for row, _, _ in batch])
+        except (OSError, csv.Error) as e:
+            self._failed(e)
+            return False
+        # The CSV has the rows now, so a store failure only costs the store's copy
+        if self.store is not None:
+            try:
+                self.store.append_rows(batch)
+            except (OSError, ValueError) as e:
+                self._failed(e)
+        try:
+            self.journal.write(COMMIT_MARK + "\n")
+            self.journal.flush()
+            self.journal.truncate(0)
+        except OSError as e:
+            self._failed(e)
+        self.written += len(batch)
+        self.batches += 1
+        return True
+
+    def _recover(self):
+        if not os.path.exists(self.journal_path):
+            return 0
+        pending = []
+        try:
+            with open(self.journal_path, encoding="utf-8") as journal:
+                for line in journal:
+                    line = line.strip()
+                    if line == COMMIT_MARK:
+                        pending = []
+                    elif line:
+                        try:
+                            item = json.loads(line)
+                        except ValueError:
+                            # A torn final line from a crash mid-write
+                            break
+                        # Journals from before sessions held the bare row
+                        pending.append(tuple(item) if isinstance(item[0], list) else (item, 0, None))
+        except OSError as e:
+            self._failed(e)
+            return 0
+        if pending:
+            try:
+                self._write_rows([row for row, _, _ in pending])
+            except (OSError, csv.Error) as e:
+                # The journal keeps the rows; the writer retries them
+                self._failed(e)
+                self.backlog = pending
+                return 0
+            if self.store is not None:
+                try:
+                    self.store.append_rows(pending)
+                except (OSError, ValueError) as e:
+                    self._failed(e)
+        try:
+            open(self.journal_path, "w").close()
+        except OSError as e:
+            self._failed(e)
+        return len(pending)
@@ -0,0 +1,290 @@
+# Eagle Eyes - Columnar telemetry store
+#
+# Rounds are stored as fixed-width NumPy records in segment files under one
+# directory. Each segment is a 64-byte header (magic, schema version, flags,
+# row count, capacity) followed by `capacity` preallocated records, so it
+# can be memory-mapped and read with zero copies. Appends go to the newest
+# segment; a full segment is sealed and a new one started. Sealed segments
+# older than the newest `hot_segments` can be gzip-compressed by compact().
+#
+#   python telemetry_store.py import game_data.csv   # migrate legacy CSV
+#   python telemetry_store.py info
+import csv
+import gzip
+import os
+import time
+
+import numpy as np
+
+MAGIC = b"EEYESEG"
+SCHEMA_VERSION = 1
+SEALED = 1
+
+HEADER_DTYPE = np.dtype([
+    ("magic", "S8"),
+    ("version", "<u4"),
+    ("flags", "<u4"),
+    ("count", "<u8"),
+    ("capacity", "<u8"),
+    ("reserved", "V32"),
+])
+
+RESULTS = ["N/A", "Player Hit", "Player Miss", "Opponent Hit", "Opponent Miss"]
+# game.py (legacy) logged the player's shot as a bare "Hit"/"Miss"
+RESULT_ALIASES = {"Hit": "Player Hit", "Miss": "Player Miss"}
+
+SCHEMAS = {
+    1: np.dtype([
+        ("session", "<u8"),
+        ("timestamp", "<f8"),
+        ("round", "<u2"),
+        ("reaction_time", "<f4"),
+        ("result", "u1"),
+        ("difficulty", "u1"),
+        ("score", "<i4"),
+        ("time_played", "<f4"),
+    ]),
+}
+RECORD_DTYPE = SCHEMAS[SCHEMA_VERSION]
+
+# Upgraders from an older schema's records to the next version's records
+MIGRATIONS = {}
+
+
+def new_session_id():
+    return int.from_bytes(os.urandom(8), "little") >> 1
+
+
+def result_code(text):
+    text = RESULT_ALIASES.get(text, text)
+    return RESULTS.index(text) if text in RESULTS else 0
+
+
+def upgrade(records, version):
+    while version < SCHEMA_VERSION:
+        records = MIGRATIONS[version](records)
+        version += 1
+    return records
+
+
+class TelemetryStore:
+    def __init__(self, root="telemetry", segment_rows=65536, hot_segments=2):
+        self.root = root
+        self.segment_rows = segment_rows
+        self.hot_segments = hot_segments
+        os.makedirs(root, exist_ok=True)
+        self._active = None
+
+    def segment_paths(self):
+        names = sorted(name for name in os.listdir(self.root) if name.startswith("seg-"))
+        return [os.path.join(self.root, name) for name in names]
+
+    def _new_segment(self):
+        paths = self.segment_paths()
+        index = int(os.path.basename(paths[-1])[4:10]) + 1 if paths else 1
+        path = os.path.join(self.root, f"seg-{index:06d}.eet")
+        with open(path, "wb") as file:
+            header = np.zeros(1, dtype=HEADER_DTYPE)
+            header["magic"] = MAGIC
+            header["version"] = SCHEMA_VERSION
+            header["capacity"] = self.segment_rows
+            file.write(header.tobytes())
+            file.truncate(HEADER_DTYPE.itemsize + RECORD_DTYPE.itemsize * self.segment_rows)
+        return path
+
+    def _open_active(self):
+        if self._active is not None:
+            return self._active
+        paths = [p for p in self.segment_paths() if p.endswith(".eet")]
+        path = None
+        if paths:
+            header = np.memmap(paths[-1], dtype=HEADER_DTYPE, mode="r", shape=(1,))
+            if not header["flags"][0] & SEALED and header["version"][0] == SCHEMA_VERSION:
+                path = paths[-1]
+            del header
+        if path is None:
+            path = self._new_segment()
+        header = np.memmap(path, dtype=HEADER_DTYPE, mode="r+", shape=(1,))
+        records = np.memmap(path, dtype=RECORD_DTYPE, mode="r+",
+                            offset=HEADER_DTYPE.itemsize, shape=(int(header["capacity"][0]),))
+        self._active = (path, header, records)
+        return self._active
+
+    def _seal_active(self):
+        path, header, records = self._active
+        header["flags"] |= SEALED
+        header.flush()
+        records.flush()
+        self._active = None
+        del header, records
+
+    def append_many(self, rows):
+        """Append a structured array (RECORD_DTYPE) of rows"""
+        rows = np.asarray(rows, dtype=RECORD_DTYPE)
+        start = 0
+        while start < len(rows):
+            path, header, records = self._open_active()
+            count = int(header["count"][0])
+            take = min(len(rows) - start, len(records) - count)
+            records[count:count + take] = rows[start:start + take]
+            header["count"] = count + take
+            start += take
+            if count + take == len(records):
+                self._seal_active()
+        self.flush()
+        return len(rows)
+
+    def append(self, session, round_number, reaction_time, result, difficulty, score,
+               time_played, timestamp=None):
+        row = np.zeros(1, dtype=RECORD_DTYPE)
+        row[0] = (session, time.time() if timestamp is None else timestamp, round_number,
+                  reaction_time, result_code(result), difficulty, score, time_played)
+        return self.append_many(row)
+
+    def append_rows(self, items):
+        """Append (record, session, timestamp) items, record as in game_data.csv"""
+        rows = np.zeros(len(items), dtype=RECORD_DTYPE)
+        for i, (record, session, timestamp) in enumerate(items):
+            round_number, reaction_time, result, difficulty, score = record[:5]
+            time_played = record[5] if len(record) > 5 else float("nan")
+            rows[i] = (session, float("nan") if timestamp is None else timestamp, round_number,
+                       reaction_time, result_code(result), difficulty, score, time_played)
+        return self.append_many(rows)
+
+    def flush(self):
+        if self._active is not None:
+            _, header, records = self._active
+            records.flush()
+            header.flush()
+
+    def close(self):
+        if self._active is not None:
+            self.flush()
+            self._active = None
+
+    def compact(self):
+        """gzip sealed segments except the newest hot_segments ones"""
+        sealed = []
+        for path in self.segment_paths():
+            if not path.endswith(".eet"):
+                continue
+            header = np.fromfile(path, dtype=HEADER_DTYPE, count=1)
+            if header["flags"][0] & SEALED:
+                sealed.append(path)
+        for path in sealed[:max(0, len(sealed) - self.hot_segments)]:
+            with open(path, "rb") as source, gzip.open(path + ".gz", "wb") as target:
+                while True:
+                    chunk = source.read(1 << 20)
+                    if not chunk:
+                        break
+                    target.write(chunk)
+            os.remove(path)
+        return sealed
+
+    def iter_segments(self):
+        """Yield each segment's used records; plain segments are zero-copy memmaps"""
+        active = self._active[0] if self._active else None
+        for path in self.segment_paths():
+            if path.endswith(".gz"):
+                with gzip.open(path, "rb") as file:
+                    data = file.read()
+                header = np.frombuffer(data, dtype=HEADER_DTYPE, count=1)
+            else:
+                data = path
+                header = np.fromfile(path, dtype=HEADER_DTYPE, count=1)
+            if header["magic"][0] != MAGIC:
+                continue
+            version = int(header["version"][0])
+            count = int(header["count"][0])
+            if path == active:
+                count = int(self._active[1]["count"][0])
+            if not count:
+                continue
+            dtype = SCHEMAS[version]
+            if isinstance(data, bytes):
+                records = np.frombuffer(data, dtype=dtype, count=count, offset=HEADER_DTYPE.itemsize)
+            else:
+                records = np.memmap(path, dtype=dtype, mode="r",
+                                    offset=HEADER_DTYPE.itemsize, shape=(count,))
+            yield upgrade(records, version)
+
+    def load(self):
+        """All records as one array (a copy when there is more than one segment)"""
+        parts = list(self.iter_segments())
+        if not parts:
+            return np.zeros(0, dtype=RECORD_DTYPE)
+        return parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+
+def import_csv(path, store, chunk_rows=4096):
+    """Stream a game_data.csv (5- or 6-column rows, mixed) into store
+
+    The CSV has no session column, so a new session starts whenever Round
+    does not increase. Imported rows have no wall-clock timestamp (NaN), and
+    legacy 5-column rows have no play time (NaN).
+    """
+    buffer = np.zeros(chunk_rows, dtype=RECORD_DTYPE)
+    filled = 0
+    imported = 0
+    skipped = 0
+    session = new_session_id()
+    last_round = None
+
+    with open(path, newline="") as file:
+        for row in csv.reader(file):
+            if not row or row[0] == "Round":
+                continue
+            if len(row) not in (5, 6):
+                skipped += 1
+                continue
+            try:
+                round_number = int(row[0])
+                reaction_time = float(row[1])
+                difficulty = int(row[3])
+                score = int(row[4])
+                time_played = float(row[5]) if len(row) == 6 else float("nan")
+            except ValueError:
+                skipped += 1
+                continue
+
+            if last_round is not None and round_number <= last_round:
+                session = new_session_id()
+            last_round = round_number
+
+            buffer[filled] = (session, float("nan"), round_number, reaction_time,
+                              result_code(row[2]), difficulty, score, time_played)
+            filled += 1
+            if filled == chunk_rows:
+                store.append_many(buffer)
+                imported += filled
+                filled = 0
+
+    if filled:
+        store.append_many(buffer[:filled])
+        imported += filled
+    return imported, skipped
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Eagle Eyes telemetry store")
+    parser.add_argument("--root", default="telemetry")
+    sub = parser.add_subparsers(dest="command", required=True)
+    importer = sub.add_parser("import", help="migrate a game_data.csv into the store")
+    importer.add_argument("csv_path")
+    sub.add_parser("info", help="summarise the store")
+    sub.add_parser("compact", help="compress old sealed segments")
+    args = parser.parse_args()
+
+    store = TelemetryStore(args.root)
+    if args.command == "import":
+        started = time.perf_counter()
+        imported, skipped = import_csv(args.csv_path, store)
+        print(f"imported {imported} rows ({skipped} skipped) in {time.perf_counter() - started:.2f}s")
+    elif args.command == "compact":
+        store.compact()
+    records = store.load()
+    sessions = len(np.unique(records["session"])) if len(records) else 0
+    print(f"{len(records)} rows, {sessions} sessions, {len(store.segment_paths())} segment(s)")
+    store.close()
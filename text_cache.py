@@ -0,0 +1,92 @@
+# Eagle Eyes - Rendered text cache
+#
+# HUD and menu strings barely change between frames, so each rendered
+# surface is kept under (text, font name, size, color, antialias) together
+# with the rects it has been laid out at. A repeated string then costs one
+# dict lookup and a blit. Entries are evicted least-recently-used once the
+# cached pixels exceed max_bytes.
+from collections import OrderedDict
+
+import pygame
+
+# Layouts kept per rendered string; a string drawn at ever-new positions
+# (a moving label, say) drops its oldest ones
+MAX_RECTS_PER_TEXT = 16
+
+
+class TextCache:
+    def __init__(self, max_bytes=4 * 1024 * 1024, load_font=pygame.font.SysFont):
+        self.max_bytes = max_bytes
+        self.load_font = load_font
+        self.fonts = {}
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def font(self, name, size):
+        key = (name, size)
+        font = self.fonts.get(key)
+        if font is None:
+            font = self.load_font(name, size)
+            self.fonts[key] = font
+        return font
+
+    def _entry(self, text, name, size, color, antialias):
+        key = (text, name, size, tuple(color), antialias)
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        surface = self.font(name, size).render(text, antialias, color)
+        entry = (surface, {})
+        self.entries[key] = entry
+        self.bytes += self._surface_bytes(surface)
+        while self.bytes > self.max_bytes and len(self.entries) > 1:
+            _, (old, _) = self.entries.popitem(last=False)
+            self.bytes -= self._surface_bytes(old)
+            self.evictions += 1
+        return entry
+
+    @staticmethod
+    def _surface_bytes(surface):
+        return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+    def render(self, text, name, size, color, antialias=True):
+        return self._entry(text, name, size, color, antialias)[0]
+
+    def place(self, text, name, size, color, pos, anchor="topleft", antialias=True):
+        """Rendered surface plus a new rect with `anchor` at pos
+
+        Layouts are cached as tuples, so callers may move the rect freely.
+        """
+        surface, rects = self._entry(text, name, size, color, antialias)
+        layout = rects.get((pos, anchor))
+        if layout is None:
+            layout = tuple(surface.get_rect(**{anchor: pos}))
+            if len(rects) >= MAX_RECTS_PER_TEXT:
+                del rects[next(iter(rects))]
+            rects[(pos, anchor)] = layout
+        return surface, pygame.Rect(layout)
+
+    def stats(self):
+        return {
+            "entries": len(self.entries),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def clear(self):
+        self.entries.clear()
+        self.bytes = 0
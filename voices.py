@@ -0,0 +1,123 @@
+# Eagle Eyes - Priority voice pool
+#
+# Sounds are not bound to a channel each. Every play takes a voice from a
+# shared pool of mixer channels, so a second gunshot no longer cuts off the
+# first, and sounds that share a file no longer share a slot.
+#
+# Each sound has a priority and a cap on how many voices it may hold at once.
+# At its cap, a sound reuses its own oldest voice, or is dropped if it must
+# not retrigger (the gun pump, the looping wind). Otherwise it takes a free
+# voice. When none is free, it steals from the lowest priority that is no
+# higher than its own, taking the oldest or quietest voice first. If every
+# voice outranks it, the new sound is dropped.
+#
+# premix() sums sounds that are always cued together into one buffer, so
+# they cost one voice and start on the same sample.
+import itertools
+
+import numpy as np
+import pygame
+
+STEAL_RULES = ("oldest", "quietest")
+
+
+class Voice:
+    __slots__ = ("name", "priority", "volume", "order")
+
+    def __init__(self, name, priority, volume, order):
+        self.name = name
+        self.priority = priority
+        self.volume = volume
+        # Play order; higher started later
+        self.order = order
+
+
+class VoicePool:
+    def __init__(self, channels, steal="oldest"):
+        if steal not in STEAL_RULES:
+            raise ValueError(f"steal must be one of {STEAL_RULES}, not {steal!r}")
+        self.channels = channels
+        self.steal = steal
+        self.voices = [None] * len(channels)
+        self.orders = itertools.count()
+        self.plays = 0
+        # Voices cut short: by a sound at its cap restarting, or by another sound
+        self.retriggers = 0
+        self.steals = 0
+        self.drops = 0
+
+    def _voice(self, index):
+        """The voice on channel index, or None once it has finished"""
+        voice = self.voices[index]
+        if voice is not None and not self.channels[index].get_busy():
+            voice = self.voices[index] = None
+        return voice
+
+    def playing(self, name):
+        """Indexes of the channels still playing name"""
+        own = []
+        for index in range(len(self.channels)):
+            voice = self._voice(index)
+            if voice is not None and voice.name == name:
+                own.append(index)
+        return own
+
+    def _victim(self, priority):
+        """Index of a free voice, or of the one to steal for this priority; None if all outrank it"""
+        live = [self._voice(index) for index in range(len(self.channels))]
+        if None in live:
+            return live.index(None)
+        candidates = [index for index, voice in enumerate(live) if voice.priority <= priority]
+        if not candidates:
+            return None
+        if self.steal == "quietest":
+            return min(candidates, key=lambda index: (live[index].priority, live[index].volume, live[index].order))
+        return min(candidates, key=lambda index: (live[index].priority, live[index].order))
+
+    def play(self, name, sound, priority=0, max_voices=1, retrigger=True, loops=0, maxtime=0):
+        """Start sound as name; returns its channel, or None if it was dropped"""
+        own = self.playing(name)
+        if len(own) >= max_voices:
+            if not retrigger:
+                self.drops += 1
+                return None
+            index = min(own, key=lambda index: self.voices[index].order)
+            self.retriggers += 1
+        else:
+            index = self._victim(priority)
+            if index is None:
+                self.drops += 1
+                return None
+            if self.voices[index] is not None:
+                self.steals += 1
+
+        channel = self.channels[index]
+        channel.play(sound, loops=loops, maxtime=maxtime)
+        self.voices[index] = Voice(name, priority, sound.get_volume(), next(self.orders))
+        self.plays += 1
+        return channel
+
+    def stop_all(self):
+        for channel in self.channels:
+            channel.stop()
+        self.voices = [None] * len(self.channels)
+
+    def stats(self):
+        return {
+            "voices": len(self.channels),
+            "busy": sum(self._voice(index) is not None for index in range(len(self.channels))),
+            "plays": self.plays,
+            "retriggers": self.retriggers,
+            "steals": self.steals,
+            "drops": self.drops,
+        }
+
+
+def premix(sounds):
+    """One Sound playing sounds together from their first sample, at their own volumes"""
+    arrays = [pygame.sndarray.array(sound) for sound in sounds]
+    mixed = np.zeros((max(len(array) for array in arrays),) + arrays[0].shape[1:], dtype=np.float32)
+    for sound, array in zip(sounds, arrays):
+        mixed[:len(array)] += array * sound.get_volume()
+    info = np.iinfo(arrays[0].dtype)
+    return pygame.sndarray.make_sound(np.clip(mixed, info.min, info.max).astype(arrays[0].dtype))